@@ -8,8 +8,10 @@ import sys
 sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 
 from app.database import Base
-from app.models import User, Event, Ticket
-from app.config import settings
+import app.models  # noqa: F401 - registers every table on Base.metadata
+from app.config import get_settings
+
+settings = get_settings()
 
 # this is the Alembic Config object
 config = context.config
@@ -0,0 +1,35 @@
+"""event waiting room flag
+
+Revision ID: 0001a
+Revises: 0001
+Create Date: 2026-10-19 16:05:12.208413
+
+Per-event switch for the virtual waiting room in front of reservations.
+Existing events keep selling directly.
+
+Slotted in before 0002: the schema it adds used to be created by 0001, so
+databases already past 0001 have it and never run this revision.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '0001a'
+down_revision: Union[str, Sequence[str], None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        'events',
+        sa.Column('waiting_room_enabled', sa.Boolean(), server_default=sa.false(), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('events', 'waiting_room_enabled')
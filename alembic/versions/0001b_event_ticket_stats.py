@@ -0,0 +1,51 @@
+"""event ticket stats
+
+Revision ID: 0001b
+Revises: 0001a
+Create Date: 2026-10-19 16:07:40.913562
+
+Per-event rollups of ticket counts by status, kept in step with every
+ticket transition. Backfilled from the existing tickets with one
+GROUP BY; the periodic verifier corrects any drift after that.
+
+Slotted in before 0002: the schema it adds used to be created by 0001, so
+databases already past 0001 have it and never run this revision.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '0001b'
+down_revision: Union[str, Sequence[str], None] = '0001a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('event_ticket_stats',
+    sa.Column('event_id', sa.Uuid(), nullable=False),
+    sa.Column('reserved_count', sa.Integer(), nullable=False),
+    sa.Column('paid_count', sa.Integer(), nullable=False),
+    sa.Column('expired_count', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+    sa.ForeignKeyConstraint(['event_id'], ['events.id'], ),
+    sa.PrimaryKeyConstraint('event_id')
+    )
+    op.execute("""
+        INSERT INTO event_ticket_stats (event_id, reserved_count, paid_count, expired_count, updated_at)
+        SELECT event_id,
+               count(*) FILTER (WHERE status = 'RESERVED'),
+               count(*) FILTER (WHERE status = 'PAID'),
+               count(*) FILTER (WHERE status = 'EXPIRED'),
+               now()
+        FROM tickets
+        GROUP BY event_id
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('event_ticket_stats')
@@ -0,0 +1,44 @@
+"""tickets archive
+
+Revision ID: 0001c
+Revises: 0001b
+Create Date: 2026-10-19 16:09:58.377104
+
+Cold table for expired tickets and tickets of past events, moved out of
+`tickets` by the archival task. Same columns as tickets, no foreign keys.
+
+Slotted in before 0002: the schema it adds used to be created by 0001, so
+databases already past 0001 have it and never run this revision.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '0001c'
+down_revision: Union[str, Sequence[str], None] = '0001b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('tickets_archive',
+    sa.Column('id', sa.Uuid(), nullable=False),
+    sa.Column('user_id', sa.Uuid(), nullable=False),
+    sa.Column('event_id', sa.Uuid(), nullable=False),
+    sa.Column('status', sa.Enum('RESERVED', 'PAID', 'EXPIRED', name='ticketstatus', native_enum=False), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('archived_at', sa.DateTime(timezone=True), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_tickets_archive_event_id'), 'tickets_archive', ['event_id'], unique=False)
+    op.create_index(op.f('ix_tickets_archive_user_id'), 'tickets_archive', ['user_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_tickets_archive_user_id'), table_name='tickets_archive')
+    op.drop_index(op.f('ix_tickets_archive_event_id'), table_name='tickets_archive')
+    op.drop_table('tickets_archive')
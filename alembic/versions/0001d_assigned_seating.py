@@ -0,0 +1,72 @@
+"""assigned seating
+
+Revision ID: 0001d
+Revises: 0001c
+Create Date: 2026-10-19 16:12:31.604920
+
+Seat rows with their taken-seat bitmaps, the per-event assigned_seating
+switch and the seat columns on tickets and archived tickets. The partial
+unique index keeps a seat on at most one live ticket and is built
+CONCURRENTLY.
+
+Slotted in before 0002: the schema it adds used to be created by 0001, so
+databases already past 0001 have it and never run this revision.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '0001d'
+down_revision: Union[str, Sequence[str], None] = '0001c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        'events',
+        sa.Column('assigned_seating', sa.Boolean(), server_default=sa.false(), nullable=False),
+    )
+    op.create_table('seat_rows',
+    sa.Column('id', sa.Uuid(), nullable=False),
+    sa.Column('event_id', sa.Uuid(), nullable=False),
+    sa.Column('section', sa.String(length=100), nullable=False),
+    sa.Column('label', sa.String(length=20), nullable=False),
+    sa.Column('rank', sa.Integer(), nullable=False),
+    sa.Column('seat_count', sa.Integer(), nullable=False),
+    sa.Column('taken', sa.LargeBinary(), nullable=False),
+    sa.ForeignKeyConstraint(['event_id'], ['events.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('event_id', 'section', 'label')
+    )
+    op.create_index(op.f('ix_seat_rows_event_id'), 'seat_rows', ['event_id'], unique=False)
+    for table in ('tickets', 'tickets_archive'):
+        op.add_column(table, sa.Column('seat_row_id', sa.Uuid(), nullable=True))
+        op.add_column(table, sa.Column('seat_number', sa.Integer(), nullable=True))
+    op.create_foreign_key('tickets_seat_row_id_fkey', 'tickets', 'seat_rows', ['seat_row_id'], ['id'])
+    # CREATE INDEX CONCURRENTLY can't run inside a transaction
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'uq_tickets_live_seat',
+            'tickets',
+            ['seat_row_id', 'seat_number'],
+            unique=True,
+            postgresql_where=sa.text("status != 'EXPIRED'"),
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('uq_tickets_live_seat', table_name='tickets', postgresql_concurrently=True)
+    op.drop_constraint('tickets_seat_row_id_fkey', 'tickets', type_='foreignkey')
+    for table in ('tickets', 'tickets_archive'):
+        op.drop_column(table, 'seat_number')
+        op.drop_column(table, 'seat_row_id')
+    op.drop_index(op.f('ix_seat_rows_event_id'), table_name='seat_rows')
+    op.drop_table('seat_rows')
+    op.drop_column('events', 'assigned_seating')
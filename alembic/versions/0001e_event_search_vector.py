@@ -0,0 +1,58 @@
+"""event search vector
+
+Revision ID: 0001e
+Revises: 0001d
+Create Date: 2026-10-19 16:15:03.751288
+
+Generated tsvector over event titles (weight A) and descriptions (weight
+B) for ranked full-text search. Adding the stored column computes it for
+every existing event; its GIN index is built CONCURRENTLY.
+
+Slotted in before 0002: the schema it adds used to be created by 0001, so
+databases already past 0001 have it and never run this revision.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '0001e'
+down_revision: Union[str, Sequence[str], None] = '0001d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        'events',
+        sa.Column(
+            'search_vector',
+            postgresql.TSVECTOR(),
+            sa.Computed(
+                "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+                "setweight(to_tsvector('english', coalesce(description, '')), 'B')",
+                persisted=True,
+            ),
+            nullable=True,
+        ),
+    )
+    # CREATE INDEX CONCURRENTLY can't run inside a transaction
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'idx_events_search_vector',
+            'events',
+            ['search_vector'],
+            unique=False,
+            postgresql_using='gin',
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('idx_events_search_vector', table_name='events', postgresql_concurrently=True)
+    op.drop_column('events', 'search_vector')
@@ -0,0 +1,68 @@
+"""event listing indexes
+
+Revision ID: 0002
+Revises: 0001e
+Create Date: 2026-10-19 07:12:40.318220
+
+Adds the generated events.tickets_available column and the covering /
+partial indexes behind the filtered event listing. Indexes are built
+CONCURRENTLY so the events table stays writable during the migration.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, Sequence[str], None] = '0001e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        'events',
+        sa.Column(
+            'tickets_available',
+            sa.Integer(),
+            sa.Computed('total_tickets - tickets_sold', persisted=True),
+            nullable=False,
+        ),
+    )
+    # CREATE INDEX CONCURRENTLY can't run inside a transaction
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_events_listing',
+            'events',
+            ['start_time', 'id'],
+            unique=False,
+            postgresql_include=['tickets_available'],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_events_listing_available',
+            'events',
+            ['start_time', 'id'],
+            unique=False,
+            postgresql_where=sa.text('tickets_available > 0'),
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_events_venue_listing',
+            'events',
+            ['venue_location', 'start_time', 'id'],
+            unique=False,
+            postgresql_include=['tickets_available'],
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_events_venue_listing', table_name='events', postgresql_concurrently=True)
+        op.drop_index('ix_events_listing_available', table_name='events', postgresql_concurrently=True)
+        op.drop_index('ix_events_listing', table_name='events', postgresql_concurrently=True)
+    op.drop_column('events', 'tickets_available')
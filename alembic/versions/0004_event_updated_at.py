@@ -0,0 +1,47 @@
+"""event updated_at
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19 09:41:05.220817
+
+Database-maintained write time of each event, polled by the in-process
+event catalog for incremental refreshes.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '0004'
+down_revision: Union[str, Sequence[str], None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        'events',
+        sa.Column(
+            'updated_at',
+            sa.DateTime(timezone=True),
+            server_default=sa.text('now()'),
+            nullable=False,
+        ),
+    )
+    with op.get_context().autocommit_block():
+        op.create_index(
+            op.f('ix_events_updated_at'),
+            'events',
+            ['updated_at'],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(op.f('ix_events_updated_at'), table_name='events', postgresql_concurrently=True)
+    op.drop_column('events', 'updated_at')
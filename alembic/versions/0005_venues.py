@@ -0,0 +1,118 @@
+"""venues
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-19 11:02:37.514093
+
+Moves venue details and the geography point out of events into a shared
+venues table keyed by normalized address. Existing events are backfilled
+onto one venue per distinct address (the key matches
+app.utils.geo.normalize_address), then the per-event venue columns and
+their spatial index are dropped.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from app.models.geography import Geography
+
+# revision identifiers, used by Alembic.
+revision: str = '0005'
+down_revision: Union[str, Sequence[str], None] = '0004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _address_key(column: str) -> str:
+    """SQL for app.utils.geo.normalize_address applied to `column`"""
+    return rf"btrim(regexp_replace(lower({column}), '\W+', ' ', 'g'))"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('venues',
+    sa.Column('id', sa.Uuid(), nullable=False),
+    sa.Column('location', sa.String(length=255), nullable=False),
+    sa.Column('address', sa.String(length=500), nullable=False),
+    sa.Column('address_key', sa.String(length=500), nullable=False),
+    sa.Column('latitude', sa.Float(), nullable=False),
+    sa.Column('longitude', sa.Float(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('geo_location', Geography(geometry_type="POINT", srid=4326), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('address_key')
+    )
+    op.create_index(op.f('ix_venues_location'), 'venues', ['location'], unique=False)
+
+    # One venue per distinct address; the earliest event's details win
+    op.execute(f"""
+        INSERT INTO venues (id, location, address, address_key, latitude, longitude, geo_location)
+        SELECT DISTINCT ON (address_key)
+            gen_random_uuid(), venue_location, venue_address, address_key,
+            venue_latitude, venue_longitude,
+            ST_SetSRID(ST_MakePoint(venue_longitude, venue_latitude), 4326)::geography
+        FROM (SELECT *, {_address_key('venue_address')} AS address_key FROM events) AS e
+        ORDER BY address_key, start_time, id
+    """)
+    op.add_column('events', sa.Column('venue_id', sa.Uuid(), nullable=True))
+    op.execute(f"""
+        UPDATE events SET venue_id = venues.id
+        FROM venues WHERE venues.address_key = {_address_key('events.venue_address')}
+    """)
+    op.alter_column('events', 'venue_id', nullable=False)
+    op.create_foreign_key('events_venue_id_fkey', 'events', 'venues', ['venue_id'], ['id'])
+    op.create_index('idx_venues_geo_location', 'venues', ['geo_location'], unique=False, postgresql_using='gist')
+
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_events_venue_listing', table_name='events', postgresql_concurrently=True)
+        op.drop_index('idx_events_geo_location', table_name='events', postgresql_using='gist', postgresql_concurrently=True)
+        op.create_index(
+            'ix_events_venue_listing',
+            'events',
+            ['venue_id', 'start_time', 'id'],
+            unique=False,
+            postgresql_include=['tickets_available'],
+            postgresql_concurrently=True,
+        )
+    op.drop_column('events', 'geo_location')
+    op.drop_column('events', 'venue_longitude')
+    op.drop_column('events', 'venue_latitude')
+    op.drop_column('events', 'venue_address')
+    op.drop_column('events', 'venue_location')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.add_column('events', sa.Column('venue_location', sa.String(length=255), nullable=True))
+    op.add_column('events', sa.Column('venue_address', sa.String(length=500), nullable=True))
+    op.add_column('events', sa.Column('venue_latitude', sa.Float(), nullable=True))
+    op.add_column('events', sa.Column('venue_longitude', sa.Float(), nullable=True))
+    op.add_column('events', sa.Column('geo_location', Geography(geometry_type="POINT", srid=4326), nullable=True))
+    op.execute("""
+        UPDATE events SET
+            venue_location = venues.location,
+            venue_address = venues.address,
+            venue_latitude = venues.latitude,
+            venue_longitude = venues.longitude,
+            geo_location = venues.geo_location
+        FROM venues WHERE venues.id = events.venue_id
+    """)
+    for column in ('venue_location', 'venue_address', 'venue_latitude', 'venue_longitude'):
+        op.alter_column('events', column, nullable=False)
+
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_events_venue_listing', table_name='events', postgresql_concurrently=True)
+        op.create_index(
+            'ix_events_venue_listing',
+            'events',
+            ['venue_location', 'start_time', 'id'],
+            unique=False,
+            postgresql_include=['tickets_available'],
+            postgresql_concurrently=True,
+        )
+    op.create_index('idx_events_geo_location', 'events', ['geo_location'], unique=False, postgresql_using='gist')
+    op.drop_constraint('events_venue_id_fkey', 'events', type_='foreignkey')
+    op.drop_column('events', 'venue_id')
+    op.drop_index('idx_venues_geo_location', table_name='venues', postgresql_using='gist')
+    op.drop_index(op.f('ix_venues_location'), table_name='venues')
+    op.drop_table('venues')
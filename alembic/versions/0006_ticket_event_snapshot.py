@@ -0,0 +1,38 @@
+"""ticket event snapshot
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-19 12:20:48.903176
+
+Optional copy of the event fields shown in ticket history (title, start
+time, venue location) on tickets and archived tickets. Nullable and not
+backfilled: tickets without a snapshot read the event instead.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '0006'
+down_revision: Union[str, Sequence[str], None] = '0005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ('tickets', 'tickets_archive')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table in TABLES:
+        op.add_column(table, sa.Column('event_title', sa.String(length=255), nullable=True))
+        op.add_column(table, sa.Column('event_start_time', sa.DateTime(timezone=True), nullable=True))
+        op.add_column(table, sa.Column('venue_location', sa.String(length=255), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in TABLES:
+        op.drop_column(table, 'venue_location')
+        op.drop_column(table, 'event_start_time')
+        op.drop_column(table, 'event_title')
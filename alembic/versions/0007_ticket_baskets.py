@@ -0,0 +1,47 @@
+"""ticket baskets
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-19 15:02:11.472830
+
+Groups tickets reserved in one basket checkout under a basket_id, on
+tickets and archived tickets. Nullable and not backfilled: existing
+tickets were reserved one at a time. The partial index only covers
+basket tickets and is built CONCURRENTLY.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '0007'
+down_revision: Union[str, Sequence[str], None] = '0006'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ('tickets', 'tickets_archive')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table in TABLES:
+        op.add_column(table, sa.Column('basket_id', sa.Uuid(), nullable=True))
+    # CREATE INDEX CONCURRENTLY can't run inside a transaction
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_tickets_basket_id',
+            'tickets',
+            ['basket_id'],
+            unique=False,
+            postgresql_where=sa.text('basket_id IS NOT NULL'),
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_tickets_basket_id', table_name='tickets', postgresql_concurrently=True)
+    for table in TABLES:
+        op.drop_column(table, 'basket_id')
@@ -0,0 +1,40 @@
+"""task outbox
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-19 17:41:36.208514
+
+Transactional outbox for task calls: reservations write their expiration
+task here in the same transaction as the tickets, and
+app.workers.outbox_relay sends rows to the broker and deletes them. Rows
+only live until the relay picks them up, so the table stays small.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '0008'
+down_revision: Union[str, Sequence[str], None] = '0007'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('task_outbox',
+    sa.Column('id', sa.Uuid(), nullable=False),
+    sa.Column('task', sa.String(length=255), nullable=False),
+    sa.Column('args', sa.JSON(), nullable=False),
+    sa.Column('eta', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_task_outbox_created_at'), 'task_outbox', ['created_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_task_outbox_created_at'), table_name='task_outbox')
+    op.drop_table('task_outbox')
@@ -1,6 +1,7 @@
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from functools import lru_cache
+from typing import Optional
 
 
 class Settings(BaseSettings):
@@ -16,6 +17,22 @@ class Settings(BaseSettings):
         "sqlite:///:memory:"  # Use this for docker - postgresql+asyncpg://postgres:postgres@db:5432/eventdb
     )
 
+    # Read replica (optional) - when unset, reads go to the primary
+    database_read_url: Optional[str] = None
+    # Reads stick to the primary for this long after a client's own write
+    read_your_writes_window_seconds: float = 5.0
+
+    # Connection pool
+    db_pool_size: int = 10
+    db_max_overflow: int = 20
+
+    # Admission control in front of the connection pool
+    admission_reserved_for_writes: int = 10  # pool slots reads can never take
+    admission_read_queue_timeout: float = 0.5  # seconds a read may wait for a slot
+    admission_write_queue_timeout: float = 2.0  # seconds a reservation may wait
+    admission_max_queue: int = 200  # waiters per route class before shedding
+    admission_target_pool_wait_ms: float = 50.0  # shrink read limit above this
+
     # Redis/Celery
     redis_url: str = "redis://redis:6379/0"
     celery_broker_url: str = "redis://redis:6379/0"
@@ -25,8 +42,93 @@ class Settings(BaseSettings):
     app_name: str = "Event Ticketing API"
     debug: bool = True
 
+    # Waiting room for on-sale events
+    waiting_room_backend: str = "redis"  # "redis" or "memory" (single process/tests)
+    waiting_room_secret: str = "change-me-waiting-room-secret"
+    waiting_room_admission_ttl: int = 300  # seconds an admission token stays valid
+    waiting_room_pump_interval: float = 1.0  # seconds between admission pump runs
+
+    # Reservation rate limits and hold caps
+    rate_limit_backend: str = "redis"  # "redis" (with in-process fallback) or "memory"
+    reservation_rate_window_seconds: float = 60.0
+    reservation_rate_limit_per_user: int = 20  # reservations per window per user
+    reservation_rate_limit_per_user_event: int = 10  # per window per user per event
+    max_reserved_tickets_per_user_event: int = 6  # concurrent unpaid holds
+
+    # Real-time availability push
+    availability_backend: str = "redis"  # "redis" (cross-process) or "memory"
+    availability_channel: str = "event_availability"
+    availability_max_updates_per_second: float = 2.0  # per event, extra updates coalesce
+    availability_keepalive_seconds: float = 15.0
+
+    # tickets_sold reconciliation
+    reconcile_chunk_size: int = 5000  # events per aggregated query
+    reconcile_grace_seconds: float = 10.0  # skip events with tickets or counter changes newer than this
+    reconcile_interval_seconds: float = 300.0
+
+    # Metrics recorded by workers and reported by the API's /metrics
+    shared_metrics_backend: str = "redis"  # "redis" or "memory" (single process/tests)
+
+    # Event search
+    search_max_candidates: int = 1000  # best-ranked matches a query can page through (Postgres)
+
+    # Shared response cache for browse endpoints
+    response_cache_enabled: bool = True
+    response_cache_backend: str = "memory"  # "memory" or "redis" (shared tier + invalidation feed)
+    response_cache_channel: str = "response_cache_invalidate"
+    response_cache_fresh_seconds: float = 2.0
+    response_cache_stale_seconds: float = 30.0  # served stale while one refresh runs
+    response_cache_max_entries: int = 2048  # per process
+    response_cache_count_invalidate_seconds: float = 0.5  # batch ticket count invalidations
+
+    # Identical concurrent reads (event by id, listings, relevant events)
+    # share one in-flight query per process
+    read_coalescing_enabled: bool = True
+
+    # In-process columnar catalog of upcoming events (needs numpy)
+    event_catalog_enabled: bool = False
+    event_catalog_refresh_seconds: float = 1.0  # poll events.updated_at this often
+    event_catalog_poll_overlap_seconds: float = 5.0  # re-read for late-committing writes
+    event_catalog_load_batch_size: int = 10000
+
+    # Assigned seating
+    seat_map_cache_ttl_seconds: float = 2.0  # reload seat bitmaps at least this often
+    max_seats_per_reservation: int = 10
+
+    # Basket checkout
+    max_basket_tickets: int = 10  # tickets per basket, across all its events
+
+    # Optimistic concurrency on event counters (compare-and-swap on events.version)
+    optimistic_max_attempts: int = 5  # tries per reservation before a guarded SQL increment
+    optimistic_retry_base_delay: float = 0.005  # seconds, doubled per retry, full jitter
+
+    # Ticket history
+    ticket_event_snapshot_enabled: bool = False  # copy event title/start/venue onto new tickets
+
+    # Archival of cold tickets
+    archive_expired_after_seconds: int = 3600  # archive EXPIRED tickets older than this
+    archive_past_events_after_days: int = 7  # archive all tickets of events ended this long ago
+    archive_batch_size: int = 1000
+    archive_batch_pause_seconds: float = 0.5  # throttle between batches
+    archive_max_batches_per_run: int = 100
+    archive_interval_seconds: float = 900.0
+
     # Ticket expiration (in seconds)
     ticket_reservation_timeout: int = 120  # 2 minutes
+    stale_hold_reclaim_limit: int = 100  # overdue holds expired inline per sold-out check
+
+    # Batched expiration consumer (app.workers.expiration_consumer)
+    expiration_queue: str = "ticket_expirations"
+    expiration_batch_size: int = 500  # tickets expired per UPDATE
+    expiration_poll_seconds: float = 1.0  # longest a due message waits for its batch
+    expiration_prefetch: int = 50000  # unacked messages held until their ETA
+    expiration_max_attempts: int = 10  # failures before a message is dead-lettered (the last one alone)
+    expiration_retry_base_delay: float = 1.0  # seconds before retrying a failed batch, doubled per failure
+    expiration_retry_max_delay: float = 60.0
+
+    # Transactional outbox relay (app.workers.outbox_relay)
+    outbox_batch_size: int = 500  # task_outbox rows sent per transaction
+    outbox_poll_seconds: float = 0.2  # wait between polls once the outbox is drained
 
     # Geospatial
     default_search_radius_km: float = 50.0  # 50km radius for event search
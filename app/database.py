@@ -1,6 +1,8 @@
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from sqlalchemy.orm import DeclarativeBase
 from app.config import get_settings
+from app.utils.admission import AdmissionController, AdmittedSession
+import time
 
 settings = get_settings()
 
@@ -14,20 +16,91 @@ engine = create_async_engine(
     settings.database_url,
     echo=settings.debug,
     pool_pre_ping=True,
-    pool_size=10,
-    max_overflow=20,
+    pool_size=settings.db_pool_size,
+    max_overflow=settings.db_max_overflow,
 )
 
-# Create session factory - this MUST be created at module level
+# Create session factory - this MUST be created at module level.
+# Sessions opened through an AdmissionController check out a connection
+# on first use; elsewhere they behave like plain AsyncSessions.
 AsyncSessionLocal = async_sessionmaker(
     engine,
-    class_=AsyncSession,
+    class_=AdmittedSession,
     expire_on_commit=False,
     autocommit=False,
     autoflush=False,
 )
 
 
+# Optional read replica engine - falls back to the primary when not configured
+if settings.database_read_url:
+    read_engine = create_async_engine(
+        settings.database_read_url,
+        echo=settings.debug,
+        pool_pre_ping=True,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+    )
+else:
+    read_engine = engine
+
+AsyncReadSessionLocal = async_sessionmaker(
+    read_engine,
+    class_=AdmittedSession,
+    expire_on_commit=False,
+    autocommit=False,
+    autoflush=False,
+)
+
+
+def _create_admission_controller(reserved_for_writes: int) -> AdmissionController:
+    return AdmissionController(
+        capacity=settings.db_pool_size + settings.db_max_overflow,
+        reserved_for_writes=reserved_for_writes,
+        read_queue_timeout=settings.admission_read_queue_timeout,
+        write_queue_timeout=settings.admission_write_queue_timeout,
+        max_queue=settings.admission_max_queue,
+        target_pool_wait=settings.admission_target_pool_wait_ms / 1000.0,
+    )
+
+
+# One admission controller per connection pool
+primary_admission = _create_admission_controller(
+    settings.admission_reserved_for_writes
+)
+# The replica only ever serves reads, so none of its pool is held back
+read_admission = (
+    primary_admission if read_engine is engine else _create_admission_controller(0)
+)
+
+
+# Read-your-writes tracking: keys (e.g. user ids) that wrote recently
+_recent_writes: dict[str, float] = {}
+
+
+def mark_recent_write(key) -> None:
+    """Pin reads for `key` to the primary for the read-your-writes window"""
+    now = time.monotonic()
+    if len(_recent_writes) > 10_000:
+        # Drop entries whose window has already passed
+        for stale in [k for k, t in _recent_writes.items() if t <= now]:
+            del _recent_writes[stale]
+    _recent_writes[str(key)] = now + settings.read_your_writes_window_seconds
+
+
+def has_recent_write(key) -> bool:
+    """Check if `key` wrote within the read-your-writes window"""
+    if key is None:
+        return False
+    deadline = _recent_writes.get(str(key))
+    return deadline is not None and deadline > time.monotonic()
+
+
+# Session.info flag on sessions whose reads must see the primary's latest
+# writes (read-your-writes), so nothing may answer them from a lagging copy
+READS_PRIMARY = "reads_primary"
+
+
 # Dependency for FastAPI
 async def get_db():
     async with AsyncSessionLocal() as session:
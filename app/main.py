@@ -4,20 +4,12 @@ import time
 import logging
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-import uvicorn
-import sys
+from fastapi.responses import PlainTextResponse
 import os
 
-import colorama
-
-colorama.just_fix_windows_console()
-
-# Add the current directory to the path to allow imports
-sys.path.append(os.path.dirname(os.path.abspath(__file__)))
-
-from config import get_settings
-from utils.logger import setup_logger
-from database import Base, get_db
+from app.config import get_settings
+from app.utils.logger import setup_logger
+from app.database import get_db, primary_admission
 
 settings = get_settings()
 
@@ -25,9 +17,13 @@ settings = get_settings()
 log_level = logging.DEBUG if settings.debug else logging.INFO
 logger = setup_logger(__name__, log_level)
 
-from routers.users import router as users_router
-from routers.events import router as events_router
-from routers.tickets import router as tickets_router
+from app.routers.users import router as users_router
+from app.routers.events import router as events_router
+from app.routers.tickets import router as tickets_router
+from app.routers.waiting_room import router as waiting_room_router
+from app.routers.deps import READ_AFTER_WRITE_COOKIE
+from app.utils.metrics import metrics, create_shared_metrics
+from app.utils.response_cache import ResponseCacheMiddleware, response_cache
 
 
 @asynccontextmanager
@@ -50,7 +46,15 @@ async def lifespan(app: FastAPI):
 
     # Shutdown
     logger.info("Shutting down Event Ticketing API")
+    # Batched ticket count invalidations still waiting for their flush
+    await response_cache.flush_counts()
+    if shared_metrics is not None:
+        await shared_metrics.close()
+
 
+# Metrics recorded by the Celery workers, reported alongside this process's own.
+# Opened on the first scrape so starting the API doesn't load the Redis client.
+shared_metrics = None
 
 app = FastAPI(
     title=settings.app_name,
@@ -70,10 +74,18 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Shared cache for browse listings (identical for many callers within seconds)
+app.add_middleware(
+    ResponseCacheMiddleware,
+    paths=[r"/api/v1/events", r"/api/v1/users/[^/]+/relevant-events"],
+    bypass_cookie=READ_AFTER_WRITE_COOKIE,
+)
+
 # Include routers
 app.include_router(events_router, prefix="/api/v1")
 app.include_router(tickets_router, prefix="/api/v1")
 app.include_router(users_router, prefix="/api/v1")
+app.include_router(waiting_room_router, prefix="/api/v1")
 
 
 # Add request logging middleware
@@ -113,6 +125,22 @@ async def log_request(request: Request, call_next):
         raise
 
 
+# Keep a client's reads on the primary for a short window after its own writes
+@app.middleware("http")
+async def read_your_writes(request: Request, call_next):
+    response = await call_next(request)
+
+    if request.method in ("POST", "PUT", "PATCH", "DELETE") and response.status_code < 400:
+        response.set_cookie(
+            READ_AFTER_WRITE_COOKIE,
+            str(int(time.time())),
+            max_age=max(1, int(settings.read_your_writes_window_seconds)),
+            httponly=True,
+        )
+
+    return response
+
+
 @app.get("/")
 async def root():
     return {"message": "Event Ticketing API", "version": "1.0.0", "docs": "/docs"}
@@ -123,5 +151,24 @@ async def health_check():
     return {"status": "healthy"}
 
 
+@app.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    """Process metrics in the Prometheus text format"""
+    global shared_metrics
+    if shared_metrics is None:
+        shared_metrics = create_shared_metrics()
+    for route_class, value in primary_admission.stats()["in_flight"].items():
+        metrics.set("db_admission_in_flight", value, route_class=route_class)
+    for route_class, value in primary_admission.stats()["shed"].items():
+        metrics.set("db_admission_shed_total", value, route_class=route_class)
+    metrics.set("db_pool_wait_ewma_seconds", primary_admission.pool_wait_ewma)
+    return metrics.render() + await shared_metrics.render()
+
+
 if __name__ == "__main__":
-    uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
+    # Dev server only: these are not needed by gunicorn workers
+    import colorama
+    import uvicorn
+
+    colorama.just_fix_windows_console()
+    uvicorn.run("app.main:app", host="0.0.0.0", port=8000, reload=True)
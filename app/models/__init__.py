@@ -1,5 +1,19 @@
 from app.models.user import User
-from app.models.event import Event, Venue
-from app.models.ticket import Ticket, TicketStatus
+from app.models.event import Event
+from app.models.venue import Venue
+from app.models.ticket import Ticket, TicketStatus, ArchivedTicket
+from app.models.ticket_stats import EventTicketStats
+from app.models.seat import SeatRow
+from app.models.outbox import OutboxMessage
 
-__all__ = ["User", "Event", "Venue", "Ticket", "TicketStatus"]
+__all__ = [
+    "User",
+    "Event",
+    "Venue",
+    "Ticket",
+    "TicketStatus",
+    "ArchivedTicket",
+    "EventTicketStats",
+    "SeatRow",
+    "OutboxMessage",
+]
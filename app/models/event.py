@@ -1,57 +1,20 @@
-from sqlalchemy import Column, String, Integer, DateTime, Float
-from sqlalchemy.orm import Mapped, mapped_column, relationship, composite
-from geoalchemy2 import Geography
+from sqlalchemy import String, Integer, DateTime, Boolean, Index, Computed, ForeignKey
+from sqlalchemy import literal_column, func
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import Mapped, mapped_column, relationship
 from datetime import datetime
 from app.database import Base
+from app.models.geography import IS_SQLITE
 import uuid
-import os
 from typing import TYPE_CHECKING
-from app.utils.logger import setup_logger
-from app.config import get_settings
-
-settings = get_settings()
-logger = setup_logger(__name__)
 
 if TYPE_CHECKING:
     from app.models.ticket import Ticket
+    from app.models.venue import Venue
 
 
-IS_SQLITE = "sqlite" in settings.database_url
-logger.info(f"USING IS_SQLITE: {IS_SQLITE}")
-
-
-class Venue:
-    """Composite type for venue information"""
-
-    def __init__(
-        self,
-        location: str,
-        address: str,
-        latitude: float = None,
-        longitude: float = None,
-    ):
-        self.location = location
-        self.address = address
-        self.latitude = latitude
-        self.longitude = longitude
-
-    def __composite_values__(self):
-        return self.location, self.address, self.latitude, self.longitude
-
-    def __repr__(self):
-        return f"Venue(location={self.location}, address={self.address})"
-
-    def __eq__(self, other):
-        return (
-            isinstance(other, Venue)
-            and other.location == self.location
-            and other.address == self.address
-            and other.latitude == self.latitude
-            and other.longitude == self.longitude
-        )
-
-    def __ne__(self, other):
-        return not self.__eq__(other)
+# Text search configuration for the events search vector and queries
+SEARCH_CONFIG = "english"
 
 
 class Event(Base):
@@ -67,27 +30,66 @@ class Event(Base):
     total_tickets: Mapped[int] = mapped_column(Integer, nullable=False)
     tickets_sold: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
 
-    # Venue composite
-    venue_location: Mapped[str] = mapped_column(String(255), nullable=False)
-    venue_address: Mapped[str] = mapped_column(String(500), nullable=False)
-    venue_latitude: Mapped[float] = mapped_column(Float, nullable=False)
-    venue_longitude: Mapped[float] = mapped_column(Float, nullable=False)
+    # Stored copy of total_tickets - tickets_sold so listing filters can use indexes
+    tickets_available: Mapped[int] = mapped_column(
+        Integer, Computed("total_tickets - tickets_sold", persisted=True)
+    )
+
+    # Bumped in SQL by every UPDATE of the row, ORM or bulk, tickets_sold
+    # changes included; event ETags are derived from it
+    version: Mapped[int] = mapped_column(
+        Integer,
+        default=1,
+        server_default="1",
+        onupdate=literal_column("version") + 1,
+        nullable=False,
+    )
+    # Set by the database on every write; in-process catalogs poll it for changes
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False,
+        index=True,
+    )
+
+    # Reservations require a waiting room admission token while enabled
+    waiting_room_enabled: Mapped[bool] = mapped_column(
+        Boolean, default=False, nullable=False
+    )
 
-    venue: Mapped[Venue] = composite(
-        Venue, venue_location, venue_address, venue_latitude, venue_longitude
+    # Tickets are sold as assigned seats from the event's seat map
+    assigned_seating: Mapped[bool] = mapped_column(
+        Boolean, default=False, nullable=False
+    )
+
+    # Shared venue row; its geography point is what radius queries search
+    venue_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("venues.id"), nullable=False
     )
 
-    # Geospatial column for efficient location-based queries
-    # Use Geography only in Postgres
     if not IS_SQLITE:
-        geo_location = mapped_column(
-            Geography(geometry_type="POINT", srid=4326), nullable=True, index=True
+        # Full-text search: title terms rank above description terms
+        search_vector = mapped_column(
+            TSVECTOR,
+            Computed(
+                f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(title, '')), 'A') || "
+                f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(description, '')), 'B')",
+                persisted=True,
+            ),
+            deferred=True,  # only used in WHERE/ORDER BY, never loaded
         )
-    else:
-        geo_location = Column(String, nullable=True)  # fallback for SQLite
+        __table_args__ = (
+            Index("idx_events_search_vector", "search_vector", postgresql_using="gin"),
+        )
+    # SQLite searches use the in-process index in app.utils.search
 
     # Relationships
     tickets: Mapped[list["Ticket"]] = relationship("Ticket", back_populates="event")
+    # Many-to-one by primary key, so it's always joined in rather than lazy loaded
+    venue: Mapped["Venue"] = relationship(
+        "Venue", back_populates="events", lazy="joined", innerjoin=True
+    )
 
     @property
     def available_tickets(self) -> int:
@@ -97,5 +99,49 @@ class Event(Base):
     def is_sold_out(self) -> bool:
         return self.tickets_sold >= self.total_tickets
 
+    # Venue fields as read by responses and the in-process catalog
+    @property
+    def venue_location(self) -> str:
+        return self.venue.location
+
+    @property
+    def venue_address(self) -> str:
+        return self.venue.address
+
+    @property
+    def venue_latitude(self) -> float:
+        return self.venue.latitude
+
+    @property
+    def venue_longitude(self) -> float:
+        return self.venue.longitude
+
     def __repr__(self):
         return f"<Event(id={self.id}, title={self.title}, available={self.available_tickets})>"
+
+
+# Listing indexes: (start_time, id) is the listing order. The availability
+# and venue filters are covered (INCLUDE / partial index) so Postgres can
+# answer the filtered, ordered id page with an index-only scan. The venue
+# listing index also serves the venue_id foreign key and the venue-first
+# radius queries' join back to events.
+Index(
+    "ix_events_listing",
+    Event.start_time,
+    Event.id,
+    postgresql_include=["tickets_available"],
+)
+Index(
+    "ix_events_listing_available",
+    Event.start_time,
+    Event.id,
+    postgresql_where=Event.tickets_available > 0,
+    sqlite_where=Event.tickets_available > 0,
+)
+Index(
+    "ix_events_venue_listing",
+    Event.venue_id,
+    Event.start_time,
+    Event.id,
+    postgresql_include=["tickets_available"],
+)
@@ -0,0 +1,32 @@
+from sqlalchemy import func
+from sqlalchemy.types import UserDefinedType
+from app.config import get_settings
+
+settings = get_settings()
+
+IS_SQLITE = "sqlite" in settings.database_url
+
+
+class Geography(UserDefinedType):
+    """
+    PostGIS geography column.
+
+    Values are written and read as EWKT strings (e.g. "SRID=4326;POINT(3.3 6.5)"),
+    so neither GeoAlchemy2 nor Shapely (and NumPy behind it) are loaded on
+    API or worker startup - spatial work happens in the database.
+    """
+
+    cache_ok = True
+
+    def __init__(self, geometry_type: str = "POINT", srid: int = 4326):
+        self.geometry_type = geometry_type
+        self.srid = srid
+
+    def get_col_spec(self, **kw):
+        return f"geography({self.geometry_type},{self.srid})"
+
+    def bind_expression(self, bindvalue):
+        return func.ST_GeogFromText(bindvalue, type_=self)
+
+    def column_expression(self, col):
+        return func.ST_AsEWKT(col, type_=self)
@@ -0,0 +1,29 @@
+from sqlalchemy import String, DateTime, JSON
+from sqlalchemy.orm import Mapped, mapped_column
+from datetime import datetime, timezone
+from app.database import Base
+import uuid
+
+
+class OutboxMessage(Base):
+    """
+    A Celery task call waiting to be sent to the broker.
+    Written in the same transaction as the change that schedules it, and
+    deleted by app.workers.outbox_relay once sent; its id is the task id.
+    """
+
+    __tablename__ = "task_outbox"
+
+    id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid.uuid4)
+    task: Mapped[str] = mapped_column(String(255), nullable=False)
+    args: Mapped[list] = mapped_column(JSON, nullable=False)
+    eta: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        nullable=False,
+        index=True,
+    )
+
+    def __repr__(self):
+        return f"<OutboxMessage(id={self.id}, task={self.task}, eta={self.eta})>"
@@ -0,0 +1,29 @@
+from sqlalchemy import String, Integer, LargeBinary, ForeignKey, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+from app.database import Base
+import uuid
+
+
+class SeatRow(Base):
+    """
+    One row of an event's seat map.
+    Seat availability is a compact bitset (bit i set = seat i + 1 taken),
+    so a whole row is read and written as a single value.
+    """
+
+    __tablename__ = "seat_rows"
+    __table_args__ = (UniqueConstraint("event_id", "section", "label"),)
+
+    id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid.uuid4)
+    event_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("events.id"), nullable=False, index=True
+    )
+    section: Mapped[str] = mapped_column(String(100), nullable=False)
+    label: Mapped[str] = mapped_column(String(20), nullable=False)
+    # Preference order for best-available allocation, lowest first
+    rank: Mapped[int] = mapped_column(Integer, nullable=False)
+    seat_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    taken: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+
+    def __repr__(self):
+        return f"<SeatRow(event_id={self.event_id}, section={self.section}, row={self.label})>"
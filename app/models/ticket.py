@@ -1,14 +1,14 @@
-from sqlalchemy import String, DateTime, ForeignKey, Enum as SQLEnum
+from sqlalchemy import String, Integer, DateTime, ForeignKey, Index, Enum as SQLEnum
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from datetime import datetime, timezone
 from enum import Enum
 from app.database import Base
 import uuid
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Optional
 
 if TYPE_CHECKING:
-    from models.user import User
-    from models.event import Event
+    from app.models.user import User
+    from app.models.event import Event
 
 
 class TicketStatus(str, Enum):
@@ -39,6 +39,23 @@ class Ticket(Base):
         nullable=False,
     )
 
+    # Assigned seat (None for general admission)
+    seat_row_id: Mapped[Optional[uuid.UUID]] = mapped_column(
+        ForeignKey("seat_rows.id"), nullable=True
+    )
+    seat_number: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+
+    # Tickets reserved together in one basket checkout (None for single tickets)
+    basket_id: Mapped[Optional[uuid.UUID]] = mapped_column(nullable=True)
+
+    # Snapshot of the event fields shown in ticket history, taken at
+    # reservation while ticket_event_snapshot_enabled (None otherwise)
+    event_title: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+    event_start_time: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+    venue_location: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+
     # Relationships
     user: Mapped["User"] = relationship("User", back_populates="tickets")
     event: Mapped["Event"] = relationship("Event", back_populates="tickets")
@@ -49,8 +66,66 @@ class Ticket(Base):
             return False
 
         now = datetime.now(timezone.utc)
-        elapsed = (now - self.created_at).total_seconds()
+        created_at = self.created_at
+        if created_at.tzinfo is None:  # SQLite hands back naive datetimes
+            created_at = created_at.replace(tzinfo=timezone.utc)
+        elapsed = (now - created_at).total_seconds()
         return elapsed > timeout_seconds
 
     def __repr__(self):
         return f"<Ticket(id={self.id}, status={self.status}, user_id={self.user_id})>"
+
+
+# A seat can back at most one live (reserved or paid) ticket
+Index(
+    "uq_tickets_live_seat",
+    Ticket.seat_row_id,
+    Ticket.seat_number,
+    unique=True,
+    postgresql_where=Ticket.status != TicketStatus.EXPIRED,
+    sqlite_where=Ticket.status != TicketStatus.EXPIRED,
+)
+
+# Basket payment and expiry find their tickets by basket; most tickets have none
+Index(
+    "ix_tickets_basket_id",
+    Ticket.basket_id,
+    postgresql_where=Ticket.basket_id.isnot(None),
+    sqlite_where=Ticket.basket_id.isnot(None),
+)
+
+
+class ArchivedTicket(Base):
+    """
+    Cold storage for tickets that are no longer read on hot paths
+    (expired reservations and tickets for past events).
+    Same columns as `tickets`, without foreign keys and with lean indexes.
+    """
+
+    __tablename__ = "tickets_archive"
+
+    id: Mapped[uuid.UUID] = mapped_column(primary_key=True)
+    user_id: Mapped[uuid.UUID] = mapped_column(nullable=False, index=True)
+    event_id: Mapped[uuid.UUID] = mapped_column(nullable=False, index=True)
+    status: Mapped[TicketStatus] = mapped_column(
+        SQLEnum(TicketStatus, native_enum=False), nullable=False
+    )
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False
+    )
+    seat_row_id: Mapped[Optional[uuid.UUID]] = mapped_column(nullable=True)
+    seat_number: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    basket_id: Mapped[Optional[uuid.UUID]] = mapped_column(nullable=True)
+    event_title: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+    event_start_time: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+    venue_location: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+    archived_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        nullable=False,
+    )
+
+    def __repr__(self):
+        return f"<ArchivedTicket(id={self.id}, status={self.status}, user_id={self.user_id})>"
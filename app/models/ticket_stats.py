@@ -0,0 +1,33 @@
+from sqlalchemy import Integer, DateTime, ForeignKey
+from sqlalchemy.orm import Mapped, mapped_column
+from datetime import datetime, timezone
+from app.database import Base
+import uuid
+
+
+class EventTicketStats(Base):
+    """
+    Per-event ticket counts by status.
+    Maintained in the same transaction as every ticket status change.
+    """
+
+    __tablename__ = "event_ticket_stats"
+
+    event_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("events.id"), primary_key=True
+    )
+    reserved_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    paid_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    expired_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        onupdate=lambda: datetime.now(timezone.utc),
+        nullable=False,
+    )
+
+    def __repr__(self):
+        return (
+            f"<EventTicketStats(event_id={self.event_id}, reserved={self.reserved_count}, "
+            f"paid={self.paid_count}, expired={self.expired_count})>"
+        )
@@ -1,24 +1,15 @@
 from sqlalchemy import Column, String, Float
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from geoalchemy2 import Geography
+from sqlalchemy import Index
 from app.database import Base
+from app.models.geography import Geography, IS_SQLITE
 import uuid
-import os
 from typing import TYPE_CHECKING
-from utils.logger import setup_logger
-from app.config import get_settings
-
-settings = get_settings()
-logger = setup_logger(__name__)
 
 if TYPE_CHECKING:
     from app.models.ticket import Ticket
 
 
-IS_SQLITE = "sqlite" in settings.database_url
-logger.info(f"USING IS_SQLITE: {IS_SQLITE} {settings.database_url}")
-
-
 class User(Base):
     __tablename__ = "users"
 
@@ -35,7 +26,10 @@ class User(Base):
     # Use Geography only in Postgres
     if not IS_SQLITE:
         location = mapped_column(
-            Geography(geometry_type="POINT", srid=4326), nullable=True, index=True
+            Geography(geometry_type="POINT", srid=4326), nullable=True
+        )
+        __table_args__ = (
+            Index("idx_users_location", "location", postgresql_using="gist"),
         )
     else:
         location = Column(String, nullable=True)  # fallback for SQLite
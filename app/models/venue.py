@@ -0,0 +1,50 @@
+from sqlalchemy import String, Float, DateTime, Index
+from sqlalchemy import func
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+from datetime import datetime
+from app.database import Base
+from app.models.geography import Geography, IS_SQLITE
+import uuid
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from app.models.event import Event
+
+
+class Venue(Base):
+    """
+    A place events are held, shared by every event at the same address.
+    Venues are matched on `address_key`, the normalized address (see
+    app.utils.geo.normalize_address), and are never rewritten by later events.
+    """
+
+    __tablename__ = "venues"
+
+    id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid.uuid4)
+    location: Mapped[str] = mapped_column(String(255), nullable=False, index=True)
+    address: Mapped[str] = mapped_column(String(500), nullable=False)
+    address_key: Mapped[str] = mapped_column(String(500), nullable=False, unique=True)
+    latitude: Mapped[float] = mapped_column(Float, nullable=False)
+    longitude: Mapped[float] = mapped_column(Float, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+
+    # One point per venue: radius queries scan venues, then join their events
+    if not IS_SQLITE:
+        geo_location = mapped_column(
+            Geography(geometry_type="POINT", srid=4326),
+            nullable=False,
+            deferred=True,  # only used in spatial queries, never loaded with events
+        )
+        __table_args__ = (
+            Index("idx_venues_geo_location", "geo_location", postgresql_using="gist"),
+        )
+    else:
+        geo_location = mapped_column(String, nullable=False, deferred=True)  # fallback for SQLite
+
+    # Relationships
+    events: Mapped[list["Event"]] = relationship("Event", back_populates="venue")
+
+    def __repr__(self):
+        return f"<Venue(id={self.id}, location={self.location}, address={self.address})>"
@@ -1,6 +1,19 @@
 from app.repositories.base import BaseRepository
 from app.repositories.user import UserRepository
 from app.repositories.event import EventRepository
+from app.repositories.venue import VenueRepository
 from app.repositories.ticket import TicketRepository
+from app.repositories.ticket_stats import TicketStatsRepository
+from app.repositories.seat import SeatRepository
+from app.repositories.outbox import OutboxRepository
 
-__all__ = ["BaseRepository", "UserRepository", "EventRepository", "TicketRepository"]
+__all__ = [
+    "BaseRepository",
+    "UserRepository",
+    "EventRepository",
+    "VenueRepository",
+    "TicketRepository",
+    "TicketStatsRepository",
+    "SeatRepository",
+    "OutboxRepository",
+]
@@ -1,4 +1,4 @@
-from typing import Generic, TypeVar, Type, Optional, List
+from typing import Dict, Generic, Iterable, TypeVar, Type, Optional, List
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, update, delete
 from sqlalchemy.orm import DeclarativeBase
@@ -18,6 +18,14 @@ class BaseRepository(Generic[ModelType]):
         result = await self.db.execute(select(self.model).where(self.model.id == id))
         return result.scalar_one_or_none()
 
+    async def get_many(self, ids: Iterable[UUID]) -> Dict[UUID, ModelType]:
+        """Load many rows by id in one query, keyed by id (missing ids are left out)"""
+        ids = list(dict.fromkeys(ids))
+        if not ids:
+            return {}
+        result = await self.db.execute(select(self.model).where(self.model.id.in_(ids)))
+        return {obj.id: obj for obj in result.scalars().all()}
+
     async def get_all(self, skip: int = 0, limit: int = 100) -> List[ModelType]:
         result = await self.db.execute(select(self.model).offset(skip).limit(limit))
         return list(result.scalars().all())
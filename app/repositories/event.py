@@ -1,16 +1,210 @@
 from app.repositories.base import BaseRepository
-from app.models.event import Event
+from app.models.event import Event, SEARCH_CONFIG
+from app.models.venue import Venue
+from app.schemas.event import EventRecord
+from app.models.geography import IS_SQLITE
+from app.models.ticket import Ticket, TicketStatus
+from app.utils.availability import publish_availability
+from app.utils.response_cache import invalidate_events, invalidate_event_counts
+from app.utils.geo import haversine_km
+from app.utils.search import event_search_index, prefix_tsquery
+from app.config import get_settings
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, text
-from geoalchemy2.functions import ST_DWithin, ST_MakePoint, ST_Distance
-from typing import List, Tuple, Optional
+from sqlalchemy import select, func, update, case, and_, cast, Float, Row
+from sqlalchemy import event as orm_event
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.dialects.postgresql import REGCONFIG
+from typing import Awaitable, Callable, Dict, Iterable, List, Tuple, Optional
 from uuid import UUID
+from datetime import datetime, timezone, timedelta
+
+settings = get_settings()
 
 
 class EventRepository(BaseRepository[Event]):
     def __init__(self, db: AsyncSession):
         super().__init__(Event, db)
 
+    def _listing_conditions(
+        self,
+        start_from: Optional[datetime] = None,
+        start_to: Optional[datetime] = None,
+        upcoming: bool = False,
+        available_only: bool = False,
+        venue_location: Optional[str] = None,
+    ) -> list:
+        """
+        Listing filters as index-friendly predicates: plain comparisons on
+        bare columns (no functions or leading wildcards), so they map onto
+        the ix_events_* listing indexes.
+        """
+        conditions = []
+        if upcoming:
+            now = datetime.now(timezone.utc)
+            start_from = max(start_from, now) if start_from else now
+        if start_from is not None:
+            conditions.append(Event.start_time >= start_from)
+        if start_to is not None:
+            conditions.append(Event.start_time < start_to)
+        if available_only:
+            # Same predicate as the partial index ix_events_listing_available
+            conditions.append(Event.tickets_available > 0)
+        if venue_location is not None:
+            # Venue ids first, then the (venue_id, start_time, id) index
+            conditions.append(
+                Event.venue_id.in_(
+                    select(Venue.id).where(Venue.location == venue_location)
+                )
+            )
+        return conditions
+
+    def _listing_page(self, skip: int, limit: int, **filters):
+        """
+        The filtered, ordered page of event ids, picked from the listing
+        indexes (index-only on Postgres) before any full row is touched.
+        """
+        return (
+            select(Event.id, Event.start_time)
+            .where(*self._listing_conditions(**filters))
+            .order_by(Event.start_time, Event.id)
+            .offset(skip)
+            .limit(limit)
+            .subquery()
+        )
+
+    # Columns of EventRecord, the read-side projection of an event
+    RECORD_COLUMNS = (
+        Event.id,
+        Event.title,
+        Event.description,
+        Event.start_time,
+        Event.end_time,
+        Event.total_tickets,
+        Event.tickets_sold,
+        Event.version,
+        Venue.location,
+        Venue.address,
+        Venue.latitude,
+        Venue.longitude,
+    )
+
+    def _select_records(self, *extra_columns):
+        """EventRecord columns (then `extra_columns`) of events joined to their venue"""
+        return select(*self.RECORD_COLUMNS, *extra_columns).join_from(Event, Venue)
+
+    async def get_record(self, event_id: UUID) -> Optional[EventRecord]:
+        """An event for reading, without loading an entity (None if it doesn't exist)"""
+        result = await self.db.execute(self._select_records().where(Event.id == event_id))
+        row = result.first()
+        return EventRecord._make(row) if row is not None else None
+
+    async def get_records(self, event_ids: Iterable[UUID]) -> Dict[UUID, EventRecord]:
+        """Many events for reading in one query, keyed by id (missing ids are left out)"""
+        event_ids = list(dict.fromkeys(event_ids))
+        if not event_ids:
+            return {}
+        result = await self.db.execute(
+            self._select_records().where(Event.id.in_(event_ids))
+        )
+        return {row[0]: EventRecord._make(row) for row in result.all()}
+
+    async def list_events(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        start_from: Optional[datetime] = None,
+        start_to: Optional[datetime] = None,
+        upcoming: bool = False,
+        available_only: bool = False,
+        venue_location: Optional[str] = None,
+    ) -> List[EventRecord]:
+        """
+        List events by start time with optional filters.
+        Only the page's rows are fetched, so deep pages don't drag full
+        rows through the sort.
+        """
+        page = self._listing_page(
+            skip,
+            limit,
+            start_from=start_from,
+            start_to=start_to,
+            upcoming=upcoming,
+            available_only=available_only,
+            venue_location=venue_location,
+        )
+        result = await self.db.execute(
+            self._select_records()
+            .join(page, page.c.id == Event.id)
+            .order_by(page.c.start_time, page.c.id)
+        )
+        return [EventRecord._make(row) for row in result.all()]
+
+    async def list_event_versions(
+        self, skip: int = 0, limit: int = 100, **filters
+    ) -> List[Tuple[UUID, int]]:
+        """(id, version) of the events `list_events` would return, in order"""
+        page = self._listing_page(skip, limit, **filters)
+        result = await self.db.execute(
+            select(Event.id, Event.version)
+            .join(page, page.c.id == Event.id)
+            .order_by(page.c.start_time, page.c.id)
+        )
+        return [(event_id, version) for event_id, version in result.all()]
+
+    async def get_summaries(self, event_ids: Iterable[UUID]) -> Dict[UUID, Row]:
+        """
+        The event fields shown in ticket history, as (id, title, start_time,
+        venue_location) rows keyed by event id, for many events in one query
+        """
+        event_ids = list(event_ids)
+        if not event_ids:
+            return {}
+        result = await self.db.execute(
+            select(
+                Event.id,
+                Event.title,
+                Event.start_time,
+                Venue.location.label("venue_location"),
+            )
+            .join_from(Event, Venue)
+            .where(Event.id.in_(event_ids))
+        )
+        return {row.id: row for row in result.all()}
+
+    async def get_version(self, event_id: UUID) -> Optional[int]:
+        """Current version of an event, without loading the row"""
+        result = await self.db.execute(
+            select(Event.version).where(Event.id == event_id)
+        )
+        return result.scalar_one_or_none()
+
+    # Columns of the in-process event catalog (see app.utils.catalog.CatalogRow), plus updated_at
+    CATALOG_COLUMNS = RECORD_COLUMNS + (Event.updated_at,)
+
+    async def get_catalog_rows(
+        self, ending_after: datetime, after_id: Optional[UUID] = None, limit: int = 10000
+    ) -> List[Row]:
+        """Catalog columns of events that haven't ended, one id-ordered page after `after_id`"""
+        query = (
+            select(*self.CATALOG_COLUMNS)
+            .join_from(Event, Venue)
+            .where(Event.end_time > ending_after)
+        )
+        if after_id is not None:
+            query = query.where(Event.id > after_id)
+        result = await self.db.execute(query.order_by(Event.id).limit(limit))
+        return list(result.all())
+
+    async def get_catalog_changes(self, since: datetime) -> List[Row]:
+        """Catalog columns of events written at or after `since` (ended ones included)"""
+        result = await self.db.execute(
+            select(*self.CATALOG_COLUMNS)
+            .join_from(Event, Venue)
+            .where(Event.updated_at >= since)
+            .order_by(Event.updated_at)
+        )
+        return list(result.all())
+
     async def get_events_near_location(
         self,
         latitude: float,
@@ -18,54 +212,411 @@ class EventRepository(BaseRepository[Event]):
         radius_km: float = 50.0,
         skip: int = 0,
         limit: int = 100,
-    ) -> List[Tuple[Event, float]]:
+    ) -> List[Tuple[EventRecord, float]]:
         """
-        Get events within a radius of a location, ordered by distance.
+        Get upcoming events within a radius of a location, ordered by distance.
+        The radius is searched over venues (one point per venue, far fewer
+        rows than events) and only then joined to the events held there.
         Returns list of tuples: (event, distance_in_km)
         """
-        # Create a point from lat/lng
-        # user_point = ST_MakePoint(longitude, latitude, type_=text("Geography"))
-        user_point = ST_MakePoint(longitude, latitude).ST_SetSRID(4326)
-
-        # Calculate distance in meters and convert to km
-        distance_expr = ST_Distance(Event.geo_location, user_point) / 1000.0
-
-        # Query events within radius, ordered by distance
-        query = (
-            select(Event, distance_expr.label("distance_km"))
+        user_point = _make_point(latitude, longitude)
+        nearby = (
+            select(
+                Venue.id,
+                (
+                    func.ST_Distance(Venue.geo_location, user_point, type_=Float)
+                    / 1000.0
+                ).label("distance_km"),
+            )
             .where(
-                ST_DWithin(
-                    Event.geo_location,
+                func.ST_DWithin(
+                    Venue.geo_location,
                     user_point,
                     radius_km * 1000,  # Convert km to meters
                 )
             )
-            .order_by(text("distance_km"))
+            .subquery()
+        )
+
+        query = (
+            self._select_records(nearby.c.distance_km)
+            .join(nearby, nearby.c.id == Event.venue_id)
+            .where(Event.end_time > datetime.now(timezone.utc))
+            .order_by(nearby.c.distance_km, Event.start_time, Event.id)
             .offset(skip)
             .limit(limit)
         )
 
         result = await self.db.execute(query)
-        return [(row[0], row[1]) for row in result.all()]
-
-    async def increment_tickets_sold(
-        self, event_id: UUID, amount: int = 1
-    ) -> Optional[Event]:
-        """Atomically increment tickets_sold counter"""
-        event = await self.get_by_id(event_id)
-        if event:
-            event.tickets_sold += amount
-            await self.db.commit()
-            await self.db.refresh(event)
-        return event
-
-    async def decrement_tickets_sold(
-        self, event_id: UUID, amount: int = 1
-    ) -> Optional[Event]:
-        """Atomically decrement tickets_sold counter"""
-        event = await self.get_by_id(event_id)
-        if event:
-            event.tickets_sold = max(0, event.tickets_sold - amount)
+        return [(EventRecord._make(row[:-1]), row[-1]) for row in result.all()]
+
+    async def search_events(
+        self,
+        terms: List[str],
+        latitude: Optional[float] = None,
+        longitude: Optional[float] = None,
+        radius_km: float = 50.0,
+        skip: int = 0,
+        limit: int = 20,
+    ) -> List[Tuple[EventRecord, float, Optional[float]]]:
+        """
+        Full-text search over event titles and descriptions, every term
+        matched as a word prefix, best ranked first. With a location, only
+        events within `radius_km` of it are returned.
+        Returns list of tuples: (event, rank, distance_in_km or None)
+        """
+        if not terms:
+            return []
+        if self.db.get_bind().dialect.name == "sqlite":
+            return await self._search_in_process(
+                terms, latitude, longitude, radius_km, skip, limit
+            )
+
+        tsquery = func.to_tsquery(cast(SEARCH_CONFIG, REGCONFIG), prefix_tsquery(terms))
+        conditions = [Event.search_vector.op("@@")(tsquery)]
+        rank = func.ts_rank_cd(Event.search_vector, tsquery).label("rank")
+        columns = []
+        if latitude is not None and longitude is not None:
+            user_point = _make_point(latitude, longitude)
+            # Venues in range come off the venues GIST index
+            conditions.append(
+                Event.venue_id.in_(
+                    select(Venue.id).where(
+                        func.ST_DWithin(Venue.geo_location, user_point, radius_km * 1000)
+                    )
+                )
+            )
+            columns.append(
+                func.ST_Distance(Venue.geo_location, user_point, type_=Float) / 1000.0
+            )
+
+        # Matches come off the GIN (and GIST) indexes and are ranked on the
+        # tsvector alone; only the best `search_max_candidates` of them (a
+        # top-N sort, ties broken by start time and id so pages are stable)
+        # are joined to their venues and paginated
+        candidates = (
+            select(Event.id, Event.start_time, rank)
+            .where(*conditions)
+            .order_by(rank.desc(), Event.start_time, Event.id)
+            .limit(settings.search_max_candidates)
+            .subquery()
+        )
+        result = await self.db.execute(
+            self._select_records(candidates.c.rank, *columns)
+            .join(candidates, candidates.c.id == Event.id)
+            .order_by(candidates.c.rank.desc(), candidates.c.start_time, candidates.c.id)
+            .offset(skip)
+            .limit(limit)
+        )
+        fields = len(self.RECORD_COLUMNS)
+        return [
+            (
+                EventRecord._make(row[:fields]),
+                float(row[fields]),
+                float(row[fields + 1]) if len(row) > fields + 1 else None,
+            )
+            for row in result.all()
+        ]
+
+    async def _search_in_process(
+        self,
+        terms: List[str],
+        latitude: Optional[float],
+        longitude: Optional[float],
+        radius_km: float,
+        skip: int,
+        limit: int,
+    ) -> List[Tuple[EventRecord, float, Optional[float]]]:
+        """SQLite fallback for search_events using the in-process inverted index"""
+        if not event_search_index.ready:
+            result = await self.db.execute(
+                select(Event.id, Event.title, Event.description)
+            )
+            event_search_index.rebuild(
+                (event_id, {"title": title, "description": description})
+                for event_id, title, description in result.all()
+            )
+
+        ranked = event_search_index.search(terms)
+        matches = [(event_id, rank, None) for event_id, rank in ranked]
+        if latitude is not None and longitude is not None and matches:
+            result = await self.db.execute(
+                select(Event.id, Venue.latitude, Venue.longitude)
+                .join_from(Event, Venue)
+                .where(Event.id.in_([event_id for event_id, _ in ranked]))
+            )
+            distances = {
+                event_id: haversine_km(latitude, longitude, venue_lat, venue_lng)
+                for event_id, venue_lat, venue_lng in result.all()
+            }
+            matches = [
+                (event_id, rank, distances[event_id])
+                for event_id, rank, _ in matches
+                if distances.get(event_id, radius_km + 1) <= radius_km
+            ]
+
+        page = matches[skip : skip + limit]
+        if not page:
+            return []
+        events = await self.get_records(event_id for event_id, _, _ in page)
+        return [
+            (events[event_id], rank, distance)
+            for event_id, rank, distance in page
+            if event_id in events
+        ]
+
+    async def increment_tickets_sold(self, event_id: UUID, amount: int = 1) -> None:
+        """Atomically increment tickets_sold counter (in SQL, so no update is lost)"""
+        await self.increment_tickets_sold_many({event_id: amount})
+
+    async def add_tickets_sold_if_unchanged(
+        self,
+        event: Event,
+        amount: int,
+        before_commit: Optional[Callable[[], Awaitable[None]]] = None,
+    ) -> bool:
+        """
+        Compare-and-swap `event`'s tickets_sold: add `amount` to the count as
+        it was read, only if the row still has the version it was read at.
+        On success `before_commit` runs (e.g. the rollup delta, so only the
+        winner locks that row) and this commits along with whatever the
+        session has pending (the tickets being reserved); `event` carries the
+        new count and version. If anything changed the row in between
+        nothing is written, the session is rolled back and False is returned.
+        """
+        tickets_sold = event.tickets_sold + amount
+        result = await self.db.execute(
+            update(Event)
+            .where(Event.id == event.id, Event.version == event.version)
+            .values(tickets_sold=tickets_sold)
+            .returning(Event.version, Event.updated_at)
+            .execution_options(synchronize_session=False)
+        )
+        row = result.one_or_none()
+        if row is None:
+            await self.db.rollback()
+            return False
+        if before_commit is not None:
+            await before_commit()
+        await self.db.commit()
+
+        set_committed_value(event, "tickets_sold", tickets_sold)
+        set_committed_value(event, "version", row.version)
+        set_committed_value(event, "updated_at", row.updated_at)
+        await publish_availability(event)
+        await invalidate_event_counts([event.id])
+        return True
+
+    async def add_tickets_sold_if_available(
+        self,
+        event: Event,
+        amount: int,
+        before_commit: Optional[Callable[[], Awaitable[None]]] = None,
+    ) -> bool:
+        """
+        Add `amount` to `event`'s tickets_sold in SQL, only if that stays
+        within total_tickets. Unlike the compare-and-swap, concurrent writes
+        to the event can't make it miss - only running out of tickets can.
+        On success `before_commit` runs and this commits along with whatever
+        the session has pending; `event` carries the new count and version.
+        Otherwise the session is rolled back and False is returned.
+        """
+        result = await self.db.execute(
+            update(Event)
+            .where(
+                Event.id == event.id,
+                Event.tickets_sold + amount <= Event.total_tickets,
+            )
+            .values(tickets_sold=Event.tickets_sold + amount)
+            .returning(Event.tickets_sold, Event.version, Event.updated_at)
+            .execution_options(synchronize_session=False)
+        )
+        row = result.one_or_none()
+        if row is None:
+            await self.db.rollback()
+            return False
+        if before_commit is not None:
+            await before_commit()
+        await self.db.commit()
+
+        set_committed_value(event, "tickets_sold", row.tickets_sold)
+        set_committed_value(event, "version", row.version)
+        set_committed_value(event, "updated_at", row.updated_at)
+        await publish_availability(event)
+        await invalidate_event_counts([event.id])
+        return True
+
+    async def lock_many(self, event_ids: Iterable[UUID]) -> Dict[UUID, Event]:
+        """
+        Load events for update, locking their rows in id order so that
+        transactions locking overlapping sets of events can't deadlock.
+        Missing ids are left out.
+        """
+        result = await self.db.execute(
+            select(Event)
+            .where(Event.id.in_(sorted(set(event_ids))))
+            .order_by(Event.id)
+            .with_for_update(of=Event)
+            .execution_options(populate_existing=True)
+        )
+        return {event.id: event for event in result.scalars().all()}
+
+    async def increment_tickets_sold_many(self, amounts: Dict[UUID, int]) -> None:
+        """
+        Increment many events' tickets_sold counters in one UPDATE and commit
+        it along with whatever the session has pending, such as the tickets
+        being reserved.
+        """
+        if amounts:
+            await self.db.execute(
+                update(Event)
+                .where(Event.id.in_(list(amounts)))
+                .values(tickets_sold=Event.tickets_sold + case(amounts, value=Event.id))
+                .execution_options(synchronize_session=False)
+            )
+        await self.db.commit()
+
+        events = await self.get_records(amounts)
+        for event in events.values():
+            await publish_availability(event)
+        await invalidate_event_counts(events)
+
+    async def decrement_tickets_sold(self, event_id: UUID, amount: int = 1) -> None:
+        """Atomically decrement tickets_sold counter (in SQL, never below zero)"""
+        await self.decrement_tickets_sold_many({event_id: amount})
+
+    async def decrement_tickets_sold_many(self, amounts: Dict[UUID, int]) -> None:
+        """
+        Decrement many events' tickets_sold counters (never below zero) in one
+        UPDATE and commit it along with whatever the session has pending,
+        such as the tickets being expired.
+        """
+        if amounts:
+            remaining = Event.tickets_sold - case(amounts, value=Event.id)
+            await self.db.execute(
+                update(Event)
+                .where(Event.id.in_(list(amounts)))
+                .values(tickets_sold=case((remaining > 0, remaining), else_=0))
+                .execution_options(synchronize_session=False)
+            )
+        await self.db.commit()
+
+        events = await self.get_records(amounts)
+        for event in events.values():
+            await publish_availability(event)
+        await invalidate_event_counts(events)
+
+    async def reconcile_tickets_sold(
+        self, chunk_size: int = 5000, grace_seconds: float = 10.0
+    ) -> Dict[str, int]:
+        """
+        Recompute tickets_sold (reserved + paid tickets) for every event and
+        fix drifted counters in bulk, one chunk of events (by id) at a time.
+
+        Events that have already ended are skipped: their counters no longer
+        gate sales and their tickets may have been archived.
+
+        Each chunk is one aggregated query plus at most one UPDATE. Events
+        with a ticket created or a counter change (reserve, expire) in the
+        last `grace_seconds` are skipped as they may be mid-transition, and
+        corrections add the drift only while the event still has the version
+        it was counted at, so a change committed in between is never
+        overwritten.
+        """
+        report = {"events_checked": 0, "events_corrected": 0, "total_drift": 0}
+        now = datetime.now(timezone.utc)
+        cutoff = now - timedelta(seconds=grace_seconds)
+        after_id: Optional[UUID] = None
+
+        while True:
+            chunk_query = (
+                select(Event.id, Event.tickets_sold, Event.version, Event.updated_at)
+                .where(Event.end_time > now)
+                .order_by(Event.id)
+            )
+            if after_id is not None:
+                chunk_query = chunk_query.where(Event.id > after_id)
+            chunk = chunk_query.limit(chunk_size).subquery()
+
+            result = await self.db.execute(
+                select(
+                    chunk.c.id,
+                    chunk.c.tickets_sold,
+                    chunk.c.version,
+                    chunk.c.updated_at,
+                    func.count(Ticket.id),
+                    func.max(Ticket.created_at),
+                )
+                .select_from(chunk)
+                .outerjoin(
+                    Ticket,
+                    and_(
+                        Ticket.event_id == chunk.c.id,
+                        Ticket.status.in_([TicketStatus.RESERVED, TicketStatus.PAID]),
+                    ),
+                )
+                .group_by(chunk.c.id, chunk.c.tickets_sold, chunk.c.version, chunk.c.updated_at)
+                .order_by(chunk.c.id)
+            )
+            rows = result.all()
+            if not rows:
+                break
+
+            versions, drift = {}, {}
+            for event_id, tickets_sold, version, updated_at, actual, latest in rows:
+                if actual == tickets_sold:
+                    continue
+                if latest is not None and _as_utc(latest) > cutoff:
+                    continue
+                if updated_at is not None and _as_utc(updated_at) > cutoff:
+                    continue
+                versions[event_id] = version
+                drift[event_id] = actual - tickets_sold
+                report["total_drift"] += abs(actual - tickets_sold)
+
+            if drift:
+                update_result = await self.db.execute(
+                    update(Event)
+                    .where(
+                        Event.id.in_(list(drift)),
+                        Event.version == case(versions, value=Event.id),
+                    )
+                    .values(tickets_sold=Event.tickets_sold + case(drift, value=Event.id))
+                    .execution_options(synchronize_session=False)
+                )
+                report["events_corrected"] += update_result.rowcount
             await self.db.commit()
-            await self.db.refresh(event)
-        return event
+            await invalidate_events(drift)
+
+            report["events_checked"] += len(rows)
+            after_id = rows[-1][0]
+            if len(rows) < chunk_size:
+                break
+
+        return report
+
+
+def _make_point(latitude: float, longitude: float):
+    return func.ST_SetSRID(func.ST_MakePoint(longitude, latitude), 4326)
+
+
+# Keep the SQLite search index in step with event writes
+def _index_event(mapper, connection, target: Event) -> None:
+    event_search_index.add(
+        target.id, title=target.title, description=target.description
+    )
+
+
+def _unindex_event(mapper, connection, target: Event) -> None:
+    event_search_index.remove(target.id)
+
+
+if IS_SQLITE:
+    orm_event.listen(Event, "after_insert", _index_event)
+    orm_event.listen(Event, "after_update", _index_event)
+    orm_event.listen(Event, "after_delete", _unindex_event)
+
+
+def _as_utc(value: datetime) -> datetime:
+    # SQLite hands back naive datetimes
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
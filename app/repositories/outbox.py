@@ -0,0 +1,54 @@
+from app.models.outbox import OutboxMessage
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, delete, func
+from typing import Iterable, List
+from uuid import UUID
+from datetime import datetime, timezone, timedelta
+
+
+class OutboxRepository:
+    """
+    Data access for the transactional outbox of task calls.
+    Adding a message never commits on its own - it rides along with the
+    transaction of the change that schedules the task.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    def add(self, task: str, args: list, countdown: float) -> OutboxMessage:
+        """Stage a call of `task` with `args`, due `countdown` seconds from now"""
+        message = OutboxMessage(
+            task=task,
+            args=args,
+            eta=datetime.now(timezone.utc) + timedelta(seconds=countdown),
+        )
+        self.db.add(message)
+        return message
+
+    async def claim_pending(self, limit: int) -> List[OutboxMessage]:
+        """
+        The oldest unsent messages, up to `limit`, locked until the caller
+        commits. Rows another relay has claimed are skipped, not waited for.
+        """
+        result = await self.db.execute(
+            select(OutboxMessage)
+            .order_by(OutboxMessage.created_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        return list(result.scalars().all())
+
+    async def delete_many(self, message_ids: Iterable[UUID]) -> int:
+        """Remove sent messages (doesn't commit)"""
+        message_ids = list(message_ids)
+        if not message_ids:
+            return 0
+        result = await self.db.execute(
+            delete(OutboxMessage).where(OutboxMessage.id.in_(message_ids))
+        )
+        return result.rowcount
+
+    async def pending_count(self) -> int:
+        result = await self.db.execute(select(func.count()).select_from(OutboxMessage))
+        return result.scalar_one()
@@ -0,0 +1,117 @@
+from app.models.seat import SeatRow
+from app.utils.seating import bits_from_bytes, bits_to_bytes, seat_mask
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, insert, update, func, Row
+from typing import Dict, Iterable, List, Tuple
+from uuid import UUID
+import uuid
+
+
+class SeatRepository:
+    """
+    Data access for seat maps and their per-row availability bitsets.
+    Bitset writes never commit on their own - they ride along with the
+    transaction of the tickets that take or release the seats.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def create_rows(self, event_id: UUID, rows: List[Tuple[str, str, int]]) -> int:
+        """Insert an event's seat map in one statement from (section, label, seat_count)"""
+        await self.db.execute(
+            insert(SeatRow),
+            [
+                {
+                    "id": uuid.uuid4(),
+                    "event_id": event_id,
+                    "section": section,
+                    "label": label,
+                    "rank": rank,
+                    "seat_count": seat_count,
+                    "taken": bits_to_bytes(0, seat_count),
+                }
+                for rank, (section, label, seat_count) in enumerate(rows)
+            ],
+        )
+        return sum(seat_count for _, _, seat_count in rows)
+
+    async def has_seat_map(self, event_id: UUID) -> bool:
+        result = await self.db.execute(
+            select(func.count()).select_from(SeatRow).where(SeatRow.event_id == event_id)
+        )
+        return result.scalar_one() > 0
+
+    async def get_bitmaps(self, event_id: UUID) -> List[Row]:
+        """
+        Get an event's rows in preference order as
+        (id, section, label, seat_count, taken) tuples.
+        """
+        result = await self.db.execute(
+            select(
+                SeatRow.id,
+                SeatRow.section,
+                SeatRow.label,
+                SeatRow.seat_count,
+                SeatRow.taken,
+            )
+            .where(SeatRow.event_id == event_id)
+            .order_by(SeatRow.rank)
+        )
+        return list(result.all())
+
+    async def lock_bitmaps(self, row_ids: Iterable[UUID]) -> Dict[UUID, Tuple[int, int]]:
+        """Lock rows for this transaction, returning {id: (seat_count, taken bits)}"""
+        result = await self.db.execute(
+            select(SeatRow.id, SeatRow.seat_count, SeatRow.taken)
+            .where(SeatRow.id.in_(list(row_ids)))
+            .order_by(SeatRow.id)
+            .with_for_update()
+        )
+        return {
+            row_id: (seat_count, bits_from_bytes(taken))
+            for row_id, seat_count, taken in result.all()
+        }
+
+    async def save_bitmaps(self, bitmaps: Dict[UUID, Tuple[int, int]]) -> None:
+        """Write many rows' bitsets in one executemany, from {id: (seat_count, taken bits)}"""
+        if not bitmaps:
+            return
+        await self.db.execute(
+            update(SeatRow),
+            [
+                {"id": row_id, "taken": bits_to_bytes(taken, seat_count)}
+                for row_id, (seat_count, taken) in bitmaps.items()
+            ],
+        )
+
+    async def take_seats(self, row_id: UUID, first_seat: int, quantity: int) -> bool:
+        """
+        Mark adjacent seats taken if they are all still free in the database.
+        Returns False, changing nothing, if any of them was taken meanwhile.
+        """
+        locked = await self.lock_bitmaps([row_id])
+        if row_id not in locked:
+            return False
+        seat_count, taken = locked[row_id]
+        mask = seat_mask(first_seat, quantity)
+        if taken & mask:
+            return False
+        await self.save_bitmaps({row_id: (seat_count, taken | mask)})
+        return True
+
+    async def release_seats(self, seats: Iterable[Tuple[UUID, int]]) -> None:
+        """Mark (row id, seat number) seats free again, one write per touched row"""
+        released: Dict[UUID, int] = {}
+        for row_id, seat_number in seats:
+            released[row_id] = released.get(row_id, 0) | seat_mask(seat_number, 1)
+        if not released:
+            return
+
+        locked = await self.lock_bitmaps(released)
+        await self.save_bitmaps(
+            {
+                row_id: (seat_count, taken & ~released[row_id])
+                for row_id, (seat_count, taken) in locked.items()
+            }
+        )
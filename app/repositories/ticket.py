@@ -1,9 +1,23 @@
 from app.repositories.base import BaseRepository
-from app.models.ticket import Ticket, TicketStatus
+from app.models.ticket import Ticket, TicketStatus, ArchivedTicket
+from app.models.event import Event
+from app.repositories.ticket_stats import TicketStatsRepository, STATUS_COLUMNS
+from app.repositories.seat import SeatRepository
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import (
+    select,
+    insert,
+    update,
+    delete,
+    union_all,
+    literal,
+    and_,
+    or_,
+    DateTime,
+    Row,
+)
 from sqlalchemy.orm import joinedload
-from typing import List, Optional
+from typing import Dict, Iterable, List, Optional
 from uuid import UUID
 from datetime import datetime, timezone, timedelta
 
@@ -11,6 +25,116 @@ from datetime import datetime, timezone, timedelta
 class TicketRepository(BaseRepository[Ticket]):
     def __init__(self, db: AsyncSession):
         super().__init__(Ticket, db)
+        self.stats_repo = TicketStatsRepository(db)
+        self.seat_repo = SeatRepository(db)
+
+    async def create(self, obj: Ticket) -> Ticket:
+        """Create a ticket, counting it in the event's rollup in the same commit"""
+        await self.stats_repo.apply_transition(
+            obj.event_id, None, obj.status or TicketStatus.RESERVED
+        )
+        return await super().create(obj)
+
+    async def add_many(self, tickets: List[Ticket], rollup: bool = True) -> None:
+        """
+        Stage tickets of any number of events, counting them in their events'
+        rollups. Doesn't commit - the caller commits them with the
+        tickets_sold increment. With `rollup=False` they are only staged and
+        the caller counts them with count_reserved once its counter write
+        has gone through, so the rollup row is locked by winners only.
+        """
+        if rollup:
+            await self.count_reserved(tickets)
+        self.db.add_all(tickets)
+
+    async def count_reserved(self, tickets: List[Ticket]) -> None:
+        """Count new RESERVED tickets in their events' rollups. Doesn't commit."""
+        reserved: Dict[UUID, int] = {}
+        for ticket in tickets:
+            reserved[ticket.event_id] = reserved.get(ticket.event_id, 0) + 1
+        await self.stats_repo.apply_deltas(
+            {
+                event_id: {STATUS_COLUMNS[TicketStatus.RESERVED]: count}
+                for event_id, count in reserved.items()
+            }
+        )
+
+    async def get_basket(self, basket_id: UUID) -> List[Ticket]:
+        """A basket's tickets, freshly read"""
+        result = await self.db.execute(
+            select(Ticket)
+            .where(Ticket.basket_id == basket_id)
+            .order_by(Ticket.event_id, Ticket.id)
+            .execution_options(populate_existing=True)
+        )
+        return list(result.scalars().all())
+
+    async def pay(self, ticket_id: UUID, reserved_after: datetime) -> Optional[Ticket]:
+        """
+        Mark a ticket PAID in one guarded UPDATE, provided it is still RESERVED
+        and was reserved after `reserved_after`. Returns the paid ticket, or
+        None (and nothing is changed) if it was expired or paid meanwhile.
+        Commits.
+        """
+        result = await self.db.execute(
+            update(Ticket)
+            .where(
+                Ticket.id == ticket_id,
+                Ticket.status == TicketStatus.RESERVED,
+                Ticket.created_at > reserved_after,
+            )
+            .values(status=TicketStatus.PAID)
+            .returning(Ticket)
+            .execution_options(synchronize_session=False, populate_existing=True)
+        )
+        ticket = result.scalars().first()
+        if ticket is None:
+            await self.db.rollback()
+            return None
+
+        await self.stats_repo.apply_transition(
+            ticket.event_id, TicketStatus.RESERVED, TicketStatus.PAID
+        )
+        await self.db.commit()
+        return ticket
+
+    async def pay_basket(
+        self, basket_id: UUID, ticket_count: int, reserved_after: datetime
+    ) -> bool:
+        """
+        Mark a basket's tickets PAID in one UPDATE, provided all `ticket_count`
+        of them are still RESERVED and were reserved after `reserved_after`.
+        Otherwise nothing is paid and False is returned. Commits.
+        """
+        result = await self.db.execute(
+            update(Ticket)
+            .where(
+                Ticket.basket_id == basket_id,
+                Ticket.status == TicketStatus.RESERVED,
+                Ticket.created_at > reserved_after,
+            )
+            .values(status=TicketStatus.PAID)
+            .returning(Ticket.event_id)
+            .execution_options(synchronize_session=False)
+        )
+        paid: Dict[UUID, int] = {}
+        for (event_id,) in result.all():
+            paid[event_id] = paid.get(event_id, 0) + 1
+        if sum(paid.values()) != ticket_count:
+            await self.db.rollback()
+            return False
+
+        await self.stats_repo.apply_deltas(
+            {
+                event_id: {
+                    STATUS_COLUMNS[TicketStatus.RESERVED]: -count,
+                    STATUS_COLUMNS[TicketStatus.PAID]: count,
+                }
+                for event_id, count in paid.items()
+            }
+        )
+        await self.db.commit()
+        return True
 
     async def get_by_id_with_event(self, ticket_id: UUID) -> Optional[Ticket]:
         """Get ticket with event relationship loaded"""
@@ -21,19 +145,113 @@ class TicketRepository(BaseRepository[Ticket]):
         )
         return result.scalar_one_or_none()
 
-    async def get_user_tickets(
-        self, user_id: UUID, skip: int = 0, limit: int = 100
-    ) -> List[Ticket]:
-        """Get all tickets for a user with event details"""
+    async def get_user_ticket_history_rows(
+        self,
+        user_id: UUID,
+        skip: int = 0,
+        limit: int = 100,
+        include_archived: bool = False,
+    ) -> List[Row]:
+        """
+        Get a user's tickets as plain rows for their history, newest first.
+        Archived paid tickets are always included - they are purchases, just
+        for past events; other archived tickets (expired reservations) only
+        with `include_archived`. Only ticket columns are read; the event
+        fields are the ticket's snapshot, None for tickets reserved without
+        one (see EventRepository.get_summaries).
+        Returns rows of (id, user_id, event_id, status, created_at,
+        event_title, event_start_time, venue_location).
+        """
+        selects = [
+            select(
+                source.id,
+                source.user_id,
+                source.event_id,
+                source.status,
+                source.created_at,
+                source.event_title,
+                source.event_start_time,
+                source.venue_location,
+            ).where(source.user_id == user_id)
+            for source in (Ticket, ArchivedTicket)
+        ]
+        if not include_archived:
+            selects[1] = selects[1].where(ArchivedTicket.status == TicketStatus.PAID)
+        history = union_all(*selects).subquery()
+
         result = await self.db.execute(
-            select(Ticket)
-            .options(joinedload(Ticket.event))
-            .where(Ticket.user_id == user_id)
-            .order_by(Ticket.created_at.desc())
+            select(history)
+            .order_by(history.c.created_at.desc())
             .offset(skip)
             .limit(limit)
         )
-        return list(result.scalars().all())
+        return list(result.all())
+
+    async def archive_batch(
+        self,
+        batch_size: int = 1000,
+        expired_before: Optional[datetime] = None,
+        events_ended_before: Optional[datetime] = None,
+    ) -> int:
+        """
+        Move one batch of cold tickets to the archive table: expired tickets
+        created before `expired_before` and tickets of events that ended
+        before `events_ended_before`. Copy and delete commit together.
+        Returns the number of tickets archived.
+        """
+        conditions = []
+        if expired_before is not None:
+            conditions.append(
+                and_(
+                    Ticket.status == TicketStatus.EXPIRED,
+                    Ticket.created_at < expired_before,
+                )
+            )
+        if events_ended_before is not None:
+            conditions.append(
+                Ticket.event_id.in_(
+                    select(Event.id).where(Event.end_time < events_ended_before)
+                )
+            )
+        if not conditions:
+            return 0
+
+        result = await self.db.execute(
+            select(Ticket.id).where(or_(*conditions)).limit(batch_size)
+        )
+        ticket_ids = list(result.scalars().all())
+        if not ticket_ids:
+            return 0
+
+        columns = [
+            "id",
+            "user_id",
+            "event_id",
+            "status",
+            "created_at",
+            "seat_row_id",
+            "seat_number",
+            "basket_id",
+            "event_title",
+            "event_start_time",
+            "venue_location",
+        ]
+        await self.db.execute(
+            insert(ArchivedTicket).from_select(
+                columns + ["archived_at"],
+                select(
+                    *[getattr(Ticket, column) for column in columns],
+                    literal(datetime.now(timezone.utc), DateTime(timezone=True)),
+                ).where(Ticket.id.in_(ticket_ids)),
+            )
+        )
+        await self.db.execute(
+            delete(Ticket)
+            .where(Ticket.id.in_(ticket_ids))
+            .execution_options(synchronize_session=False)
+        )
+        await self.db.commit()
+        return len(ticket_ids)
 
     async def get_expired_tickets(
         self, timeout_seconds: int = 120, limit: int = 100
@@ -57,11 +275,81 @@ class TicketRepository(BaseRepository[Ticket]):
         """Update ticket status"""
         ticket = await self.get_by_id(ticket_id)
         if ticket:
+            await self.stats_repo.apply_transition(
+                ticket.event_id, ticket.status, new_status
+            )
+            # An expired reservation gives its seat back
+            if new_status == TicketStatus.EXPIRED and ticket.seat_row_id is not None:
+                await self.seat_repo.release_seats(
+                    [(ticket.seat_row_id, ticket.seat_number)]
+                )
             ticket.status = new_status
             await self.db.commit()
             await self.db.refresh(ticket)
         return ticket
 
+    async def expire_many(self, ticket_ids: Iterable[UUID]) -> Dict[UUID, int]:
+        """
+        Mark every still-RESERVED ticket among `ticket_ids` EXPIRED in one
+        UPDATE, moving their rollups and giving their seats back. Tickets
+        paid or expired in the meantime are left alone. Doesn't commit - the
+        caller commits it with the tickets_sold decrement.
+        Returns the number of tickets expired per event.
+        """
+        ticket_ids = list(ticket_ids)
+        if not ticket_ids:
+            return {}
+        return await self._expire_reserved(Ticket.id.in_(ticket_ids))
+
+    async def expire_stale(
+        self, event_id: UUID, timeout_seconds: int = 120, limit: int = 100
+    ) -> Dict[UUID, int]:
+        """
+        Expire up to `limit` of an event's reservations that are older than
+        `timeout_seconds`, in one bounded UPDATE. Rows another transaction
+        holds locked (being paid or expired right now) are skipped. Doesn't
+        commit. Returns the number of tickets expired per event.
+        """
+        cutoff = datetime.now(timezone.utc) - timedelta(seconds=timeout_seconds)
+        stale = (
+            select(Ticket.id)
+            .where(
+                Ticket.event_id == event_id,
+                Ticket.status == TicketStatus.RESERVED,
+                Ticket.created_at <= cutoff,
+            )
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        return await self._expire_reserved(Ticket.id.in_(stale))
+
+    async def _expire_reserved(self, condition) -> Dict[UUID, int]:
+        result = await self.db.execute(
+            update(Ticket)
+            .where(condition, Ticket.status == TicketStatus.RESERVED)
+            .values(status=TicketStatus.EXPIRED)
+            .returning(Ticket.event_id, Ticket.seat_row_id, Ticket.seat_number)
+            .execution_options(synchronize_session=False)
+        )
+        expired: Dict[UUID, int] = {}
+        seats = []
+        for event_id, seat_row_id, seat_number in result.all():
+            expired[event_id] = expired.get(event_id, 0) + 1
+            if seat_row_id is not None:
+                seats.append((seat_row_id, seat_number))
+
+        await self.stats_repo.apply_deltas(
+            {
+                event_id: {
+                    STATUS_COLUMNS[TicketStatus.RESERVED]: -count,
+                    STATUS_COLUMNS[TicketStatus.EXPIRED]: count,
+                }
+                for event_id, count in expired.items()
+            }
+        )
+        await self.seat_repo.release_seats(seats)
+        return expired
+
     async def count_by_event(
         self, event_id: UUID, status: Optional[TicketStatus] = None
     ) -> int:
@@ -0,0 +1,188 @@
+from app.models.ticket import Ticket, TicketStatus, ArchivedTicket
+from app.models.ticket_stats import EventTicketStats
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, func, union_all, update, case
+from sqlalchemy.dialects import postgresql, sqlite
+from typing import Dict, List, Optional
+from uuid import UUID
+from datetime import datetime, timezone
+
+# Rollup column for each ticket status
+STATUS_COLUMNS = {
+    TicketStatus.RESERVED: "reserved_count",
+    TicketStatus.PAID: "paid_count",
+    TicketStatus.EXPIRED: "expired_count",
+}
+
+
+class TicketStatsRepository:
+    """
+    Data access for per-event ticket status rollups.
+    Writes here never commit on their own - they ride along with the
+    transaction of the ticket change they describe.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    def _insert(self):
+        if self.db.get_bind().dialect.name == "sqlite":
+            return sqlite.insert(EventTicketStats)
+        return postgresql.insert(EventTicketStats)
+
+    async def apply_transition(
+        self,
+        event_id: UUID,
+        old_status: Optional[TicketStatus],
+        new_status: TicketStatus,
+        count: int = 1,
+    ) -> None:
+        """Record `count` tickets of an event moving from `old_status` (None = new) to `new_status`"""
+        if old_status == new_status:
+            return
+        deltas = {STATUS_COLUMNS[new_status]: count}
+        if old_status is not None:
+            deltas[STATUS_COLUMNS[old_status]] = -count
+        await self.apply_deltas({event_id: deltas})
+
+    async def apply_deltas(self, deltas: Dict[UUID, Dict[str, int]]) -> None:
+        """Add per-column deltas to many events' rollups in one upsert"""
+        if not deltas:
+            return
+
+        now = datetime.now(timezone.utc)
+        rows = [
+            {
+                "event_id": event_id,
+                "updated_at": now,
+                **{
+                    column: event_deltas.get(column, 0)
+                    for column in STATUS_COLUMNS.values()
+                },
+            }
+            for event_id, event_deltas in deltas.items()
+        ]
+        stmt = self._insert().values(rows)
+
+        # Existing rollups get the delta added; new ones start from it
+        set_ = {"updated_at": stmt.excluded.updated_at}
+        for column in STATUS_COLUMNS.values():
+            set_[column] = getattr(EventTicketStats, column) + stmt.excluded[column]
+
+        await self.db.execute(
+            stmt.on_conflict_do_update(index_elements=["event_id"], set_=set_)
+        )
+
+    async def get_many(self, event_ids: List[UUID]) -> Dict[UUID, EventTicketStats]:
+        """Load rollups for many events in one query"""
+        if not event_ids:
+            return {}
+        result = await self.db.execute(
+            select(EventTicketStats).where(EventTicketStats.event_id.in_(event_ids))
+        )
+        return {stats.event_id: stats for stats in result.scalars().all()}
+
+    async def rebuild(self) -> Dict[str, int]:
+        """
+        Recount every event's tickets (hot and archived) with one GROUP BY
+        pass, correct any rollups that drifted and report how far off they
+        were.
+
+        Counts and rollups are read in one statement, so both come from the
+        same snapshot (a ticket change commits together with its rollup
+        delta). Each correction only applies while the rollup still holds
+        the values it was compared against, so a transition committed in
+        the meantime is never overwritten - that event is left for the next
+        run and reported as skipped.
+        """
+        columns = list(STATUS_COLUMNS.values())
+
+        # Archived tickets keep counting towards their event's rollup
+        tickets = union_all(
+            select(Ticket.event_id, Ticket.status),
+            select(ArchivedTicket.event_id, ArchivedTicket.status),
+        ).subquery()
+        counts = (
+            select(
+                tickets.c.event_id,
+                *[
+                    func.sum(case((tickets.c.status == ticket_status, 1), else_=0)).label(column)
+                    for ticket_status, column in STATUS_COLUMNS.items()
+                ],
+            )
+            .group_by(tickets.c.event_id)
+            .subquery()
+        )
+        result = await self.db.execute(
+            select(
+                counts.c.event_id,
+                EventTicketStats.event_id,
+                *[counts.c[column] for column in columns],
+                *[getattr(EventTicketStats, column) for column in columns],
+            ).select_from(
+                counts.join(
+                    EventTicketStats,
+                    EventTicketStats.event_id == counts.c.event_id,
+                    full=True,
+                )
+            )
+        )
+        rows = result.all()
+
+        now = datetime.now(timezone.utc)
+        corrected = skipped = total_drift = 0
+        for row in rows:
+            counted_id, stats_id = row[0], row[1]
+            actual = {
+                column: row[2 + i] or 0 for i, column in enumerate(columns)
+            }
+            observed = (
+                {column: row[2 + len(columns) + i] for i, column in enumerate(columns)}
+                if stats_id is not None
+                else None
+            )
+            drift = sum(
+                abs(actual[column] - (observed or {}).get(column, 0)) for column in columns
+            )
+            if not drift:
+                continue
+
+            if observed is None:
+                # No rollup yet; one created concurrently wins
+                result = await self.db.execute(
+                    self._insert()
+                    .values(event_id=counted_id, updated_at=now, **actual)
+                    .on_conflict_do_nothing(index_elements=["event_id"])
+                )
+            else:
+                result = await self.db.execute(
+                    update(EventTicketStats)
+                    .where(
+                        EventTicketStats.event_id == stats_id,
+                        *[
+                            getattr(EventTicketStats, column) == observed[column]
+                            for column in columns
+                        ],
+                    )
+                    .values(
+                        updated_at=now,
+                        **{
+                            column: getattr(EventTicketStats, column)
+                            + (actual[column] - observed[column])
+                            for column in columns
+                        },
+                    )
+                )
+            if result.rowcount:
+                corrected += 1
+                total_drift += drift
+            else:
+                skipped += 1
+        await self.db.commit()
+
+        return {
+            "events_checked": len(rows),
+            "events_corrected": corrected,
+            "events_skipped": skipped,
+            "total_drift": total_drift,
+        }
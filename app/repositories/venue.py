@@ -0,0 +1,45 @@
+from app.repositories.base import BaseRepository
+from app.models.venue import Venue
+from app.utils.geo import normalize_address, point_ewkt
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql, sqlite
+import uuid
+
+
+class VenueRepository(BaseRepository[Venue]):
+    def __init__(self, db: AsyncSession):
+        super().__init__(Venue, db)
+
+    def _insert(self):
+        if self.db.get_bind().dialect.name == "sqlite":
+            return sqlite.insert(Venue)
+        return postgresql.insert(Venue)
+
+    async def upsert(
+        self, location: str, address: str, latitude: float, longitude: float
+    ) -> Venue:
+        """
+        The venue at `address`, matched on its normalized form and created on
+        first use. An existing venue is returned as stored, so concurrent
+        creators of the same venue all end up with the one row.
+        Doesn't commit - it rides along with the event being created.
+        """
+        address_key = normalize_address(address)
+        await self.db.execute(
+            self._insert()
+            .values(
+                id=uuid.uuid4(),
+                location=location,
+                address=address,
+                address_key=address_key,
+                latitude=latitude,
+                longitude=longitude,
+                geo_location=point_ewkt(longitude, latitude),
+            )
+            .on_conflict_do_nothing(index_elements=["address_key"])
+        )
+        result = await self.db.execute(
+            select(Venue).where(Venue.address_key == address_key)
+        )
+        return result.scalar_one()
@@ -1,12 +1,72 @@
 from typing import AsyncGenerator
+from contextlib import asynccontextmanager
+from fastapi import HTTPException, Request, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.database import AsyncSessionLocal
+from app.database import (
+    AsyncSessionLocal,
+    AsyncReadSessionLocal,
+    primary_admission,
+    read_admission,
+    has_recent_write,
+    READS_PRIMARY,
+)
+from app.utils.admission import AdmissionController, AdmissionRejected, READ, WRITE
 
+# Cookie set on successful writes so the same client reads from the primary
+READ_AFTER_WRITE_COOKIE = "read_after_write"
 
-async def get_db() -> AsyncGenerator[AsyncSession, None]:
-    """Dependency for getting database session"""
-    async with AsyncSessionLocal() as session:
-        try:
+
+@asynccontextmanager
+async def _admitted_session(
+    controller: AdmissionController, session_factory, route_class: str
+):
+    """Open a session through the admission controller, shedding with 503 when overloaded"""
+    try:
+        async with controller.session(session_factory, route_class) as session:
             yield session
-        finally:
-            await session.close()
+    except AdmissionRejected as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Service is busy, please retry shortly",
+            headers={"Retry-After": str(e.retry_after)},
+        )
+
+
+async def get_db() -> AsyncGenerator[AsyncSession, None]:
+    """Dependency for getting database session (reservations/writes priority)"""
+    async with _admitted_session(primary_admission, AsyncSessionLocal, WRITE) as session:
+        session.info[READS_PRIMARY] = True
+        yield session
+
+
+def _use_primary_for_read(request: Request) -> bool:
+    """Route reads to the primary while a client's own write may not be replicated yet"""
+    if request.cookies.get(READ_AFTER_WRITE_COOKIE):
+        return True
+    return has_recent_write(request.path_params.get("user_id"))
+
+
+async def get_read_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Dependency for getting a read-only database session.
+    Uses the read replica when configured, except within the
+    read-your-writes window after the caller's own write; such sessions
+    are flagged READS_PRIMARY so services skip in-process copies too.
+    """
+    reads_primary = _use_primary_for_read(request)
+    if reads_primary:
+        controller, session_factory = primary_admission, AsyncSessionLocal
+    else:
+        controller, session_factory = read_admission, AsyncReadSessionLocal
+
+    async with _admitted_session(controller, session_factory, READ) as session:
+        session.info[READS_PRIMARY] = reads_primary
+        yield session
+
+
+def open_read_session():
+    """
+    Short-lived read session for handlers that must not hold a connection
+    for their whole response (e.g. long-lived streams).
+    """
+    return _admitted_session(read_admission, AsyncReadSessionLocal, READ)
@@ -1,10 +1,40 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import (
+    APIRouter,
+    Depends,
+    HTTPException,
+    status,
+    Query,
+    Request,
+    Response,
+    WebSocket,
+    WebSocketDisconnect,
+)
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.routers.deps import get_db
+from app.routers.deps import get_db, get_read_db, open_read_session
+from app.utils.availability import broadcaster
+from app.utils.etag import event_etag, listing_etag, etag_matches
+from app.config import get_settings
 from app.services.event import EventService
-from app.schemas.event import EventCreate, EventResponse, EventListResponse
-from typing import List
+from app.services.ticket import TicketService
+from app.services.seat import SeatService
+from app.schemas.event import (
+    EventCreate,
+    EventResponse,
+    EventListResponse,
+    EventSearchResponse,
+    EventBatchRequest,
+    EventBatchItem,
+    EVENT_BATCH_MAX_IDS,
+)
+from app.schemas.ticket import EventTicketStatsRequest, EventTicketStatsResponse
+from app.schemas.seat import SeatMapCreate, SeatMapResponse
+from typing import List, Optional
+from datetime import datetime
 from uuid import UUID
+import json
+
+settings = get_settings()
 
 router = APIRouter(prefix="/events", tags=["events"])
 
@@ -18,17 +48,229 @@ async def create_event(event_data: EventCreate, db: AsyncSession = Depends(get_d
 
 @router.get("", response_model=List[EventResponse])
 async def list_events(
+    request: Request,
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
-    db: AsyncSession = Depends(get_db),
+    start_from: Optional[datetime] = Query(None, description="Events starting at or after"),
+    start_to: Optional[datetime] = Query(None, description="Events starting before"),
+    upcoming: bool = Query(False, description="Only events that haven't started"),
+    available_only: bool = Query(False, description="Hide sold out events"),
+    venue_location: Optional[str] = Query(None, max_length=255),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """
+    List events ordered by start time, with optional filters.
+    Responds 304 when If-None-Match matches the page's current ETag.
+    """
+    service = EventService(db)
+    filters = dict(
+        skip=skip,
+        limit=limit,
+        start_from=start_from,
+        start_to=start_to,
+        upcoming=upcoming,
+        available_only=available_only,
+        venue_location=venue_location,
+    )
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        etag = listing_etag(await service.list_event_versions(**filters))
+        if etag_matches(if_none_match, etag):
+            return _not_modified(etag)
+
+    events = await service.list_events(**filters)
+    response.headers["ETag"] = listing_etag(
+        (event.id, event.version) for event in events
+    )
+    return events
+
+
+@router.get("/search", response_model=List[EventSearchResponse])
+async def search_events(
+    q: str = Query(..., min_length=1, max_length=200),
+    latitude: Optional[float] = Query(None, ge=-90, le=90),
+    longitude: Optional[float] = Query(None, ge=-180, le=180),
+    radius_km: float = Query(50.0, gt=0, le=20000),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """
+    Search events by title and description.
+    Every word must match (as a prefix), best matches first.
+    With latitude/longitude, only events within radius_km are returned.
+    """
+    service = EventService(db)
+    return await service.search_events(
+        q,
+        latitude=latitude,
+        longitude=longitude,
+        radius_km=radius_km,
+        skip=skip,
+        limit=limit,
+    )
+
+
+@router.get(":batch", response_model=List[EventBatchItem])
+async def get_events_batch(
+    ids: List[str] = Query(..., description="Event ids, comma-separated or repeated"),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """
+    Get many events in one request, in the order asked for.
+    Ids without an event come back with found=false.
+    """
+    service = EventService(db)
+    return await service.get_events_batch(_parse_event_ids(ids))
+
+
+@router.post(":batch", response_model=List[EventBatchItem])
+async def post_events_batch(
+    batch_request: EventBatchRequest, db: AsyncSession = Depends(get_read_db)
 ):
-    """List all events"""
+    """Same as GET /events:batch, for id lists too long for a URL"""
     service = EventService(db)
-    return await service.list_events(skip=skip, limit=limit)
+    return await service.get_events_batch(batch_request.ids)
+
+
+def _parse_event_ids(values: List[str]) -> List[UUID]:
+    ids = [part.strip() for value in values for part in value.split(",") if part.strip()]
+    if not ids or len(ids) > EVENT_BATCH_MAX_IDS:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Between 1 and {EVENT_BATCH_MAX_IDS} ids are required",
+        )
+    try:
+        return [UUID(event_id) for event_id in ids]
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="ids must be UUIDs",
+        )
+
+
+@router.post("/stats", response_model=List[EventTicketStatsResponse])
+async def get_event_ticket_stats(
+    stats_request: EventTicketStatsRequest, db: AsyncSession = Depends(get_read_db)
+):
+    """Get reserved/paid/expired ticket counts for many events in one query"""
+    service = TicketService(db)
+    return await service.get_event_ticket_stats(stats_request.event_ids)
 
 
 @router.get("/{event_id}", response_model=EventResponse)
-async def get_event(event_id: UUID, db: AsyncSession = Depends(get_db)):
-    """Get a specific event by ID"""
+async def get_event(
+    event_id: UUID,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_read_db),
+):
+    """
+    Get a specific event by ID.
+    Responds 304 when If-None-Match matches the event's current ETag.
+    """
     service = EventService(db)
-    return await service.get_event(event_id)
+
+    # Conditional requests are answered from the version alone
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        version = await service.get_event_version(event_id)
+        if version is not None:
+            etag = event_etag(event_id, version)
+            if etag_matches(if_none_match, etag):
+                return _not_modified(etag)
+
+    event = await service.get_event(event_id)
+    response.headers["ETag"] = event_etag(event.id, event.version)
+    return event
+
+
+def _not_modified(etag: str) -> Response:
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag}
+    )
+
+
+@router.post(
+    "/{event_id}/seats",
+    response_model=SeatMapResponse,
+    status_code=status.HTTP_201_CREATED,
+)
+async def create_seat_map(
+    event_id: UUID, seat_map: SeatMapCreate, db: AsyncSession = Depends(get_db)
+):
+    """Create the seat map (sections and rows, best first) for an event"""
+    service = SeatService(db)
+    return await service.create_seat_map(event_id, seat_map)
+
+
+@router.get("/{event_id}/seats", response_model=SeatMapResponse)
+async def get_seat_map(event_id: UUID, db: AsyncSession = Depends(get_read_db)):
+    """Get an event's seat map with per-row availability bitsets"""
+    service = SeatService(db)
+    return await service.get_seat_map(event_id)
+
+
+async def _availability_snapshot(event_id: UUID) -> dict:
+    # Own short session: the stream must not pin a pooled connection
+    async with open_read_session() as db:
+        return await EventService(db).get_availability(event_id)
+
+
+@router.get("/{event_id}/availability/stream")
+async def stream_availability(event_id: UUID, request: Request):
+    """
+    Stream ticket availability for an event as Server-Sent Events.
+    Sends the current snapshot, then an update whenever tickets are
+    reserved or released (at most a few per second).
+    """
+    # Answer 404 before the stream starts
+    await _availability_snapshot(event_id)
+
+    async def event_stream():
+        # Subscribed before the snapshot is read, so a change committed in
+        # between is pushed rather than missed
+        subscription = broadcaster.subscribe(event_id)
+        try:
+            snapshot = await _availability_snapshot(event_id)
+            yield f"event: availability\ndata: {json.dumps(snapshot)}\n\n"
+            while not await request.is_disconnected():
+                update = await subscription.next(settings.availability_keepalive_seconds)
+                if update is None:
+                    yield ": keepalive\n\n"
+                else:
+                    yield f"event: availability\ndata: {json.dumps(update)}\n\n"
+        finally:
+            broadcaster.unsubscribe(subscription)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.websocket("/{event_id}/availability/ws")
+async def availability_websocket(websocket: WebSocket, event_id: UUID):
+    """WebSocket variant of the availability stream"""
+    # Subscribed before the snapshot is read, as for the SSE stream
+    subscription = broadcaster.subscribe(event_id)
+    try:
+        try:
+            snapshot = await _availability_snapshot(event_id)
+        except HTTPException:
+            await websocket.close(code=1008)
+            return
+
+        await websocket.accept()
+        await websocket.send_json(snapshot)
+        while True:
+            update = await subscription.next(settings.availability_keepalive_seconds)
+            # Keepalives also surface disconnected clients
+            await websocket.send_json(update or {"type": "keepalive"})
+    except WebSocketDisconnect:
+        pass
+    finally:
+        broadcaster.unsubscribe(subscription)
@@ -1,25 +1,92 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.routers.deps import get_db
+from app.database import mark_recent_write
 from app.services.ticket import TicketService
-from app.schemas.ticket import TicketCreate, TicketResponse, PaymentRequest
+from app.schemas.ticket import (
+    TicketCreate,
+    TicketResponse,
+    PaymentRequest,
+    BasketCreate,
+    BasketResponse,
+)
+from app.schemas.seat import SeatReservationCreate, SeatReservationResponse
+from typing import Optional
 from uuid import UUID
 
 router = APIRouter(prefix="/tickets", tags=["tickets"])
 
 
 @router.post("", response_model=TicketResponse, status_code=status.HTTP_201_CREATED)
-async def reserve_ticket(ticket_data: TicketCreate, db: AsyncSession = Depends(get_db)):
+async def reserve_ticket(
+    ticket_data: TicketCreate,
+    x_admission_token: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_db),
+):
     """
     Reserve a ticket for a user.
     Ticket will be automatically expired if not paid within 2 minutes.
+    Events with an open waiting room require the X-Admission-Token header.
     """
     service = TicketService(db)
-    return await service.reserve_ticket(ticket_data)
+    ticket = await service.reserve_ticket(ticket_data, x_admission_token)
+    mark_recent_write(ticket.user_id)
+    return ticket
+
+
+@router.post(
+    "/seats",
+    response_model=SeatReservationResponse,
+    status_code=status.HTTP_201_CREATED,
+)
+async def reserve_seats(
+    seat_data: SeatReservationCreate,
+    x_admission_token: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Reserve the best available adjacent seats for an event with assigned seating.
+    Each seat is a ticket that expires if not paid within 2 minutes.
+    """
+    service = TicketService(db)
+    reservation = await service.reserve_seats(seat_data, x_admission_token)
+    mark_recent_write(seat_data.user_id)
+    return reservation
+
+
+@router.post(
+    "/baskets",
+    response_model=BasketResponse,
+    status_code=status.HTTP_201_CREATED,
+)
+async def reserve_basket(
+    basket_data: BasketCreate,
+    x_admission_token: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Reserve several tickets across one or more events, all or nothing.
+    The whole basket expires if not paid within 2 minutes.
+    """
+    service = TicketService(db)
+    basket = await service.reserve_basket(basket_data, x_admission_token)
+    mark_recent_write(basket.user_id)
+    return basket
+
+
+@router.post("/baskets/{basket_id}/pay", response_model=BasketResponse)
+async def mark_basket_paid(basket_id: UUID, db: AsyncSession = Depends(get_db)):
+    """Pay for every ticket in a reserved basket"""
+    service = TicketService(db)
+    basket = await service.mark_basket_paid(basket_id)
+    mark_recent_write(basket.user_id)
+    return basket
 
 
 @router.post("/{ticket_id}/pay", response_model=TicketResponse)
 async def mark_ticket_paid(ticket_id: UUID, db: AsyncSession = Depends(get_db)):
     """Mark a reserved ticket as paid"""
     service = TicketService(db)
-    return await service.mark_ticket_paid(ticket_id)
+    ticket = await service.mark_ticket_paid(ticket_id)
+    mark_recent_write(ticket.user_id)
+    return ticket
@@ -1,6 +1,6 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.routers.deps import get_db
+from app.routers.deps import get_db, get_read_db
 from app.services.event import EventService
 from app.services.ticket import TicketService
 from app.repositories.user import UserRepository
@@ -9,8 +9,8 @@ from app.schemas.user import UserCreate, UserResponse
 from app.schemas.event import EventListResponse
 from app.schemas.ticket import TicketWithEventResponse
 from app.config import get_settings
-from geoalchemy2.shape import from_shape
-from shapely.geometry import Point
+from app.database import mark_recent_write
+from app.utils.geo import point_ewkt
 from typing import List
 from uuid import UUID
 
@@ -44,11 +44,10 @@ async def create_user(user_data: UserCreate, db: AsyncSession = Depends(get_db))
         user.location = f"{user_data.latitude},{user_data.longitude}"
     else:
         if user_data.latitude is not None and user_data.longitude is not None:
-            user.location = from_shape(
-                Point(user_data.longitude, user_data.latitude), srid=4326
-            )
+            user.location = point_ewkt(user_data.longitude, user_data.latitude)
 
     created_user = await user_repo.create(user)
+    mark_recent_write(created_user.id)
     db.add(created_user)
     await db.commit()  # Ensure the commit happens
     await db.refresh(user)  # refresh to get updated values
@@ -61,7 +60,7 @@ async def get_relevant_events(
     radius_km: float = Query(settings.default_search_radius_km, ge=1, le=500),
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """
     Get events relevant to a user based on their location.
@@ -99,10 +98,13 @@ async def get_user_ticket_history(
     user_id: UUID,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
-    db: AsyncSession = Depends(get_db),
+    include_archived: bool = Query(
+        False, description="Also list archived expired reservations (archived paid tickets always are)"
+    ),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Get ticket purchase history for a user"""
     ticket_service = TicketService(db)
     return await ticket_service.get_user_ticket_history(
-        user_id=user_id, skip=skip, limit=limit
+        user_id=user_id, skip=skip, limit=limit, include_archived=include_archived
     )
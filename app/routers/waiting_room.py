@@ -0,0 +1,64 @@
+from fastapi import APIRouter, Depends, Header, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.routers.deps import get_db
+from app.services.waiting_room import (
+    WaitingRoomService,
+    WaitingRoomStore,
+    get_waiting_room_store,
+)
+from app.schemas.waiting_room import WaitingRoomOpen, WaitingRoomJoin, WaitingRoomStatus
+from uuid import UUID
+
+router = APIRouter(prefix="/waiting-room", tags=["waiting-room"])
+
+
+@router.post("/{event_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def open_waiting_room(
+    event_id: UUID,
+    room_data: WaitingRoomOpen,
+    db: AsyncSession = Depends(get_db),
+    store: WaitingRoomStore = Depends(get_waiting_room_store),
+):
+    """Open a waiting room; reservations then need an admission token"""
+    service = WaitingRoomService(store, db)
+    await service.open_room(event_id, room_data.rate_per_second)
+
+
+@router.delete("/{event_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def close_waiting_room(
+    event_id: UUID,
+    db: AsyncSession = Depends(get_db),
+    store: WaitingRoomStore = Depends(get_waiting_room_store),
+):
+    """Close a waiting room and drop its queue"""
+    service = WaitingRoomService(store, db)
+    await service.close_room(event_id)
+
+
+@router.post(
+    "/{event_id}/join",
+    response_model=WaitingRoomStatus,
+    status_code=status.HTTP_201_CREATED,
+)
+async def join_waiting_room(
+    event_id: UUID,
+    join_data: WaitingRoomJoin,
+    store: WaitingRoomStore = Depends(get_waiting_room_store),
+):
+    """Join the queue and receive a signed queue token with a position"""
+    service = WaitingRoomService(store)
+    return await service.join(event_id, join_data.user_id)
+
+
+@router.get("/{event_id}/status", response_model=WaitingRoomStatus)
+async def get_waiting_room_status(
+    event_id: UUID,
+    x_queue_token: str = Header(...),
+    store: WaitingRoomStore = Depends(get_waiting_room_store),
+):
+    """
+    Poll a queue position. Once admitted, the response carries an
+    admission token to send as X-Admission-Token when reserving.
+    """
+    service = WaitingRoomService(store)
+    return await service.get_status(event_id, x_queue_token)
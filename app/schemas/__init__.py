@@ -1,6 +1,24 @@
 from app.schemas.user import UserCreate, UserResponse, UserUpdate
-from app.schemas.event import EventCreate, EventResponse, EventListResponse, VenueSchema
-from app.schemas.ticket import TicketCreate, TicketResponse, TicketWithEventResponse
+from app.schemas.event import (
+    EventCreate,
+    EventResponse,
+    EventListResponse,
+    EventSearchResponse,
+    VenueSchema,
+)
+from app.schemas.ticket import (
+    TicketCreate,
+    TicketResponse,
+    TicketWithEventResponse,
+    EventTicketStatsRequest,
+    EventTicketStatsResponse,
+)
+from app.schemas.seat import (
+    SeatMapCreate,
+    SeatMapResponse,
+    SeatReservationCreate,
+    SeatReservationResponse,
+)
 
 __all__ = [
     "UserCreate",
@@ -9,8 +27,15 @@ __all__ = [
     "EventCreate",
     "EventResponse",
     "EventListResponse",
+    "EventSearchResponse",
     "VenueSchema",
     "TicketCreate",
     "TicketResponse",
     "TicketWithEventResponse",
+    "EventTicketStatsRequest",
+    "EventTicketStatsResponse",
+    "SeatMapCreate",
+    "SeatMapResponse",
+    "SeatReservationCreate",
+    "SeatReservationResponse",
 ]
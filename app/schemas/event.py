@@ -1,7 +1,33 @@
 from pydantic import BaseModel, Field, field_validator
 from datetime import datetime
 from uuid import UUID
-from typing import Optional
+from typing import NamedTuple, Optional
+
+
+class EventRecord(NamedTuple):
+    """
+    Read-only event with its venue fields, shaped like the Event model.
+    A plain tuple with no ORM state: repository read paths and the
+    in-process catalog return these, and they map straight onto the
+    response schemas below. Event entities are only loaded for writes.
+    """
+
+    id: UUID
+    title: str
+    description: Optional[str]
+    start_time: datetime
+    end_time: datetime
+    total_tickets: int
+    tickets_sold: int
+    version: int
+    venue_location: str
+    venue_address: str
+    venue_latitude: float
+    venue_longitude: float
+
+    @property
+    def available_tickets(self) -> int:
+        return self.total_tickets - self.tickets_sold
 
 
 class VenueSchema(BaseModel):
@@ -44,6 +70,7 @@ class EventResponse(EventBase):
     id: UUID
     tickets_sold: int
     available_tickets: int
+    version: int  # Bumped on every change; the response's ETag is derived from it
 
     model_config = {"from_attributes": True}
 
@@ -62,3 +89,21 @@ class EventListResponse(BaseModel):
     distance_km: Optional[float] = None  # Distance from user's location
 
     model_config = {"from_attributes": True}
+
+
+class EventSearchResponse(EventListResponse):
+    rank: float
+
+
+# Most events one batch request may ask for
+EVENT_BATCH_MAX_IDS = 500
+
+
+class EventBatchRequest(BaseModel):
+    ids: list[UUID] = Field(..., min_length=1, max_length=EVENT_BATCH_MAX_IDS)
+
+
+class EventBatchItem(BaseModel):
+    id: UUID
+    found: bool
+    event: Optional[EventResponse] = None  # None when not found
@@ -0,0 +1,66 @@
+from pydantic import BaseModel, Field, field_validator
+from uuid import UUID
+from typing import Optional
+from app.schemas.ticket import TicketResponse
+
+
+class SeatRowCreate(BaseModel):
+    label: str = Field(..., min_length=1, max_length=20)
+    seats: int = Field(..., gt=0, le=1000)
+
+
+class SeatSectionCreate(BaseModel):
+    name: str = Field(..., min_length=1, max_length=100)
+    rows: list[SeatRowCreate] = Field(..., min_length=1)
+
+    @field_validator("rows")
+    @classmethod
+    def validate_unique_rows(cls, v):
+        if len({row.label for row in v}) != len(v):
+            raise ValueError("row labels must be unique within a section")
+        return v
+
+
+class SeatMapCreate(BaseModel):
+    """Sections and rows in best-first order; allocation prefers earlier rows"""
+
+    sections: list[SeatSectionCreate] = Field(..., min_length=1)
+
+    @field_validator("sections")
+    @classmethod
+    def validate_unique_sections(cls, v):
+        if len({section.name for section in v}) != len(v):
+            raise ValueError("section names must be unique")
+        if sum(row.seats for section in v for row in section.rows) > 200_000:
+            raise ValueError("seat maps are limited to 200000 seats")
+        return v
+
+
+class SeatRowResponse(BaseModel):
+    section: str
+    label: str
+    seat_count: int
+    available: int
+    # Base64 little-endian bitset, bit i set = seat i + 1 taken
+    taken: str
+
+
+class SeatMapResponse(BaseModel):
+    event_id: UUID
+    total_seats: int
+    available_seats: int
+    rows: list[SeatRowResponse]
+
+
+class SeatReservationCreate(BaseModel):
+    user_id: UUID
+    event_id: UUID
+    quantity: int = Field(1, gt=0)
+    section: Optional[str] = None
+
+
+class SeatReservationResponse(BaseModel):
+    section: str
+    row: str
+    seat_numbers: list[int]
+    tickets: list[TicketResponse]
@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from datetime import datetime
 from uuid import UUID
 from app.models.ticket import TicketStatus
@@ -18,6 +18,9 @@ class TicketResponse(TicketBase):
     id: UUID
     status: TicketStatus
     created_at: datetime
+    seat_row_id: Optional[UUID] = None
+    seat_number: Optional[int] = None
+    basket_id: Optional[UUID] = None
 
     model_config = {"from_attributes": True}
 
@@ -32,6 +35,38 @@ class PaymentRequest(BaseModel):
     ticket_id: UUID
 
 
+class BasketItem(BaseModel):
+    event_id: UUID
+    quantity: int = Field(1, gt=0)
+    # Waiting room admission for this item's event (tokens are per event);
+    # defaults to the request's X-Admission-Token header
+    admission_token: Optional[str] = None
+
+
+class BasketCreate(BaseModel):
+    """Tickets reserved together, all or nothing, across one or more events"""
+
+    user_id: UUID
+    items: list[BasketItem] = Field(..., min_length=1)
+
+
+class BasketResponse(BaseModel):
+    basket_id: UUID
+    user_id: UUID
+    tickets: list[TicketResponse]
+
+
 class TicketHistoryResponse(BaseModel):
     tickets: list[TicketWithEventResponse]
     total: int
+
+
+class EventTicketStatsRequest(BaseModel):
+    event_ids: list[UUID] = Field(..., min_length=1, max_length=1000)
+
+
+class EventTicketStatsResponse(BaseModel):
+    event_id: UUID
+    reserved: int
+    paid: int
+    expired: int
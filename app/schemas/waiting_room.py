@@ -0,0 +1,20 @@
+from pydantic import BaseModel, Field
+from uuid import UUID
+from typing import Optional
+
+
+class WaitingRoomOpen(BaseModel):
+    rate_per_second: float = Field(..., gt=0)
+
+
+class WaitingRoomJoin(BaseModel):
+    user_id: UUID
+
+
+class WaitingRoomStatus(BaseModel):
+    event_id: UUID
+    queue_token: str
+    position: int
+    ahead: int
+    admitted: bool
+    admission_token: Optional[str] = None
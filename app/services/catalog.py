@@ -0,0 +1,130 @@
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING, Callable, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.repositories.event import EventRepository
+from app.config import get_settings
+from app.utils.logger import setup_logger
+from app.utils.metrics import metrics
+
+if TYPE_CHECKING:
+    from app.utils.catalog import EventCatalog
+
+settings = get_settings()
+logger = setup_logger(__name__)
+
+
+class CatalogSync:
+    """
+    Keeps an in-process EventCatalog in step with the events table.
+
+    The first sync loads every event that hasn't ended in id-ordered pages;
+    after that only rows whose updated_at moved are read back. The poll
+    re-reads `overlap_seconds` before the newest change it has seen, since
+    a transaction that started earlier may commit later, and rows whose
+    version didn't change are skipped. Syncs run in the background with
+    their own session; requests keep reading the current snapshot.
+    """
+
+    def __init__(
+        self,
+        catalog: "EventCatalog",
+        session_factory: Callable[[], AsyncSession],
+        interval_seconds: float,
+        overlap_seconds: float,
+        batch_size: int = 10000,
+    ):
+        self.catalog = catalog
+        self.session_factory = session_factory
+        self.interval_seconds = interval_seconds
+        self.overlap = timedelta(seconds=overlap_seconds)
+        self.batch_size = batch_size
+        self.loaded = False
+        self.watermark: Optional[datetime] = None
+        self._last_sync = float("-inf")
+        self._task: Optional[asyncio.Task] = None
+
+    async def sync(self, session: AsyncSession) -> int:
+        """Load or refresh the catalog from `session`; returns the rows applied"""
+        repository = EventRepository(session)
+        now = datetime.now(timezone.utc)
+
+        if not self.loaded:
+            applied, after_id = 0, None
+            while True:
+                rows = await repository.get_catalog_rows(now, after_id, self.batch_size)
+                applied += self.catalog.apply(rows, now)
+                self._advance(rows)
+                if len(rows) < self.batch_size:
+                    break
+                after_id = rows[-1][0]
+            # An empty table still needs a starting point for the change polls
+            self.watermark = self.watermark or now
+            self.loaded = True
+        else:
+            since = (self.watermark or now) - self.overlap
+            rows = await repository.get_catalog_changes(since)
+            applied = self.catalog.apply(rows, now)
+            self._advance(rows)
+            self.catalog.prune(now)
+
+        self._last_sync = time.monotonic()
+        report = self.catalog.memory_report()
+        metrics.set("event_catalog_events", report["events"])
+        metrics.set("event_catalog_bytes", report["total_bytes"])
+        metrics.set("event_catalog_bytes_per_event", round(report["bytes_per_event"], 1))
+        return applied
+
+    def _advance(self, rows) -> None:
+        for row in rows:
+            updated_at = row[-1]
+            if updated_at.tzinfo is None:
+                updated_at = updated_at.replace(tzinfo=timezone.utc)
+            if self.watermark is None or updated_at > self.watermark:
+                self.watermark = updated_at
+
+    def current(self) -> Optional["EventCatalog"]:
+        """
+        The catalog if it has been loaded (None until then, so callers use
+        the database), scheduling a background sync when one is due.
+        """
+        due = time.monotonic() - self._last_sync >= self.interval_seconds
+        if due and (self._task is None or self._task.done()):
+            self._task = asyncio.get_running_loop().create_task(self._run())
+        return self.catalog if self.loaded else None
+
+    async def _run(self) -> None:
+        try:
+            async with self.session_factory() as session:
+                await self.sync(session)
+        except Exception as e:
+            logger.warning(f"Event catalog sync failed: {e}")
+            self._last_sync = time.monotonic()
+
+
+_catalog_sync: Optional[CatalogSync] = None
+
+
+def get_catalog_sync() -> CatalogSync:
+    """The process-wide catalog sync, created on first use (loads NumPy)"""
+    global _catalog_sync
+    if _catalog_sync is None:
+        from app.database import AsyncReadSessionLocal
+        from app.utils.catalog import EventCatalog
+
+        _catalog_sync = CatalogSync(
+            EventCatalog(),
+            AsyncReadSessionLocal,
+            interval_seconds=settings.event_catalog_refresh_seconds,
+            overlap_seconds=settings.event_catalog_poll_overlap_seconds,
+            batch_size=settings.event_catalog_load_batch_size,
+        )
+    return _catalog_sync
+
+
+def current_catalog() -> Optional["EventCatalog"]:
+    """The loaded event catalog when enabled, else None"""
+    if not settings.event_catalog_enabled:
+        return None
+    return get_catalog_sync().current()
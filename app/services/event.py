@@ -1,21 +1,57 @@
 from app.repositories.event import EventRepository
+from app.repositories.venue import VenueRepository
 from app.models.event import Event
-from app.schemas.event import EventCreate, EventUpdate, EventResponse, EventListResponse
+from app.utils.availability import availability_payload
+from app.schemas.event import (
+    EventCreate,
+    EventUpdate,
+    EventResponse,
+    EventListResponse,
+    EventSearchResponse,
+    EventBatchItem,
+    EventRecord,
+)
+from app.utils.search import query_terms
+from app.utils.response_cache import response_cache, EVENTS_TAG
+from app.utils.single_flight import SingleFlight
+from app.services.catalog import current_catalog
+from app.config import get_settings
+from app.database import READS_PRIMARY
 from sqlalchemy.ext.asyncio import AsyncSession
-from geoalchemy2.shape import from_shape
-from shapely.geometry import Point
-from typing import List, Optional
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple, TypeVar, Union
+from datetime import datetime, timezone
 from uuid import UUID
 from fastapi import HTTPException, status
 
+settings = get_settings()
+
+# Database reads shared by concurrent identical requests (see _coalesced)
+event_reads = SingleFlight("event_reads")
+
+T = TypeVar("T")
+
 
 class EventService:
     def __init__(self, db: AsyncSession):
         self.repository = EventRepository(db)
+        self.venue_repository = VenueRepository(db)
+        # The catalog trails the primary by up to its refresh interval, so
+        # sessions pinned to the primary for read-your-writes never use it
+        self._use_catalog = not db.info.get(READS_PRIMARY, False)
+
+    def _catalog(self):
+        """The event catalog, unless this request must read the primary"""
+        return current_catalog() if self._use_catalog else None
 
     async def create_event(self, event_data: EventCreate) -> EventResponse:
         """Create a new event"""
-        # Create the Event model instance
+        # Events at an address already on file share its venue row
+        venue = await self.venue_repository.upsert(
+            location=event_data.venue.location,
+            address=event_data.venue.address,
+            latitude=event_data.venue.latitude,
+            longitude=event_data.venue.longitude,
+        )
         event = Event(
             title=event_data.title,
             description=event_data.description,
@@ -23,31 +59,172 @@ class EventService:
             end_time=event_data.end_time,
             total_tickets=event_data.total_tickets,
             tickets_sold=0,
-            venue_location=event_data.venue.location,
-            venue_address=event_data.venue.address,
-            venue_latitude=event_data.venue.latitude,
-            venue_longitude=event_data.venue.longitude,
-            geo_location=from_shape(
-                Point(event_data.venue.longitude, event_data.venue.latitude), srid=4326
-            ),
+            venue=venue,
         )
 
         created_event = await self.repository.create(event)
+        # Cached listings may now be missing it
+        await response_cache.invalidate([EVENTS_TAG])
         return self._to_response(created_event)
 
     async def get_event(self, event_id: UUID) -> EventResponse:
         """Get event by ID"""
-        event = await self.repository.get_by_id(event_id)
+        catalog = self._catalog()
+        if catalog is not None:
+            event = catalog.get(event_id)
+            if event is not None:
+                return self._to_response(event)
+
+        return await self._coalesced(("event", event_id), lambda: self._load_event(event_id))
+
+    async def _load_event(self, event_id: UUID) -> EventResponse:
+        event = await self.repository.get_record(event_id)
         if not event:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="Event not found"
             )
         return self._to_response(event)
 
-    async def list_events(self, skip: int = 0, limit: int = 100) -> List[EventResponse]:
-        """List all events"""
-        events = await self.repository.get_all(skip=skip, limit=limit)
-        return [self._to_response(event) for event in events]
+    async def get_events_batch(self, event_ids: List[UUID]) -> List[EventBatchItem]:
+        """
+        Get many events in the order asked for, each marked found or not.
+        Ids the catalog holds are served from it; the rest take one query.
+        """
+        found: Dict[UUID, EventResponse] = {}
+        catalog = self._catalog()
+        if catalog is not None:
+            for event_id in event_ids:
+                event = catalog.get(event_id)
+                if event is not None:
+                    found[event_id] = self._to_response(event)
+
+        missing = [event_id for event_id in event_ids if event_id not in found]
+        if missing:
+            events = await self.repository.get_records(missing)
+            for event_id, event in events.items():
+                found[event_id] = self._to_response(event)
+
+        return [
+            EventBatchItem(id=event_id, found=event_id in found, event=found.get(event_id))
+            for event_id in event_ids
+        ]
+
+    async def get_availability(self, event_id: UUID) -> dict:
+        """Get the current availability snapshot pushed to streaming clients"""
+        event = await self.repository.get_record(event_id)
+        if not event:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Event not found"
+            )
+        return availability_payload(event)
+
+    async def list_events(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        start_from: Optional[datetime] = None,
+        start_to: Optional[datetime] = None,
+        upcoming: bool = False,
+        available_only: bool = False,
+        venue_location: Optional[str] = None,
+    ) -> List[EventResponse]:
+        """List events ordered by start time, optionally filtered"""
+        filters = self._listing_filters(
+            start_from, start_to, upcoming, available_only, venue_location
+        )
+
+        catalog = self._catalog_for_listing(filters)
+        if catalog is not None:
+            events = catalog.list_events(skip, limit, datetime.now(timezone.utc), **filters)
+            return [self._to_response(event) for event in events]
+
+        async def load() -> List[EventResponse]:
+            events = await self.repository.list_events(skip=skip, limit=limit, **filters)
+            return [self._to_response(event) for event in events]
+
+        return await self._coalesced(
+            ("list", skip, limit, *sorted(filters.items())), load
+        )
+
+    async def list_event_versions(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        start_from: Optional[datetime] = None,
+        start_to: Optional[datetime] = None,
+        upcoming: bool = False,
+        available_only: bool = False,
+        venue_location: Optional[str] = None,
+    ) -> List[Tuple[UUID, int]]:
+        """(id, version) pairs of the page `list_events` returns, for its ETag"""
+        filters = self._listing_filters(
+            start_from, start_to, upcoming, available_only, venue_location
+        )
+
+        catalog = self._catalog_for_listing(filters)
+        if catalog is not None:
+            return catalog.list_event_versions(
+                skip, limit, datetime.now(timezone.utc), **filters
+            )
+        return await self.repository.list_event_versions(skip=skip, limit=limit, **filters)
+
+    async def get_event_version(self, event_id: UUID) -> Optional[int]:
+        """Current version of an event (None if it doesn't exist)"""
+        catalog = self._catalog()
+        if catalog is not None:
+            version = catalog.get_version(event_id)
+            if version is not None:
+                return version
+        return await self.repository.get_version(event_id)
+
+    async def _coalesced(self, key: tuple, call: Callable[[], Awaitable[T]]) -> T:
+        """
+        Run a database read through `event_reads`, so identical concurrent
+        requests share one query. Keyed by the database it reads from too,
+        so requests pinned to the primary never get a replica's result.
+        """
+        if not settings.read_coalescing_enabled:
+            return await call()
+        return await event_reads.do((self.repository.db.get_bind(), *key), call)
+
+    def _listing_filters(
+        self,
+        start_from: Optional[datetime],
+        start_to: Optional[datetime],
+        upcoming: bool,
+        available_only: bool,
+        venue_location: Optional[str],
+    ) -> dict:
+        """Validated listing filters; times without a timezone are taken as UTC"""
+        start_from, start_to = (
+            value.replace(tzinfo=timezone.utc) if value and value.tzinfo is None else value
+            for value in (start_from, start_to)
+        )
+        if start_from and start_to and start_to <= start_from:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="start_to must be after start_from",
+            )
+        return dict(
+            start_from=start_from,
+            start_to=start_to,
+            upcoming=upcoming,
+            available_only=available_only,
+            venue_location=venue_location,
+        )
+
+    def _catalog_for_listing(self, filters: dict):
+        """
+        The event catalog when it holds every event the listing can return:
+        it only keeps events that haven't ended, so only listings of events
+        starting from now on qualify.
+        """
+        start_from = filters["start_from"]
+        if not filters["upcoming"] and (
+            start_from is None or start_from < datetime.now(timezone.utc)
+        ):
+            return None
+        return self._catalog()
 
     async def get_relevant_events(
         self,
@@ -58,21 +235,77 @@ class EventService:
         limit: int = 100,
     ) -> List[EventListResponse]:
         """Get events relevant to user's location"""
-        events_with_distance = await self.repository.get_events_near_location(
-            latitude=user_latitude,
-            longitude=user_longitude,
+        catalog = self._catalog()
+        if catalog is not None:
+            # The catalog only holds events that haven't ended
+            events_with_distance = catalog.near(
+                user_latitude,
+                user_longitude,
+                radius_km,
+                skip,
+                limit,
+                datetime.now(timezone.utc),
+            )
+            return [
+                self._to_list_response(event, distance)
+                for event, distance in events_with_distance
+            ]
+
+        async def load() -> List[EventListResponse]:
+            events_with_distance = await self.repository.get_events_near_location(
+                latitude=user_latitude,
+                longitude=user_longitude,
+                radius_km=radius_km,
+                skip=skip,
+                limit=limit,
+            )
+            return [
+                self._to_list_response(event, distance)
+                for event, distance in events_with_distance
+            ]
+
+        return await self._coalesced(
+            ("near", user_latitude, user_longitude, radius_km, skip, limit), load
+        )
+
+    async def search_events(
+        self,
+        query: str,
+        latitude: Optional[float] = None,
+        longitude: Optional[float] = None,
+        radius_km: float = 50.0,
+        skip: int = 0,
+        limit: int = 20,
+    ) -> List[EventSearchResponse]:
+        """Search events by title and description, optionally near a location"""
+        if (latitude is None) != (longitude is None):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="latitude and longitude must be given together",
+            )
+
+        terms = query_terms(query)
+        if not terms:
+            return []
+
+        results = await self.repository.search_events(
+            terms,
+            latitude=latitude,
+            longitude=longitude,
             radius_km=radius_km,
             skip=skip,
             limit=limit,
         )
-
         return [
-            self._to_list_response(event, distance)
-            for event, distance in events_with_distance
+            EventSearchResponse(
+                **self._to_list_response(event, distance).model_dump(),
+                rank=round(rank, 4),
+            )
+            for event, rank, distance in results
         ]
 
-    def _to_response(self, event: Event) -> EventResponse:
-        """Convert Event model to response schema"""
+    def _to_response(self, event: Union[Event, EventRecord]) -> EventResponse:
+        """Convert an event record (or a freshly written Event) to response schema"""
         from app.schemas.event import VenueSchema
 
         return EventResponse(
@@ -84,6 +317,7 @@ class EventService:
             total_tickets=event.total_tickets,
             tickets_sold=event.tickets_sold,
             available_tickets=event.available_tickets,
+            version=event.version,
             venue=VenueSchema(
                 location=event.venue_location,
                 address=event.venue_address,
@@ -92,8 +326,10 @@ class EventService:
             ),
         )
 
-    def _to_list_response(self, event: Event, distance_km: float) -> EventListResponse:
-        """Convert Event model to list response with distance"""
+    def _to_list_response(
+        self, event: EventRecord, distance_km: Optional[float]
+    ) -> EventListResponse:
+        """Convert an event record to list response with distance"""
         from app.schemas.event import VenueSchema
 
         return EventListResponse(
@@ -102,7 +338,7 @@ class EventService:
             start_time=event.start_time,
             end_time=event.end_time,
             available_tickets=event.available_tickets,
-            distance_km=round(distance_km, 2),
+            distance_km=round(distance_km, 2) if distance_km is not None else None,
             venue=VenueSchema(
                 location=event.venue_location,
                 address=event.venue_address,
@@ -0,0 +1,139 @@
+from app.repositories.event import EventRepository
+from app.repositories.seat import SeatRepository
+from app.schemas.seat import SeatMapCreate, SeatMapResponse, SeatRowResponse
+from app.utils.seating import SeatBlock, SeatMapCache, seat_map_cache, bits_from_bytes
+from app.utils.response_cache import invalidate_events
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+from uuid import UUID
+from fastapi import HTTPException, status
+import base64
+
+
+class SeatService:
+    def __init__(self, db: AsyncSession, cache: Optional[SeatMapCache] = None):
+        self.seat_repo = SeatRepository(db)
+        self.event_repo = EventRepository(db)
+        self.cache = cache or seat_map_cache
+
+    async def create_seat_map(
+        self, event_id: UUID, seat_map: SeatMapCreate
+    ) -> SeatMapResponse:
+        """
+        Create the seat map for an event.
+        Business rules:
+        - Event must exist
+        - An event gets one seat map, before any ticket is sold
+        - The event's total_tickets becomes its seat count
+        """
+        event = await self.event_repo.get_by_id(event_id)
+        if not event:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Event not found"
+            )
+        if event.assigned_seating or await self.seat_repo.has_seat_map(event_id):
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Event already has a seat map",
+            )
+        if event.tickets_sold:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Cannot add a seat map after tickets have been sold",
+            )
+
+        total_seats = await self.seat_repo.create_rows(
+            event_id,
+            [
+                (section.name, row.label, row.seats)
+                for section in seat_map.sections
+                for row in section.rows
+            ],
+        )
+        event.assigned_seating = True
+        event.total_tickets = total_seats
+        await self.event_repo.update_obj(event)
+        self.cache.invalidate(event_id)
+        await invalidate_events([event_id])
+
+        return await self.get_seat_map(event_id)
+
+    async def get_seat_map(self, event_id: UUID) -> SeatMapResponse:
+        """Get an event's rows with per-row availability bitsets"""
+        rows = await self.seat_repo.get_bitmaps(event_id)
+        if not rows:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Seat map not found"
+            )
+
+        row_responses = [
+            SeatRowResponse(
+                section=section,
+                label=label,
+                seat_count=seat_count,
+                available=seat_count - bits_from_bytes(taken).bit_count(),
+                taken=base64.b64encode(taken).decode(),
+            )
+            for _, section, label, seat_count, taken in rows
+        ]
+        return SeatMapResponse(
+            event_id=event_id,
+            total_seats=sum(row.seat_count for row in row_responses),
+            available_seats=sum(row.available for row in row_responses),
+            rows=row_responses,
+        )
+
+    async def claim_seats(
+        self, event_id: UUID, quantity: int, section: Optional[str] = None
+    ) -> SeatBlock:
+        """
+        Pick the best `quantity` adjacent seats and mark them taken in the
+        current transaction (not committed). The caller commits, then calls
+        `confirm_claim`, or calls `release_claim` if the commit fails.
+        """
+        bitmap = await self.cache.get(event_id, self.seat_repo.get_bitmaps)
+        if bitmap is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Seat map not found"
+            )
+        if section is not None and section not in bitmap.sections:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Section not found"
+            )
+
+        # The in-memory pick is only a candidate: another process may have
+        # taken those seats, in which case the row is refreshed and we retry
+        for _ in range(3):
+            block = bitmap.claim(quantity, section)
+            if block is None:
+                break
+            try:
+                taken = await self.seat_repo.take_seats(
+                    block.row_id, block.first_seat, quantity
+                )
+            except BaseException:
+                bitmap.release(block)
+                raise
+            if taken:
+                return block
+
+            bitmap.release(block)
+            locked = await self.seat_repo.lock_bitmaps([block.row_id])
+            if block.row_id in locked:
+                bitmap.load_row(block.row_id, locked[block.row_id][1])
+
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"No {quantity} adjacent seats available",
+        )
+
+    def confirm_claim(self, event_id: UUID, block: SeatBlock) -> None:
+        bitmap = self.cache.peek(event_id)
+        if bitmap is not None:
+            bitmap.confirm(block)
+
+    def release_claim(self, event_id: UUID, block: SeatBlock) -> None:
+        bitmap = self.cache.peek(event_id)
+        if bitmap is not None:
+            bitmap.release(block)
+        self.cache.invalidate(event_id)
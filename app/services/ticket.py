@@ -1,66 +1,491 @@
 from app.repositories.ticket import TicketRepository
 from app.repositories.event import EventRepository
+from app.repositories.outbox import OutboxRepository
+from app.models.event import Event
 from app.models.ticket import Ticket, TicketStatus
-from app.schemas.ticket import TicketCreate, TicketResponse, TicketWithEventResponse
+from app.schemas.ticket import (
+    TicketCreate,
+    TicketResponse,
+    TicketWithEventResponse,
+    EventTicketStatsResponse,
+    BasketCreate,
+    BasketResponse,
+)
+from app.schemas.seat import SeatReservationCreate, SeatReservationResponse
+from app.services.seat import SeatService
+from app.services.waiting_room import verify_admission_token
+from app.utils.rate_limit import ReservationLimiter, RateLimited, get_reservation_limiter
+from app.utils.metrics import metrics
+from app.utils.optimistic import VersionConflict, retry_on_conflict
+from app.config import get_settings
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy import Row
+from typing import Dict, Iterable, List, Optional, Tuple
 from uuid import UUID
+from datetime import datetime, timezone, timedelta
+import uuid
 from fastapi import HTTPException, status
 
+settings = get_settings()
+
 
 class TicketService:
-    def __init__(self, db: AsyncSession):
+    def __init__(self, db: AsyncSession, limiter: Optional[ReservationLimiter] = None):
+        self.db = db
         self.ticket_repo = TicketRepository(db)
         self.event_repo = EventRepository(db)
+        self.outbox_repo = OutboxRepository(db)
+        self.seat_service = SeatService(db)
+        self._limiter = limiter
+        # History fields of events already loaded in this request, by event id
+        self._event_summaries: Dict[UUID, Row] = {}
+
+    @property
+    def limiter(self) -> ReservationLimiter:
+        if self._limiter is None:
+            self._limiter = get_reservation_limiter()
+        return self._limiter
 
-    async def reserve_ticket(self, ticket_data: TicketCreate) -> TicketResponse:
+    async def reserve_ticket(
+        self, ticket_data: TicketCreate, admission_token: Optional[str] = None
+    ) -> TicketResponse:
         """
         Reserve a ticket for a user.
         Business rules:
+        - User must be within the reservation rate limits and hold cap
         - Event must exist
-        - Event must not be sold out
+        - Events with an open waiting room need a valid admission token
+        - Event must not be sold out, once overdue holds have been reclaimed
         - Ticket is created with RESERVED status
         """
+        # Rate limits and hold cap are checked before any DB work
+        ticket_id = uuid.uuid4()
+        try:
+            await self.limiter.acquire(
+                ticket_data.user_id, ticket_data.event_id, ticket_id
+            )
+        except RateLimited as e:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail=e.reason,
+                headers={"Retry-After": str(e.retry_after)},
+            )
+
+        try:
+            return await self._reserve(ticket_data, ticket_id, admission_token)
+        except BaseException:
+            # Only a reservation that went through keeps its hold; refused,
+            # failed (DB errors, 409s) or cancelled ones give it back
+            await self.limiter.release_hold(
+                ticket_data.user_id, ticket_data.event_id, ticket_id
+            )
+            raise
+
+    async def _get_event_for_reservation(
+        self, event_id: UUID, user_id: UUID, admission_token: Optional[str]
+    ):
         # Check if event exists
-        event = await self.event_repo.get_by_id(ticket_data.event_id)
+        event = await self.event_repo.get_by_id(event_id)
         if not event:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="Event not found"
             )
 
-        # Check if event is sold out
-        if event.is_sold_out:
+        self._check_admission(event, user_id, admission_token)
+
+        # Check if event is sold out, counting only holds that are still live
+        if event.is_sold_out and not await self._reclaim_stale_holds(event):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST, detail="Event is sold out"
             )
+        return event
 
-        # Create ticket with RESERVED status
-        ticket = Ticket(
-            user_id=ticket_data.user_id,
-            event_id=ticket_data.event_id,
-            status=TicketStatus.RESERVED,
+    def _check_admission(
+        self, event: Event, user_id: UUID, admission_token: Optional[str]
+    ) -> None:
+        # Check waiting room admission (stateless HMAC check)
+        if event.waiting_room_enabled and not verify_admission_token(
+            admission_token, event.id, user_id
+        ):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="A waiting room admission token is required for this event",
+            )
+
+    async def _reclaim_stale_holds(self, event: Event) -> int:
+        """
+        Expire the event's reservations that are past their deadline but
+        haven't been picked up by the expiration consumer or sweep yet, so
+        they stop holding inventory. Bounded by `stale_hold_reclaim_limit`.
+        Returns how many were reclaimed; `event` is refreshed if any were.
+        """
+        expired = await self.ticket_repo.expire_stale(
+            event.id,
+            timeout_seconds=settings.ticket_reservation_timeout,
+            limit=settings.stale_hold_reclaim_limit,
         )
+        if not expired:
+            return 0
 
-        created_ticket = await self.ticket_repo.create(ticket)
+        await self.event_repo.decrement_tickets_sold_many(expired)
+        await self.db.refresh(event)
+        if event.assigned_seating:
+            # Their seats were given back behind the cached bitmaps
+            self.seat_service.cache.invalidate(event.id)
+        reclaimed = sum(expired.values())
+        metrics.inc("stale_holds_reclaimed_total", reclaimed)
+        return reclaimed
 
-        # Increment tickets_sold counter
-        await self.event_repo.increment_tickets_sold(ticket_data.event_id)
+    async def _reserve(
+        self,
+        ticket_data: TicketCreate,
+        ticket_id: uuid.UUID,
+        admission_token: Optional[str],
+    ) -> TicketResponse:
+        from app.workers.tasks import expire_ticket
 
-        # Schedule expiration task (will be handled by Celery)
-        from workers.tasks import expire_ticket
+        async def attempt(guarded: bool = False) -> Ticket:
+            # Re-read on every attempt: a conflict rolled the session back
+            event = await self._get_event_for_reservation(
+                ticket_data.event_id, ticket_data.user_id, admission_token
+            )
+
+            # Seated events sell specific seats only
+            if event.assigned_seating:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="This event has assigned seating; reserve seats instead",
+                )
+
+            # Create ticket with RESERVED status
+            ticket = Ticket(
+                id=ticket_id,
+                user_id=ticket_data.user_id,
+                event_id=ticket_data.event_id,
+                status=TicketStatus.RESERVED,
+                **self._event_snapshot(event),
+            )
 
-        expire_ticket.apply_async(
-            args=[str(created_ticket.id)], countdown=120  # 2 minutes
+            # Ticket, its expiration, tickets_sold and the rollup commit
+            # together, only if nobody changed the event since its
+            # availability was checked. The rollup is counted after the
+            # counter write, so losers never queue on its row lock.
+            await self.ticket_repo.add_many([ticket], rollup=False)
+            self._schedule_expiration(expire_ticket, str(ticket_id))
+
+            async def count_ticket():
+                await self.ticket_repo.count_reserved([ticket])
+
+            if guarded:
+                # Too contended for the compare-and-swap: increment in SQL,
+                # which only running out of tickets can refuse
+                if not await self.event_repo.add_tickets_sold_if_available(
+                    event, 1, before_commit=count_ticket
+                ):
+                    raise HTTPException(
+                        status_code=status.HTTP_400_BAD_REQUEST,
+                        detail="Event is sold out",
+                    )
+            elif not await self.event_repo.add_tickets_sold_if_unchanged(
+                event, 1, before_commit=count_ticket
+            ):
+                raise VersionConflict()
+            return ticket
+
+        created_ticket = await retry_on_conflict(
+            "reserve_ticket", attempt, fallback=lambda: attempt(guarded=True)
         )
 
         return self._to_response(created_ticket)
 
+    def _schedule_expiration(self, task, *args) -> None:
+        """
+        Stage an expiration task call in the outbox. It commits with the
+        reservation and app.workers.outbox_relay sends it to the broker, so
+        requests never wait on the broker.
+        """
+        self.outbox_repo.add(
+            task.name, list(args), countdown=settings.ticket_reservation_timeout
+        )
+
+    def _event_snapshot(self, event: Event) -> dict:
+        """Event fields copied onto new tickets for their history, when enabled"""
+        if not settings.ticket_event_snapshot_enabled:
+            return {}
+        return dict(
+            event_title=event.title,
+            event_start_time=event.start_time,
+            venue_location=event.venue_location,
+        )
+
+    async def reserve_seats(
+        self, seat_data: SeatReservationCreate, admission_token: Optional[str] = None
+    ) -> SeatReservationResponse:
+        """
+        Reserve the best available adjacent seats for a user.
+        Same rules as reserve_ticket, per seat, plus:
+        - Event must have a seat map
+        - All seats are in one row; the request fails if no row has room
+        """
+        if seat_data.quantity > settings.max_seats_per_reservation:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"At most {settings.max_seats_per_reservation} seats per reservation",
+            )
+
+        # Every seat is a hold of its own for the rate limiter
+        ticket_ids = []
+        try:
+            for _ in range(seat_data.quantity):
+                ticket_id = uuid.uuid4()
+                await self.limiter.acquire(
+                    seat_data.user_id, seat_data.event_id, ticket_id
+                )
+                ticket_ids.append(ticket_id)
+        except RateLimited as e:
+            await self._release_holds(
+                seat_data.user_id, [(seat_data.event_id, t) for t in ticket_ids]
+            )
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail=e.reason,
+                headers={"Retry-After": str(e.retry_after)},
+            )
+        except BaseException:
+            await self._release_holds(
+                seat_data.user_id, [(seat_data.event_id, t) for t in ticket_ids]
+            )
+            raise
+
+        try:
+            return await self._reserve_seats(seat_data, ticket_ids, admission_token)
+        except BaseException:
+            await self._release_holds(
+                seat_data.user_id, [(seat_data.event_id, t) for t in ticket_ids]
+            )
+            raise
+
+    async def _release_holds(
+        self, user_id: UUID, holds: Iterable[Tuple[UUID, uuid.UUID]]
+    ) -> None:
+        """Give back rate limiter holds, as (event id, ticket id) pairs"""
+        for event_id, ticket_id in holds:
+            await self.limiter.release_hold(user_id, event_id, ticket_id)
+
+    async def _reserve_seats(
+        self,
+        seat_data: SeatReservationCreate,
+        ticket_ids: List[uuid.UUID],
+        admission_token: Optional[str],
+    ) -> SeatReservationResponse:
+        event = await self._get_event_for_reservation(
+            seat_data.event_id, seat_data.user_id, admission_token
+        )
+        if not event.assigned_seating:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="This event is general admission",
+            )
+        if event.available_tickets < seat_data.quantity and (
+            not await self._reclaim_stale_holds(event)
+            or event.available_tickets < seat_data.quantity
+        ):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Not enough seats available",
+            )
+
+        # Seat bits and tickets commit together; the unique seat index is the
+        # last line of defence against another process selling the same seat
+        try:
+            block = await self.seat_service.claim_seats(
+                seat_data.event_id, seat_data.quantity, seat_data.section
+            )
+        except HTTPException as e:
+            # Adjacent seats may only be held by overdue reservations
+            if e.status_code != status.HTTP_409_CONFLICT:
+                raise
+            if not await self._reclaim_stale_holds(event):
+                raise
+            block = await self.seat_service.claim_seats(
+                seat_data.event_id, seat_data.quantity, seat_data.section
+            )
+        tickets = [
+            Ticket(
+                id=ticket_id,
+                user_id=seat_data.user_id,
+                event_id=seat_data.event_id,
+                status=TicketStatus.RESERVED,
+                seat_row_id=block.row_id,
+                seat_number=seat_number,
+                **self._event_snapshot(event),
+            )
+            for ticket_id, seat_number in zip(ticket_ids, block.seat_numbers)
+        ]
+        # Expirations are scheduled in the same commit as the tickets
+        from app.workers.tasks import expire_ticket
+
+        for ticket in tickets:
+            self._schedule_expiration(expire_ticket, str(ticket.id))
+        try:
+            # Tickets, seat bits and the tickets_sold increment in one commit
+            await self.ticket_repo.add_many(tickets)
+            await self.event_repo.increment_tickets_sold_many(
+                {seat_data.event_id: len(tickets)}
+            )
+        except IntegrityError:
+            await self.db.rollback()
+            self.seat_service.release_claim(seat_data.event_id, block)
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Seats were taken concurrently, please retry",
+            )
+        except BaseException:
+            self.seat_service.release_claim(seat_data.event_id, block)
+            raise
+        self.seat_service.confirm_claim(seat_data.event_id, block)
+
+        return SeatReservationResponse(
+            section=block.section,
+            row=block.label,
+            seat_numbers=block.seat_numbers,
+            tickets=[self._to_response(ticket) for ticket in tickets],
+        )
+
+    async def reserve_basket(
+        self, basket_data: BasketCreate, admission_token: Optional[str] = None
+    ) -> BasketResponse:
+        """
+        Reserve several tickets across one or more events in one transaction.
+        Business rules:
+        - Same rules as reserve_ticket, per ticket
+        - Waiting room events need their own admission token, given on
+          their items or as `admission_token` (one event's token only)
+        - At most `max_basket_tickets` tickets per basket
+        - Every event must have room for its tickets, or nothing is reserved
+        - The basket expires as a whole, from one scheduled expiration
+        """
+        quantities: Dict[UUID, int] = {}
+        admission_tokens: Dict[UUID, Optional[str]] = {}
+        for item in basket_data.items:
+            quantities[item.event_id] = quantities.get(item.event_id, 0) + item.quantity
+            if item.admission_token or item.event_id not in admission_tokens:
+                admission_tokens[item.event_id] = item.admission_token or admission_token
+        if sum(quantities.values()) > settings.max_basket_tickets:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"At most {settings.max_basket_tickets} tickets per basket",
+            )
+
+        # Every ticket is a hold of its own for the rate limiter
+        holds = []
+        try:
+            for event_id, quantity in quantities.items():
+                for _ in range(quantity):
+                    ticket_id = uuid.uuid4()
+                    await self.limiter.acquire(basket_data.user_id, event_id, ticket_id)
+                    holds.append((event_id, ticket_id))
+        except RateLimited as e:
+            await self._release_holds(basket_data.user_id, holds)
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail=e.reason,
+                headers={"Retry-After": str(e.retry_after)},
+            )
+        except BaseException:
+            await self._release_holds(basket_data.user_id, holds)
+            raise
+
+        try:
+            return await self._reserve_basket(
+                basket_data.user_id, quantities, holds, admission_tokens
+            )
+        except BaseException:
+            await self._release_holds(basket_data.user_id, holds)
+            raise
+
+    async def _lock_basket_events(
+        self, quantities: Dict[UUID, int]
+    ) -> Tuple[Dict[UUID, Event], List[Event]]:
+        """The basket's events, locked, and those without room for their tickets"""
+        events = await self.event_repo.lock_many(quantities)
+        short = [
+            event
+            for event_id, event in events.items()
+            if event.available_tickets < quantities[event_id]
+        ]
+        return events, short
+
+    async def _reserve_basket(
+        self,
+        user_id: UUID,
+        quantities: Dict[UUID, int],
+        holds: List[Tuple[UUID, uuid.UUID]],
+        admission_tokens: Dict[UUID, Optional[str]],
+    ) -> BasketResponse:
+        events, short = await self._lock_basket_events(quantities)
+        if len(events) != len(quantities):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Event not found"
+            )
+        for event in events.values():
+            self._check_admission(event, user_id, admission_tokens[event.id])
+            if event.assigned_seating:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Events with assigned seating can't be in a basket; reserve seats instead",
+                )
+
+        # Reclaiming commits, which drops the locks, so lock again after it
+        if short:
+            reclaimed = 0
+            for event in short:
+                reclaimed += await self._reclaim_stale_holds(event)
+            if reclaimed:
+                events, short = await self._lock_basket_events(quantities)
+        if short:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Not enough tickets available for: "
+                + ", ".join(event.title for event in short),
+            )
+
+        basket_id = uuid.uuid4()
+        tickets = [
+            Ticket(
+                id=ticket_id,
+                user_id=user_id,
+                event_id=event_id,
+                status=TicketStatus.RESERVED,
+                basket_id=basket_id,
+                **self._event_snapshot(events[event_id]),
+            )
+            for event_id, ticket_id in holds
+        ]
+        # One expiration for the whole basket (will be handled by the consumer)
+        from app.workers.tasks import expire_basket
+
+        self._schedule_expiration(
+            expire_basket, str(basket_id), [str(ticket.id) for ticket in tickets]
+        )
+
+        # Tickets, expiration and counters commit together, releasing the event locks
+        await self.ticket_repo.add_many(tickets)
+        await self.event_repo.increment_tickets_sold_many(quantities)
+
+        return BasketResponse(
+            basket_id=basket_id,
+            user_id=user_id,
+            tickets=[self._to_response(ticket) for ticket in tickets],
+        )
+
     async def mark_ticket_paid(self, ticket_id: UUID) -> TicketResponse:
         """
         Mark a ticket as paid.
         Business rules:
         - Ticket must exist
-        - Ticket must be in RESERVED status
+        - Ticket must be in RESERVED status and within its reservation window
         """
         ticket = await self.ticket_repo.get_by_id(ticket_id)
         if not ticket:
@@ -68,62 +493,175 @@ class TicketService:
                 status_code=status.HTTP_404_NOT_FOUND, detail="Ticket not found"
             )
 
+        # An overdue reservation is expired, whether or not a worker got to it
+        if ticket.is_expired(settings.ticket_reservation_timeout):
+            await self.expire_tickets([ticket.id])
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Cannot mark ticket as paid. The reservation has expired",
+            )
+
         if ticket.status != TicketStatus.RESERVED:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"Cannot mark ticket as paid. Current status: {ticket.status}",
             )
 
-        # Update ticket status to PAID
-        updated_ticket = await self.ticket_repo.update_status(
-            ticket_id, TicketStatus.PAID
+        # Pay only if it is still an unexpired reservation when the UPDATE runs;
+        # an expiration racing the checks above must not be overwritten
+        deadline = datetime.now(timezone.utc) - timedelta(
+            seconds=settings.ticket_reservation_timeout
         )
+        updated_ticket = await self.ticket_repo.pay(ticket_id, deadline)
+        if updated_ticket is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Cannot mark ticket as paid. The reservation has expired or changed",
+            )
+
+        # A paid ticket no longer counts as an unpaid hold
+        await self.limiter.release_hold(ticket.user_id, ticket.event_id, ticket.id)
 
         return self._to_response(updated_ticket)
 
+    async def mark_basket_paid(self, basket_id: UUID) -> BasketResponse:
+        """
+        Pay for every ticket in a basket with one statement.
+        Business rules:
+        - Basket must exist
+        - All its tickets must be RESERVED and within their reservation
+          window; otherwise none of them are paid
+        """
+        tickets = await self.ticket_repo.get_basket(basket_id)
+        if not tickets:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Basket not found"
+            )
+
+        # An overdue basket is expired, whether or not a worker got to it
+        if any(ticket.is_expired(settings.ticket_reservation_timeout) for ticket in tickets):
+            await self.expire_tickets([ticket.id for ticket in tickets])
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Cannot pay for basket. The reservation has expired",
+            )
+        not_reserved = {t.status.value for t in tickets if t.status != TicketStatus.RESERVED}
+        if not_reserved:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Cannot pay for basket. It has {', '.join(sorted(not_reserved))} tickets",
+            )
+
+        deadline = datetime.now(timezone.utc) - timedelta(
+            seconds=settings.ticket_reservation_timeout
+        )
+        if not await self.ticket_repo.pay_basket(basket_id, len(tickets), deadline):
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Basket changed while paying, please retry",
+            )
+
+        # Paid tickets no longer count as unpaid holds
+        user_id = tickets[0].user_id
+        await self._release_holds(user_id, [(t.event_id, t.id) for t in tickets])
+
+        tickets = await self.ticket_repo.get_basket(basket_id)
+        return BasketResponse(
+            basket_id=basket_id,
+            user_id=user_id,
+            tickets=[self._to_response(ticket) for ticket in tickets],
+        )
+
     async def get_user_ticket_history(
-        self, user_id: UUID, skip: int = 0, limit: int = 100
+        self,
+        user_id: UUID,
+        skip: int = 0,
+        limit: int = 100,
+        include_archived: bool = False,
     ) -> List[TicketWithEventResponse]:
-        """Get ticket history for a user"""
-        tickets = await self.ticket_repo.get_user_tickets(
-            user_id=user_id, skip=skip, limit=limit
+        """
+        Get ticket history for a user, including archived paid tickets and,
+        with `include_archived`, archived expired reservations too.
+        Tickets are read as plain rows; tickets without an event snapshot
+        get the event's fields from one query for all their events, each
+        event loaded once per request however many tickets it has.
+        Overdue reservations are shown as expired.
+        """
+        rows = await self.ticket_repo.get_user_ticket_history_rows(
+            user_id=user_id, skip=skip, limit=limit, include_archived=include_archived
         )
 
-        return [
-            TicketWithEventResponse(
-                id=ticket.id,
-                user_id=ticket.user_id,
-                event_id=ticket.event_id,
-                status=ticket.status,
-                created_at=ticket.created_at,
-                event_title=ticket.event.title,
-                event_start_time=ticket.event.start_time,
-                venue_location=ticket.event.venue_location,
-            )
-            for ticket in tickets
-        ]
+        missing = {
+            row.event_id
+            for row in rows
+            if row.event_title is None and row.event_id not in self._event_summaries
+        }
+        if missing:
+            self._event_summaries.update(await self.event_repo.get_summaries(missing))
+
+        deadline = datetime.now(timezone.utc) - timedelta(
+            seconds=settings.ticket_reservation_timeout
+        )
+        history = []
+        for row in rows:
+            ticket_status = _read_status(row.status, row.created_at, deadline)
+            if row.event_title is not None:
+                history.append(
+                    TicketWithEventResponse(**{**row._mapping, "status": ticket_status})
+                )
+                continue
+            event = self._event_summaries.get(row.event_id)
+            if event is None:
+                continue  # the event is gone; its tickets have nothing to show
+            history.append(
+                TicketWithEventResponse(
+                    id=row.id,
+                    user_id=row.user_id,
+                    event_id=row.event_id,
+                    status=ticket_status,
+                    created_at=row.created_at,
+                    event_title=event.title,
+                    event_start_time=event.start_time,
+                    venue_location=event.venue_location,
+                )
+            )
+        return history
+
+    async def get_event_ticket_stats(
+        self, event_ids: List[UUID]
+    ) -> List[EventTicketStatsResponse]:
+        """Get per-status ticket counts for many events from the rollup table"""
+        rollups = await self.ticket_repo.stats_repo.get_many(event_ids)
+
+        responses = []
+        for event_id in dict.fromkeys(event_ids):
+            stats = rollups.get(event_id)
+            responses.append(
+                EventTicketStatsResponse(
+                    event_id=event_id,
+                    reserved=stats.reserved_count if stats else 0,
+                    paid=stats.paid_count if stats else 0,
+                    expired=stats.expired_count if stats else 0,
+                )
+            )
+        return responses
 
     async def expire_ticket(self, ticket_id: UUID) -> bool:
         """
         Expire a ticket if it's still in RESERVED status.
         Returns True if ticket was expired, False otherwise.
         """
-        ticket = await self.ticket_repo.get_by_id_with_event(ticket_id)
-
-        if not ticket:
-            return False
+        return await self.expire_tickets([ticket_id]) == 1
 
-        # Only expire if still in RESERVED status
-        if ticket.status != TicketStatus.RESERVED:
-            return False
-
-        # Update ticket status to EXPIRED
-        await self.ticket_repo.update_status(ticket_id, TicketStatus.EXPIRED)
-
-        # Decrement tickets_sold counter
-        await self.event_repo.decrement_tickets_sold(ticket.event_id)
-
-        return True
+    async def expire_tickets(self, ticket_ids: List[UUID]) -> int:
+        """
+        Expire every ticket in `ticket_ids` that is still RESERVED: one UPDATE
+        for the statuses and one for the affected events' tickets_sold
+        counters, committed together. Returns the number of tickets expired.
+        """
+        expired = await self.ticket_repo.expire_many(ticket_ids)
+        await self.event_repo.decrement_tickets_sold_many(expired)
+        return sum(expired.values())
 
     def _to_response(self, ticket: Ticket) -> TicketResponse:
         """Convert Ticket model to response schema"""
@@ -133,4 +671,18 @@ class TicketService:
             event_id=ticket.event_id,
             status=ticket.status,
             created_at=ticket.created_at,
+            seat_row_id=ticket.seat_row_id,
+            seat_number=ticket.seat_number,
+            basket_id=ticket.basket_id,
         )
+
+
+def _read_status(
+    ticket_status: TicketStatus, created_at: datetime, deadline: datetime
+) -> TicketStatus:
+    """A ticket's status for readers: reservations created before `deadline` read as expired"""
+    if ticket_status != TicketStatus.RESERVED:
+        return ticket_status
+    if created_at.tzinfo is None:  # SQLite hands back naive datetimes
+        created_at = created_at.replace(tzinfo=timezone.utc)
+    return TicketStatus.EXPIRED if created_at <= deadline else ticket_status
@@ -0,0 +1,366 @@
+import math
+import time
+import uuid
+from abc import ABC, abstractmethod
+from typing import Dict, Optional, Tuple
+from uuid import UUID
+from fastapi import HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.repositories.event import EventRepository
+from app.config import get_settings
+from app.utils.tokens import sign_token, verify_token
+from app.utils.logger import setup_logger
+
+settings = get_settings()
+logger = setup_logger(__name__)
+
+QUEUE_TOKEN = "queue"
+ADMISSION_TOKEN = "admission"
+
+
+class WaitingRoomStore(ABC):
+    """
+    Queue state for waiting rooms. Per event it keeps:
+    - the admission rate (rooms are open while a rate is set)
+    - an id for the current opening of the room, so queue tokens from an
+      earlier opening can't claim their old positions in a new queue
+    - the last position handed out (positions are 1-based and FIFO)
+    - the highest position admitted so far, plus the fraction of a position
+      owed to the next pump run
+    """
+
+    @abstractmethod
+    async def open(self, event_id: UUID, rate_per_second: float) -> None: ...
+
+    @abstractmethod
+    async def close(self, event_id: UUID) -> None: ...
+
+    @abstractmethod
+    async def open_rooms(self) -> Dict[str, float]:
+        """Map of event id -> admission rate for every open room"""
+
+    @abstractmethod
+    async def room_id(self, event_id: UUID) -> Optional[str]:
+        """Id of the room's current opening, None while closed"""
+
+    @abstractmethod
+    async def join(self, event_id: UUID, user_id: UUID) -> Optional[Tuple[int, str]]:
+        """
+        Return the user's queue position, assigning the next one on first
+        join, and the room's opening id; None if the room isn't open
+        """
+
+    @abstractmethod
+    async def admitted_upto(self, event_id: UUID) -> int: ...
+
+    @abstractmethod
+    async def advance(self, event_id: UUID, count: float) -> int:
+        """
+        Admit `count` more positions (never past the last joined one). The
+        fractional part carries over to the next call, so a rate of 0.5/s
+        admits one position every other second; whole positions nobody is
+        waiting for are not banked.
+        """
+
+    async def close_connection(self) -> None:
+        pass
+
+
+class InMemoryWaitingRoomStore(WaitingRoomStore):
+    """Process-local store, used for tests and single-process development"""
+
+    def __init__(self):
+        self.rates: Dict[str, float] = {}
+        self.room_ids: Dict[str, str] = {}
+        self.positions: Dict[str, Dict[str, int]] = {}
+        self.joined: Dict[str, int] = {}
+        self.admitted: Dict[str, int] = {}
+        self.carry: Dict[str, float] = {}
+
+    async def open(self, event_id: UUID, rate_per_second: float) -> None:
+        # Changing the rate of an open room keeps its opening (and queue)
+        self.rates[str(event_id)] = rate_per_second
+        self.room_ids.setdefault(str(event_id), uuid.uuid4().hex)
+
+    async def close(self, event_id: UUID) -> None:
+        key = str(event_id)
+        for state in (
+            self.rates, self.room_ids, self.positions, self.joined, self.admitted, self.carry
+        ):
+            state.pop(key, None)
+
+    async def open_rooms(self) -> Dict[str, float]:
+        return dict(self.rates)
+
+    async def room_id(self, event_id: UUID) -> Optional[str]:
+        return self.room_ids.get(str(event_id))
+
+    async def join(self, event_id: UUID, user_id: UUID) -> Optional[Tuple[int, str]]:
+        key = str(event_id)
+        if key not in self.room_ids:
+            return None
+        positions = self.positions.setdefault(key, {})
+        if str(user_id) not in positions:
+            self.joined[key] = self.joined.get(key, 0) + 1
+            positions[str(user_id)] = self.joined[key]
+        return positions[str(user_id)], self.room_ids[key]
+
+    async def admitted_upto(self, event_id: UUID) -> int:
+        return self.admitted.get(str(event_id), 0)
+
+    async def advance(self, event_id: UUID, count: float) -> int:
+        key = str(event_id)
+        credit = self.carry.get(key, 0.0) + count
+        whole = math.floor(credit + 1e-9)  # 10 x 0.1 is one position, not 0.999...
+        self.carry[key] = max(0.0, credit - whole)
+        admitted = min(self.admitted.get(key, 0) + whole, self.joined.get(key, 0))
+        self.admitted[key] = admitted
+        return admitted
+
+
+class RedisWaitingRoomStore(WaitingRoomStore):
+    """Redis-backed store shared by all API processes and the admission pump"""
+
+    # Admit `count` more positions without passing the number of joined users,
+    # carrying the fractional part over to the next run
+    _ADVANCE_SCRIPT = """
+    local joined = tonumber(redis.call('GET', KEYS[1]) or '0')
+    local admitted = tonumber(redis.call('GET', KEYS[2]) or '0')
+    local credit = tonumber(redis.call('GET', KEYS[3]) or '0') + tonumber(ARGV[1])
+    local whole = math.floor(credit + 1e-9)
+    redis.call('SET', KEYS[3], tostring(math.max(0, credit - whole)))
+    admitted = math.min(admitted + whole, joined)
+    redis.call('SET', KEYS[2], admitted)
+    return admitted
+    """
+
+    # Check-and-assign a user's position in one step, so concurrent joins for
+    # the same user can't hand out a position nobody holds. Rooms opened
+    # without an opening id get one on first join.
+    _JOIN_SCRIPT = """
+    if redis.call('HEXISTS', KEYS[4], ARGV[2]) == 0 then
+        return false
+    end
+    local room = redis.call('GET', KEYS[3])
+    if not room then
+        room = ARGV[3]
+        redis.call('SET', KEYS[3], room)
+    end
+    local position = redis.call('HGET', KEYS[1], ARGV[1])
+    if not position then
+        position = redis.call('INCR', KEYS[2])
+        redis.call('HSET', KEYS[1], ARGV[1], position)
+    end
+    return {tonumber(position), room}
+    """
+
+    def __init__(self, redis_url: str, prefix: str = "waiting_room"):
+        import redis.asyncio as redis
+
+        self.redis = redis.from_url(redis_url, decode_responses=True)
+        self.prefix = prefix
+
+    def _key(self, event_id: UUID, name: str) -> str:
+        return f"{self.prefix}:{event_id}:{name}"
+
+    async def open(self, event_id: UUID, rate_per_second: float) -> None:
+        # Changing the rate of an open room keeps its opening (and queue)
+        await self.redis.set(self._key(event_id, "room"), uuid.uuid4().hex, nx=True)
+        await self.redis.hset(f"{self.prefix}:rooms", str(event_id), rate_per_second)
+
+    async def close(self, event_id: UUID) -> None:
+        await self.redis.hdel(f"{self.prefix}:rooms", str(event_id))
+        await self.redis.delete(
+            self._key(event_id, "room"),
+            self._key(event_id, "positions"),
+            self._key(event_id, "joined"),
+            self._key(event_id, "admitted"),
+            self._key(event_id, "carry"),
+        )
+
+    async def open_rooms(self) -> Dict[str, float]:
+        rooms = await self.redis.hgetall(f"{self.prefix}:rooms")
+        return {event_id: float(rate) for event_id, rate in rooms.items()}
+
+    async def room_id(self, event_id: UUID) -> Optional[str]:
+        return await self.redis.get(self._key(event_id, "room"))
+
+    async def join(self, event_id: UUID, user_id: UUID) -> Optional[Tuple[int, str]]:
+        joined = await self.redis.eval(
+            self._JOIN_SCRIPT,
+            4,
+            self._key(event_id, "positions"),
+            self._key(event_id, "joined"),
+            self._key(event_id, "room"),
+            f"{self.prefix}:rooms",
+            str(user_id),
+            str(event_id),
+            uuid.uuid4().hex,
+        )
+        if not joined:
+            return None
+        position, room = joined
+        return int(position), room
+
+    async def admitted_upto(self, event_id: UUID) -> int:
+        return int(await self.redis.get(self._key(event_id, "admitted")) or 0)
+
+    async def advance(self, event_id: UUID, count: float) -> int:
+        return int(
+            await self.redis.eval(
+                self._ADVANCE_SCRIPT,
+                3,
+                self._key(event_id, "joined"),
+                self._key(event_id, "admitted"),
+                self._key(event_id, "carry"),
+                count,
+            )
+        )
+
+    async def close_connection(self) -> None:
+        await self.redis.aclose()
+
+
+def create_waiting_room_store() -> WaitingRoomStore:
+    """Build a store for the configured backend"""
+    if settings.waiting_room_backend == "memory":
+        return InMemoryWaitingRoomStore()
+    return RedisWaitingRoomStore(settings.redis_url)
+
+
+_store: Optional[WaitingRoomStore] = None
+
+
+def get_waiting_room_store() -> WaitingRoomStore:
+    """Dependency returning the process-wide waiting room store"""
+    global _store
+    if _store is None:
+        _store = create_waiting_room_store()
+    return _store
+
+
+def verify_admission_token(token: Optional[str], event_id: UUID, user_id: UUID) -> bool:
+    """Stateless check that `token` admits `user_id` to reserve for `event_id`"""
+    if not token:
+        return False
+    payload = verify_token(token, settings.waiting_room_secret)
+    return (
+        payload is not None
+        and payload.get("kind") == ADMISSION_TOKEN
+        and payload.get("event_id") == str(event_id)
+        and payload.get("user_id") == str(user_id)
+    )
+
+
+class WaitingRoomService:
+    def __init__(self, store: WaitingRoomStore, db: Optional[AsyncSession] = None):
+        # Queue operations only touch the store; opening/closing also needs the DB
+        self.store = store
+        self.event_repo = EventRepository(db) if db is not None else None
+
+    async def open_room(self, event_id: UUID, rate_per_second: float) -> None:
+        """Gate reservations for an event behind the queue"""
+        await self._set_gated(event_id, True)
+        await self.store.open(event_id, rate_per_second)
+
+    async def close_room(self, event_id: UUID) -> None:
+        """Drop the queue and let reservations through without admission"""
+        await self._set_gated(event_id, False)
+        await self.store.close(event_id)
+
+    async def _set_gated(self, event_id: UUID, enabled: bool) -> None:
+        event = await self.event_repo.get_by_id(event_id)
+        if not event:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Event not found"
+            )
+        event.waiting_room_enabled = enabled
+        await self.event_repo.update_obj(event)
+
+    async def join(self, event_id: UUID, user_id: UUID) -> dict:
+        """
+        Place a user in the queue and hand back a signed queue token. The
+        token is bound to this opening of the room.
+        """
+        joined = await self.store.join(event_id, user_id)
+        if joined is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="No waiting room is open for this event",
+            )
+
+        position, room_id = joined
+        token = sign_token(
+            {
+                "kind": QUEUE_TOKEN,
+                "event_id": str(event_id),
+                "room": room_id,
+                "user_id": str(user_id),
+                "position": position,
+            },
+            settings.waiting_room_secret,
+        )
+        return await self._status(event_id, str(user_id), token, position)
+
+    async def get_status(self, event_id: UUID, queue_token: str) -> dict:
+        """
+        Report a queue token's progress. Once the pump has admitted its position
+        a short-lived admission token is issued for reserving tickets. Tokens
+        from an earlier opening of the room are refused: their positions
+        belong to a queue that no longer exists.
+        """
+        payload = verify_token(queue_token, settings.waiting_room_secret)
+        if (
+            payload is None
+            or payload.get("kind") != QUEUE_TOKEN
+            or payload.get("event_id") != str(event_id)
+        ):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN, detail="Invalid queue token"
+            )
+        if payload.get("room") != await self.store.room_id(event_id):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Queue token is from an earlier opening of this waiting room; please rejoin",
+            )
+        return await self._status(
+            event_id, payload["user_id"], queue_token, payload["position"]
+        )
+
+    async def _status(
+        self, event_id: UUID, user_id: str, queue_token: str, position: int
+    ) -> dict:
+        admitted_upto = await self.store.admitted_upto(event_id)
+        admitted = position <= admitted_upto
+
+        admission_token = None
+        if admitted:
+            admission_token = sign_token(
+                {
+                    "kind": ADMISSION_TOKEN,
+                    "event_id": str(event_id),
+                    "user_id": user_id,
+                    "exp": int(time.time()) + settings.waiting_room_admission_ttl,
+                },
+                settings.waiting_room_secret,
+            )
+
+        return {
+            "event_id": event_id,
+            "queue_token": queue_token,
+            "position": position,
+            "ahead": max(0, position - admitted_upto - 1),
+            "admitted": admitted,
+            "admission_token": admission_token,
+        }
+
+    async def pump(self, interval_seconds: float) -> Dict[str, int]:
+        """
+        Admission pump: release `rate * interval` positions for every open room,
+        fractions carried over between runs so admissions match the rate.
+        Returns the admitted-up-to position per event.
+        """
+        admitted = {}
+        for event_id, rate in (await self.store.open_rooms()).items():
+            admitted[event_id] = await self.store.advance(event_id, rate * interval_seconds)
+        return admitted
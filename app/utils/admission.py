@@ -0,0 +1,269 @@
+import asyncio
+import math
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Route classes - reservations/payments are served before browsing traffic
+READ = "read"
+WRITE = "write"
+
+
+class AdmissionRejected(Exception):
+    """Raised when a request is shed instead of queued for a connection"""
+
+    def __init__(self, route_class: str, retry_after: int):
+        self.route_class = route_class
+        self.retry_after = retry_after
+        super().__init__(f"{route_class} request shed, retry after {retry_after}s")
+
+
+class AdmittedSession(AsyncSession):
+    """
+    AsyncSession that is admitted on first use: `admit` (set per session by
+    AdmissionController.session) runs once before the session's first
+    statement. Requests answered without the database - coalesced readers,
+    cache and catalog hits - never take a slot or a pool connection.
+    """
+
+    admit = None
+
+    async def _admit(self) -> None:
+        if self.admit is not None:
+            await self.admit()
+            self.admit = None
+
+    async def _admit_pending(self) -> None:
+        # Committing or flushing an unused session needs no connection
+        if self.new or self.dirty or self.deleted:
+            await self._admit()
+
+    async def connection(self, *args, **kwargs):
+        await self._admit()
+        return await super().connection(*args, **kwargs)
+
+    async def execute(self, *args, **kwargs):
+        await self._admit()
+        return await super().execute(*args, **kwargs)
+
+    async def scalar(self, *args, **kwargs):
+        await self._admit()
+        return await super().scalar(*args, **kwargs)
+
+    async def scalars(self, *args, **kwargs):
+        await self._admit()
+        return await super().scalars(*args, **kwargs)
+
+    async def stream(self, *args, **kwargs):
+        await self._admit()
+        return await super().stream(*args, **kwargs)
+
+    async def stream_scalars(self, *args, **kwargs):
+        await self._admit()
+        return await super().stream_scalars(*args, **kwargs)
+
+    async def get(self, *args, **kwargs):
+        await self._admit()
+        return await super().get(*args, **kwargs)
+
+    async def get_one(self, *args, **kwargs):
+        await self._admit()
+        return await super().get_one(*args, **kwargs)
+
+    async def refresh(self, *args, **kwargs):
+        await self._admit()
+        return await super().refresh(*args, **kwargs)
+
+    async def merge(self, *args, **kwargs):
+        await self._admit()
+        return await super().merge(*args, **kwargs)
+
+    async def delete(self, *args, **kwargs):
+        await self._admit()
+        return await super().delete(*args, **kwargs)
+
+    async def run_sync(self, *args, **kwargs):
+        await self._admit()
+        return await super().run_sync(*args, **kwargs)
+
+    async def flush(self, *args, **kwargs):
+        await self._admit_pending()
+        return await super().flush(*args, **kwargs)
+
+    async def commit(self):
+        await self._admit_pending()
+        return await super().commit()
+
+
+class AdmissionController:
+    """
+    Concurrency limiter in front of a connection pool.
+
+    Writes may use the whole pool, reads are capped below it so a slice of
+    the pool is always left for reservations. Waiters are released writes
+    first. Requests that cannot get a slot before their queue deadline (or
+    arrive when the queue is full) are rejected straight away rather than
+    piling up inside SQLAlchemy until pool_timeout.
+
+    The read limit adapts to observed pool wait latency (AIMD): it shrinks
+    while checkouts are slow and grows back one slot at a time when they
+    are fast again.
+    """
+
+    def __init__(
+        self,
+        capacity: int,
+        reserved_for_writes: int,
+        read_queue_timeout: float,
+        write_queue_timeout: float,
+        max_queue: int,
+        target_pool_wait: float,
+        min_read_limit: int = 1,
+    ):
+        self.capacity = capacity
+        self.max_read_limit = max(min_read_limit, capacity - reserved_for_writes)
+        self.min_read_limit = min_read_limit
+        self.read_limit = self.max_read_limit
+        self.queue_timeouts = {READ: read_queue_timeout, WRITE: write_queue_timeout}
+        self.max_queue = max_queue
+        self.target_pool_wait = target_pool_wait
+
+        self.in_flight = {READ: 0, WRITE: 0}
+        self._waiters: dict[str, deque] = {READ: deque(), WRITE: deque()}
+
+        # Exponentially weighted moving averages (seconds)
+        self.pool_wait_ewma = 0.0
+        self.hold_time_ewma = 0.0
+        self.shed_count = {READ: 0, WRITE: 0}
+
+    @property
+    def total_in_flight(self) -> int:
+        return self.in_flight[READ] + self.in_flight[WRITE]
+
+    def _has_room(self, route_class: str) -> bool:
+        if route_class == WRITE:
+            return self.total_in_flight < self.capacity
+        # Reads never jump ahead of queued writes
+        return self.total_in_flight < self.read_limit and not self._waiters[WRITE]
+
+    def _retry_after(self, route_class: str) -> int:
+        """Estimate seconds until the queue ahead of a new request drains"""
+        queued = len(self._waiters[WRITE])
+        if route_class == READ:
+            queued += len(self._waiters[READ])
+        hold = self.hold_time_ewma or self.queue_timeouts[route_class]
+        return max(1, math.ceil(hold * (queued + 1) / max(1, self.capacity)))
+
+    def _reject(self, route_class: str) -> AdmissionRejected:
+        self.shed_count[route_class] += 1
+        retry_after = self._retry_after(route_class)
+        logger.warning(
+            f"Shedding {route_class} request: in_flight={self.total_in_flight} "
+            f"read_limit={self.read_limit} pool_wait_ewma={self.pool_wait_ewma:.4f}s"
+        )
+        return AdmissionRejected(route_class, retry_after)
+
+    async def acquire(self, route_class: str) -> None:
+        """Wait for a slot or raise AdmissionRejected once the queue deadline passes"""
+        if not self._waiters[route_class] and self._has_room(route_class):
+            self.in_flight[route_class] += 1
+            return
+
+        if len(self._waiters[route_class]) >= self.max_queue:
+            raise self._reject(route_class)
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters[route_class].append(waiter)
+        try:
+            await asyncio.wait({waiter}, timeout=self.queue_timeouts[route_class])
+        except BaseException:
+            # Caller went away - give back a slot that was already handed over
+            if waiter.done() and not waiter.cancelled():
+                self.release(route_class)
+            else:
+                self._drop_waiter(route_class, waiter)
+            raise
+
+        if not waiter.done():
+            self._drop_waiter(route_class, waiter)
+            raise self._reject(route_class)
+        # Slot was handed over by _wake()
+
+    def _drop_waiter(self, route_class: str, waiter: asyncio.Future) -> None:
+        waiter.cancel()
+        self._waiters[route_class].remove(waiter)
+
+    def release(self, route_class: str, hold_time: float = None) -> None:
+        self.in_flight[route_class] -= 1
+        if hold_time is not None:
+            self.hold_time_ewma = 0.9 * self.hold_time_ewma + 0.1 * hold_time
+        self._wake()
+
+    def _wake(self) -> None:
+        for route_class in (WRITE, READ):
+            waiters = self._waiters[route_class]
+            while waiters and self._has_room(route_class):
+                waiter = waiters.popleft()
+                if not waiter.done():
+                    self.in_flight[route_class] += 1
+                    waiter.set_result(None)
+            if waiters:
+                # Keep priority: don't admit reads while writes are still queued
+                return
+
+    def observe_pool_wait(self, seconds: float) -> None:
+        """Feed a connection checkout latency sample and adapt the read limit"""
+        self.pool_wait_ewma = 0.8 * self.pool_wait_ewma + 0.2 * seconds
+        if self.pool_wait_ewma > self.target_pool_wait:
+            self.read_limit = max(self.min_read_limit, int(self.read_limit * 0.9))
+        elif self.read_limit < self.max_read_limit:
+            self.read_limit += 1
+            self._wake()
+
+    def stats(self) -> dict:
+        return {
+            "in_flight": dict(self.in_flight),
+            "queued": {k: len(v) for k, v in self._waiters.items()},
+            "read_limit": self.read_limit,
+            "pool_wait_ewma_ms": round(self.pool_wait_ewma * 1000, 3),
+            "shed": dict(self.shed_count),
+        }
+
+    @asynccontextmanager
+    async def session(self, session_factory, route_class: str):
+        """
+        Yield a session from `session_factory` that is admitted on first use.
+        Admission waits for a slot, then checks the connection out straight
+        away so pool wait time can be measured; a session that is never used
+        takes neither. Factories not producing AdmittedSession are admitted
+        up front.
+        """
+        admitted_at = None
+
+        async def admit():
+            nonlocal admitted_at
+            await self.acquire(route_class)
+            admitted_at = time.monotonic()
+            try:
+                await AsyncSession.connection(session)
+            except BaseException:
+                self.release(route_class)
+                admitted_at = None
+                raise
+            self.observe_pool_wait(time.monotonic() - admitted_at)
+
+        try:
+            async with session_factory() as session:
+                if isinstance(session, AdmittedSession):
+                    session.admit = admit
+                else:
+                    await admit()
+                yield session
+        finally:
+            # The session has returned its connection by now
+            if admitted_at is not None:
+                self.release(route_class, time.monotonic() - admitted_at)
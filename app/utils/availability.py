@@ -0,0 +1,190 @@
+import asyncio
+import json
+import os
+import time
+from typing import Dict, Optional, Set
+from app.config import get_settings
+from app.utils.logger import setup_logger
+
+settings = get_settings()
+logger = setup_logger(__name__)
+
+# Identifies this process so it can ignore its own messages echoed back by Redis
+_ORIGIN = f"{os.getpid()}-{os.urandom(4).hex()}"
+
+
+class Subscription:
+    """
+    Latest-value slot for one connected client.
+    Only the newest update is kept, so a slow client never builds a backlog.
+    """
+
+    __slots__ = ("event_id", "value", "_ready")
+
+    def __init__(self, event_id: str):
+        self.event_id = event_id
+        self.value: Optional[dict] = None
+        self._ready = asyncio.Event()
+
+    def push(self, value: dict) -> None:
+        self.value = value
+        self._ready.set()
+
+    async def next(self, timeout: float) -> Optional[dict]:
+        """Wait for the next update, returning None if `timeout` passes first"""
+        try:
+            await asyncio.wait_for(self._ready.wait(), timeout)
+        except asyncio.TimeoutError:
+            return None
+        self._ready.clear()
+        return self.value
+
+
+class AvailabilityBroadcaster:
+    """
+    Fans availability updates out to the clients connected to this process.
+
+    One Redis pub/sub subscription per process feeds all local subscribers,
+    and updates are coalesced so each event pushes at most `max_rate`
+    updates per second - intermediate values are dropped, the latest wins.
+    """
+
+    def __init__(self, max_rate: float):
+        self.min_interval = 1.0 / max_rate
+        self._subscribers: Dict[str, Set[Subscription]] = {}
+        self._latest: Dict[str, dict] = {}
+        self._last_sent: Dict[str, float] = {}
+        self._scheduled: Set[str] = set()
+        self._listener: Optional[asyncio.Task] = None
+
+    @property
+    def subscriber_count(self) -> int:
+        return sum(len(subs) for subs in self._subscribers.values())
+
+    def subscribe(self, event_id) -> Subscription:
+        self._ensure_listener()
+        subscription = Subscription(str(event_id))
+        self._subscribers.setdefault(subscription.event_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        subs = self._subscribers.get(subscription.event_id)
+        if subs is not None:
+            subs.discard(subscription)
+            if not subs:
+                del self._subscribers[subscription.event_id]
+                self._latest.pop(subscription.event_id, None)
+                self._last_sent.pop(subscription.event_id, None)
+
+    def publish_local(self, update: dict) -> None:
+        """Deliver an update to local subscribers, coalescing bursts per event"""
+        event_id = update["event_id"]
+        if event_id not in self._subscribers:
+            return
+
+        self._latest[event_id] = update
+        if event_id in self._scheduled:
+            return  # a flush is already pending and will send the latest value
+
+        wait = self._last_sent.get(event_id, 0.0) + self.min_interval - time.monotonic()
+        if wait <= 0:
+            self._flush(event_id)
+        else:
+            self._scheduled.add(event_id)
+            asyncio.get_running_loop().call_later(wait, self._flush, event_id)
+
+    def _flush(self, event_id: str) -> None:
+        self._scheduled.discard(event_id)
+        update = self._latest.pop(event_id, None)
+        if update is None:
+            return
+        self._last_sent[event_id] = time.monotonic()
+        for subscription in self._subscribers.get(event_id, ()):
+            subscription.push(update)
+
+    def _ensure_listener(self) -> None:
+        if settings.availability_backend != "redis":
+            return
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.get_running_loop().create_task(self._listen())
+
+    async def _listen(self) -> None:
+        """Single upstream subscription feeding every local subscriber"""
+        import redis.asyncio as redis
+
+        while self._subscribers:
+            client = redis.from_url(settings.redis_url, decode_responses=True)
+            try:
+                async with client.pubsub() as pubsub:
+                    await pubsub.subscribe(settings.availability_channel)
+                    async for message in pubsub.listen():
+                        if message.get("type") != "message":
+                            continue
+                        update = json.loads(message["data"])
+                        if update.pop("origin", None) != _ORIGIN:
+                            self.publish_local(update)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Availability subscription lost, retrying: {e}")
+                await asyncio.sleep(1.0)
+            finally:
+                await client.aclose()
+
+
+broadcaster = AvailabilityBroadcaster(settings.availability_max_updates_per_second)
+
+
+class _Publisher:
+    """Best-effort Redis publisher; failures never affect the write that triggered them"""
+
+    RETRY_AFTER = 5.0
+
+    def __init__(self):
+        self._client = None
+        self._loop = None
+        self._down_until = 0.0
+
+    def _get_client(self):
+        import redis.asyncio as redis
+
+        # Clients are bound to an event loop (workers run one loop per task)
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._loop is not loop:
+            self._client = redis.from_url(
+                settings.redis_url, socket_connect_timeout=0.25, socket_timeout=0.25
+            )
+            self._loop = loop
+        return self._client
+
+    async def publish(self, update: dict) -> None:
+        if time.monotonic() < self._down_until:
+            return
+        try:
+            await self._get_client().publish(
+                settings.availability_channel,
+                json.dumps({**update, "origin": _ORIGIN}),
+            )
+        except Exception as e:
+            self._down_until = time.monotonic() + self.RETRY_AFTER
+            logger.warning(f"Failed to publish availability update: {e}")
+
+
+_publisher = _Publisher()
+
+
+def availability_payload(event) -> dict:
+    return {
+        "event_id": str(event.id),
+        "tickets_sold": event.tickets_sold,
+        "total_tickets": event.total_tickets,
+        "available_tickets": event.available_tickets,
+    }
+
+
+async def publish_availability(event) -> None:
+    """Announce an event's current availability after a committed change"""
+    update = availability_payload(event)
+    broadcaster.publish_local(update)
+    if settings.availability_backend == "redis":
+        await _publisher.publish(update)
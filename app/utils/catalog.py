@@ -0,0 +1,399 @@
+"""
+Columnar in-process snapshot of upcoming events.
+
+Imported only when the catalog is enabled: it needs NumPy, which the API
+must not load at startup otherwise.
+"""
+import sys
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+import numpy as np
+
+from app.schemas.event import EventRecord
+from app.utils.geo import EARTH_RADIUS_KM
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def to_micros(value: datetime) -> int:
+    """Microseconds since the epoch; naive datetimes (SQLite) are UTC"""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return (value - EPOCH) // timedelta(microseconds=1)
+
+
+def from_micros(value) -> datetime:
+    return EPOCH + timedelta(microseconds=int(value))
+
+
+# (id, title, description, start_time, end_time, total_tickets, tickets_sold,
+#  version, venue_location, venue_address, venue_latitude, venue_longitude)
+CatalogRow = Tuple
+
+
+class StringPool:
+    """Interned strings: each distinct value is kept once and referenced by index"""
+
+    def __init__(self):
+        self.values: List[Optional[str]] = [None]
+        self._index: Dict[Optional[str], int] = {None: 0}
+
+    def intern(self, value: Optional[str]) -> int:
+        index = self._index.get(value)
+        if index is None:
+            index = self._index[value] = len(self.values)
+            self.values.append(value)
+        return index
+
+    def lookup(self, value: str) -> Optional[int]:
+        return self._index.get(value)
+
+    def nbytes(self) -> int:
+        return (
+            sum(sys.getsizeof(value) for value in self.values if value is not None)
+            + sys.getsizeof(self.values)
+            + sys.getsizeof(self._index)
+        )
+
+
+class EventCatalog:
+    """
+    Upcoming events held column by column in NumPy arrays.
+
+    Ids are 16-byte strings, times int64 microseconds, counts int32 and
+    text columns int32 references into a shared StringPool, so a venue used
+    by thousands of events is stored once. Rows are updated in place by id;
+    removed rows are tombstoned and compacted away once they pile up.
+    Lookups by id and the (start_time, id) listing order are sorted index
+    arrays, rebuilt lazily only when ids or start times change.
+    """
+
+    COLUMNS = {
+        "ids": "S16",
+        "start": np.int64,
+        "end": np.int64,
+        "total": np.int32,
+        "sold": np.int32,
+        "version": np.int64,
+        "lat": np.float64,
+        "lon": np.float64,
+        "title": np.int32,
+        "description": np.int32,
+        "venue_location": np.int32,
+        "venue_address": np.int32,
+        "live": np.bool_,
+    }
+
+    def __init__(self, capacity: int = 1024):
+        self.size = 0  # rows in use, tombstones included
+        self.live_count = 0
+        self.strings = StringPool()
+        for name, dtype in self.COLUMNS.items():
+            setattr(self, name, np.zeros(capacity, dtype=dtype))
+        self._id_index: Optional[Tuple[np.ndarray, np.ndarray]] = None
+        self._listing: Optional[Tuple[np.ndarray, np.ndarray]] = None
+
+    # -- writes --------------------------------------------------------
+
+    def _grow(self, needed: int) -> None:
+        capacity = len(self.ids)
+        if needed <= capacity:
+            return
+        while capacity < needed:
+            capacity *= 2
+        for name in self.COLUMNS:
+            column = getattr(self, name)
+            grown = np.zeros(capacity, dtype=column.dtype)
+            grown[: self.size] = column[: self.size]
+            setattr(self, name, grown)
+
+    def _positions(self, keys: np.ndarray) -> np.ndarray:
+        """Row position of each 16-byte id (tombstones included), -1 where it isn't held"""
+        if self._id_index is None:
+            order = np.argsort(self.ids[: self.size], kind="stable")
+            self._id_index = (self.ids[order], order)
+        sorted_ids, order = self._id_index
+        if not len(sorted_ids):
+            return np.full(len(keys), -1, dtype=np.int64)
+        found = np.minimum(np.searchsorted(sorted_ids, keys), len(sorted_ids) - 1)
+        return np.where(sorted_ids[found] == keys, order[found], -1)
+
+    def _index_appended(self, keys: np.ndarray, positions: np.ndarray) -> None:
+        """Merge appended ids into the sorted id index instead of re-sorting it all"""
+        if self._id_index is None:
+            return
+        sorted_ids, order = self._id_index
+        by_key = np.argsort(keys, kind="stable")
+        keys, positions = keys[by_key], positions[by_key]
+        at = np.searchsorted(sorted_ids, keys)
+        self._id_index = (np.insert(sorted_ids, at, keys), np.insert(order, at, positions))
+
+    def _listing_moved(self, positions: np.ndarray) -> None:
+        """Re-place rows whose start time changed (or that are new) in the listing order"""
+        if self._listing is None:
+            return
+        order, _ = self._listing
+        if len(positions) * 8 > len(order):
+            self._listing = None  # cheaper to sort again
+            return
+
+        order = order[~np.isin(order, positions)]
+        starts = self.start[order]
+        moved = positions[np.lexsort((self.ids[positions], self.start[positions]))]
+        at = np.searchsorted(starts, self.start[moved], "left")
+        ends = np.searchsorted(starts, self.start[moved], "right")
+        # Equal start times are ordered by id, like the database listing
+        for i in np.flatnonzero(ends > at).tolist():
+            run = self.ids[order[at[i] : ends[i]]]
+            at[i] += int(np.searchsorted(run, self.ids[moved[i]]))
+        order = np.insert(order, at, moved)
+        self._listing = (order, self.start[order])
+
+    def apply(self, rows: Sequence[CatalogRow], now: datetime) -> int:
+        """
+        Insert or update events from rows shaped like CatalogRow (extra
+        trailing columns are ignored). Events that have ended are removed.
+        Returns how many rows changed the catalog.
+        """
+        latest: Dict[bytes, CatalogRow] = {}
+        for row in rows:
+            key = row[0].bytes
+            held = latest.get(key)
+            if held is None or row[7] >= held[7]:
+                latest[key] = row
+        if not latest:
+            return 0
+
+        rows = list(latest.values())
+        keys = np.array(list(latest), dtype="S16")
+        positions = self._positions(keys)
+        versions = np.fromiter((row[7] for row in rows), np.int64, len(rows))
+        ends = np.fromiter((to_micros(row[4]) for row in rows), np.int64, len(rows))
+        ended = ends <= to_micros(now)
+
+        held = positions >= 0
+        held_live = np.zeros(len(rows), dtype=bool)
+        held_live[held] = self.live[positions[held]]
+
+        # Ended events are tombstoned; unchanged versions are skipped
+        tombstone = positions[held_live & ended]
+        self.live[tombstone] = False
+        self.live_count -= len(tombstone)
+
+        unchanged = np.zeros(len(rows), dtype=bool)
+        unchanged[held_live] = self.version[positions[held_live]] == versions[held_live]
+        write = ~ended & ~unchanged
+        revived = write & held & ~held_live  # tombstoned events back in range
+        new = write & ~held
+
+        new_count = int(new.sum())
+        self._grow(self.size + new_count)
+        targets = positions.copy()
+        targets[new] = np.arange(self.size, self.size + new_count)
+        self.ids[targets[new]] = keys[new]
+        self.size += new_count
+        self.live_count += new_count + int(revived.sum())
+
+        picked = np.flatnonzero(write)
+        if len(picked):
+            at = targets[picked]
+            chosen = [rows[i] for i in picked.tolist()]
+            intern = self.strings.intern
+            starts = np.fromiter((to_micros(row[3]) for row in chosen), np.int64, len(chosen))
+            moved = at[new[picked] | (self.start[at] != starts)]
+
+            self.live[at] = True
+            self.start[at] = starts
+            self.end[at] = ends[picked]
+            self.version[at] = versions[picked]
+            self.total[at] = [row[5] for row in chosen]
+            self.sold[at] = [row[6] for row in chosen]
+            self.title[at] = [intern(row[1]) for row in chosen]
+            self.description[at] = [intern(row[2]) for row in chosen]
+            self.venue_location[at] = [intern(row[8]) for row in chosen]
+            self.venue_address[at] = [intern(row[9]) for row in chosen]
+            self.lat[at] = [row[10] for row in chosen]
+            self.lon[at] = [row[11] for row in chosen]
+            if new_count:
+                self._index_appended(keys[new], targets[new])
+            if len(moved):
+                self._listing_moved(moved)
+
+        self._maybe_compact()
+        return len(tombstone) + len(picked)
+
+    def prune(self, now: datetime) -> int:
+        """Drop events that have ended; returns how many were dropped"""
+        ended = self.live[: self.size] & (self.end[: self.size] <= to_micros(now))
+        count = int(ended.sum())
+        if count:
+            self.live[: self.size][ended] = False
+            self.live_count -= count
+            self._maybe_compact()
+        return count
+
+    def _maybe_compact(self) -> None:
+        """Rewrite the columns without tombstones once they are a quarter of the rows"""
+        dead = self.size - self.live_count
+        if dead < 1024 or dead * 4 < self.size:
+            return
+        keep = np.flatnonzero(self.live[: self.size])
+        for name in self.COLUMNS:
+            column = getattr(self, name)
+            column[: len(keep)] = column[keep]
+        self.size = len(keep)
+        self._id_index = None
+        self._listing = None
+
+    # -- reads ---------------------------------------------------------
+
+    def _event(self, position: int) -> EventRecord:
+        values = self.strings.values
+        return EventRecord(
+            id=uuid.UUID(bytes=self.ids[position].ljust(16, b"\0")),
+            title=values[self.title[position]],
+            description=values[self.description[position]],
+            start_time=from_micros(self.start[position]),
+            end_time=from_micros(self.end[position]),
+            total_tickets=int(self.total[position]),
+            tickets_sold=int(self.sold[position]),
+            version=int(self.version[position]),
+            venue_location=values[self.venue_location[position]],
+            venue_address=values[self.venue_address[position]],
+            venue_latitude=float(self.lat[position]),
+            venue_longitude=float(self.lon[position]),
+        )
+
+    def _position(self, event_id: UUID) -> int:
+        position = int(self._positions(np.array([event_id.bytes], dtype="S16"))[0])
+        return position if position >= 0 and self.live[position] else -1
+
+    def get(self, event_id: UUID) -> Optional[EventRecord]:
+        position = self._position(event_id)
+        return self._event(position) if position >= 0 else None
+
+    def get_version(self, event_id: UUID) -> Optional[int]:
+        position = self._position(event_id)
+        return int(self.version[position]) if position >= 0 else None
+
+    def _listing_order(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Row positions in (start_time, id) order, with their start times"""
+        if self._listing is None:
+            order = np.lexsort((self.ids[: self.size], self.start[: self.size]))
+            self._listing = (order, self.start[: self.size][order])
+        return self._listing
+
+    def _list_positions(
+        self,
+        skip: int,
+        limit: int,
+        now: datetime,
+        start_from: Optional[datetime] = None,
+        start_to: Optional[datetime] = None,
+        upcoming: bool = False,
+        available_only: bool = False,
+        venue_location: Optional[str] = None,
+    ) -> np.ndarray:
+        order, starts = self._listing_order()
+        if upcoming:
+            start_from = max(start_from, now) if start_from else now
+        venue = None
+        if venue_location is not None:
+            venue = self.strings.lookup(venue_location)
+            if venue is None:
+                return order[:0]
+
+        # Start time bounds are a slice of the listing order
+        low = 0 if start_from is None else int(np.searchsorted(starts, to_micros(start_from)))
+        high = len(order) if start_to is None else int(np.searchsorted(starts, to_micros(start_to)))
+
+        # Filter the slice in growing chunks, stopping once the page is full
+        now_us = to_micros(now)
+        wanted = skip + limit
+        matches, found, chunk = [], 0, 4096
+        while low < high and found < wanted:
+            candidates = order[low : min(low + chunk, high)]
+            mask = self.live[candidates] & (self.end[candidates] > now_us)
+            if available_only:
+                mask &= self.total[candidates] > self.sold[candidates]
+            if venue is not None:
+                mask &= self.venue_location[candidates] == venue
+            matches.append(candidates[mask])
+            found += len(matches[-1])
+            low += chunk
+            chunk = min(chunk * 4, 1 << 20)
+        if not matches:
+            return order[:0]
+        return np.concatenate(matches)[skip:wanted]
+
+    def list_events(self, skip: int, limit: int, now: datetime, **filters) -> List[EventRecord]:
+        """Events in (start_time, id) order, filtered like EventRepository.list_events"""
+        positions = self._list_positions(skip, limit, now, **filters)
+        return [self._event(position) for position in positions.tolist()]
+
+    def list_event_versions(
+        self, skip: int, limit: int, now: datetime, **filters
+    ) -> List[Tuple[UUID, int]]:
+        positions = self._list_positions(skip, limit, now, **filters)
+        return [
+            (uuid.UUID(bytes=self.ids[p].ljust(16, b"\0")), int(self.version[p]))
+            for p in positions.tolist()
+        ]
+
+    def near(
+        self,
+        latitude: float,
+        longitude: float,
+        radius_km: float,
+        skip: int,
+        limit: int,
+        now: datetime,
+    ) -> List[Tuple[EventRecord, float]]:
+        """Events within `radius_km` of a point, nearest first, with distances in km"""
+        lat = self.lat[: self.size]
+        # Latitude band first: one degree of latitude is ~111 km everywhere
+        band = np.abs(lat - latitude) <= radius_km / 111.0 + 0.01
+        candidates = np.flatnonzero(
+            band & self.live[: self.size] & (self.end[: self.size] > to_micros(now))
+        )
+
+        lat1, lon1 = np.radians(latitude), np.radians(longitude)
+        lat2 = np.radians(self.lat[candidates])
+        lon2 = np.radians(self.lon[candidates])
+        a = (
+            np.sin((lat2 - lat1) / 2) ** 2
+            + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+        )
+        distances = 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+        within = distances <= radius_km
+        candidates, distances = candidates[within], distances[within]
+        page = np.argsort(distances, kind="stable")[skip : skip + limit]
+        return [
+            (self._event(position), float(distance))
+            for position, distance in zip(candidates[page].tolist(), distances[page].tolist())
+        ]
+
+    def memory_report(self) -> Dict[str, float]:
+        """Bytes held by the columns, interned strings and indexes"""
+        array_bytes = sum(getattr(self, name).nbytes for name in self.COLUMNS)
+        index_bytes = sum(
+            array.nbytes
+            for index in (self._id_index, self._listing)
+            if index is not None
+            for array in index
+        )
+        string_bytes = self.strings.nbytes()
+        total = array_bytes + index_bytes + string_bytes
+        return {
+            "events": self.live_count,
+            "rows": self.size,
+            "array_bytes": array_bytes,
+            "index_bytes": index_bytes,
+            "string_bytes": string_bytes,
+            "total_bytes": total,
+            "bytes_per_event": total / self.live_count if self.live_count else 0.0,
+        }
@@ -0,0 +1,30 @@
+import hashlib
+from typing import Iterable, Optional, Tuple
+from uuid import UUID
+
+
+def event_etag(event_id: UUID, version: int) -> str:
+    """Strong ETag for one event's representation at a given version"""
+    return f'"{event_id.hex}.{version}"'
+
+
+def listing_etag(versions: Iterable[Tuple[UUID, int]]) -> str:
+    """Strong ETag for an ordered page of events from their (id, version) pairs"""
+    digest = hashlib.sha1()
+    for event_id, version in versions:
+        digest.update(f"{event_id.hex}.{version};".encode())
+    return f'"{digest.hexdigest()}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Whether an If-None-Match header matches `etag`. Uses weak comparison,
+    as RFC 9110 requires for If-None-Match, so W/ prefixes are ignored.
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(
+        tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(",")
+    )
@@ -0,0 +1,27 @@
+import math
+import re
+
+EARTH_RADIUS_KM = 6371.0088
+
+
+def point_ewkt(longitude: float, latitude: float, srid: int = 4326) -> str:
+    """EWKT for a point, accepted by geography columns and ST_GeogFromText"""
+    return f"SRID={srid};POINT({longitude} {latitude})"
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Great-circle distance between two points in kilometres"""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlambda = math.radians(lon2 - lon1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+
+def normalize_address(address: str) -> str:
+    """
+    Matching key for a street address: lower case, punctuation dropped and
+    whitespace collapsed, so "12 Marina Rd., Lagos" and "12 marina rd lagos"
+    name the same venue
+    """
+    return " ".join(re.findall(r"\w+", address.lower()))
@@ -0,0 +1,138 @@
+import threading
+from collections import defaultdict
+from typing import Dict, Tuple
+from app.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+_LabelKey = Tuple[Tuple[str, str], ...]
+
+
+class MetricsRegistry:
+    """
+    Minimal in-process counters and gauges, rendered in the Prometheus
+    text format by the /metrics endpoint.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[_LabelKey, float]] = defaultdict(dict)
+        self._gauges: Dict[str, Dict[_LabelKey, float]] = defaultdict(dict)
+
+    @staticmethod
+    def _key(labels: dict) -> _LabelKey:
+        return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+    def inc(self, name: str, amount: float = 1, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            series = self._counters[name]
+            series[key] = series.get(key, 0) + amount
+
+    def set(self, name: str, value: float, **labels) -> None:
+        with self._lock:
+            self._gauges[name][self._key(labels)] = value
+
+    def get(self, name: str, **labels) -> float:
+        key = self._key(labels)
+        with self._lock:
+            if name in self._counters:
+                return self._counters[name].get(key, 0)
+            return self._gauges.get(name, {}).get(key, 0)
+
+    def render(self) -> str:
+        lines = []
+        with self._lock:
+            for kind, metrics in (("counter", self._counters), ("gauge", self._gauges)):
+                for name, series in sorted(metrics.items()):
+                    lines.append(f"# TYPE {name} {kind}")
+                    for key, value in series.items():
+                        lines.append(f"{_series(name, key)} {value}")
+        return "\n".join(lines) + "\n"
+
+
+def _series(name: str, key: _LabelKey) -> str:
+    labels = ",".join(f'{k}="{v}"' for k, v in key)
+    return f"{name}{{{labels}}}" if labels else name
+
+
+class RedisMetrics:
+    """
+    Counters and gauges for processes /metrics doesn't serve (Celery
+    workers), kept in two Redis hashes keyed by series. The API renders
+    them next to its own metrics, so whichever API process is scraped
+    reports what the workers recorded.
+    """
+
+    def __init__(self, redis_url: str, prefix: str = "metrics"):
+        import redis.asyncio as redis
+
+        self.redis = redis.from_url(
+            redis_url,
+            decode_responses=True,
+            socket_connect_timeout=0.25,
+            socket_timeout=0.25,
+        )
+        self.prefix = prefix
+
+    async def inc(self, name: str, amount: float = 1, **labels) -> None:
+        await self.redis.hincrbyfloat(
+            f"{self.prefix}:counter", _series(name, MetricsRegistry._key(labels)), amount
+        )
+
+    async def set(self, name: str, value: float, **labels) -> None:
+        await self.redis.hset(
+            f"{self.prefix}:gauge", _series(name, MetricsRegistry._key(labels)), value
+        )
+
+    async def render(self) -> str:
+        """Shared series in the Prometheus text format; empty if Redis is unreachable"""
+        lines = []
+        try:
+            for kind in ("counter", "gauge"):
+                series = await self.redis.hgetall(f"{self.prefix}:{kind}")
+                names = defaultdict(list)
+                for key, value in series.items():
+                    names[key.split("{", 1)[0]].append(f"{key} {float(value)}")
+                for name in sorted(names):
+                    lines.append(f"# TYPE {name} {kind}")
+                    lines.extend(names[name])
+        except Exception as e:
+            logger.warning(f"Shared metrics unavailable: {str(e)}")
+            return ""
+        return "\n".join(lines) + "\n" if lines else ""
+
+    async def close(self) -> None:
+        await self.redis.aclose()
+
+
+class LocalMetrics:
+    """RedisMetrics' interface over the in-process registry (single process/tests)"""
+
+    def __init__(self, registry: MetricsRegistry):
+        self.registry = registry
+
+    async def inc(self, name: str, amount: float = 1, **labels) -> None:
+        self.registry.inc(name, amount, **labels)
+
+    async def set(self, name: str, value: float, **labels) -> None:
+        self.registry.set(name, value, **labels)
+
+    async def render(self) -> str:
+        return ""  # already part of the registry's own output
+
+    async def close(self) -> None:
+        pass
+
+
+metrics = MetricsRegistry()
+
+
+def create_shared_metrics():
+    """Metrics store shared between workers and the API, per `shared_metrics_backend`"""
+    from app.config import get_settings
+
+    settings = get_settings()
+    if settings.shared_metrics_backend == "redis":
+        return RedisMetrics(settings.redis_url)
+    return LocalMetrics(metrics)
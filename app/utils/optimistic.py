@@ -0,0 +1,53 @@
+import asyncio
+import random
+from typing import Awaitable, Callable, Optional, TypeVar
+from app.config import get_settings
+from app.utils.metrics import metrics
+
+settings = get_settings()
+
+T = TypeVar("T")
+
+
+class VersionConflict(Exception):
+    """A compare-and-swap found the row changed since it was read"""
+
+
+class RetriesExhausted(Exception):
+    """Every attempt of an optimistic operation ran into a conflict"""
+
+
+async def retry_on_conflict(
+    operation: str,
+    attempt: Callable[[], Awaitable[T]],
+    attempts: Optional[int] = None,
+    base_delay: Optional[float] = None,
+    fallback: Optional[Callable[[], Awaitable[T]]] = None,
+) -> T:
+    """
+    Run `attempt()` until it gets through without raising VersionConflict,
+    at most `attempts` times. Each attempt must re-read what it writes.
+    Between attempts it sleeps a random time up to `base_delay` doubled per
+    retry (full jitter), so writers that collided spread out instead of
+    colliding again. Once every attempt has conflicted, `fallback()` is
+    run if given (a write that can't conflict, e.g. a guarded increment),
+    otherwise RetriesExhausted is raised. Conflicts, retries, fallbacks and
+    give-ups are counted per `operation`.
+    """
+    attempts = attempts or settings.optimistic_max_attempts
+    base_delay = settings.optimistic_retry_base_delay if base_delay is None else base_delay
+    for retry in range(attempts):
+        try:
+            return await attempt()
+        except VersionConflict:
+            metrics.inc("optimistic_conflicts_total", operation=operation)
+        if retry + 1 == attempts:
+            break
+        metrics.inc("optimistic_retries_total", operation=operation)
+        await asyncio.sleep(random.uniform(0, base_delay * 2**retry))
+
+    if fallback is not None:
+        metrics.inc("optimistic_fallbacks_total", operation=operation)
+        return await fallback()
+    metrics.inc("optimistic_retries_exhausted_total", operation=operation)
+    raise RetriesExhausted(f"{operation} conflicted {attempts} times")
@@ -0,0 +1,249 @@
+import math
+import time
+from collections import deque
+from typing import Dict, Optional
+from uuid import UUID
+from app.config import get_settings
+from app.utils.logger import setup_logger
+
+settings = get_settings()
+logger = setup_logger(__name__)
+
+
+class RateLimited(Exception):
+    """Raised when a reservation is over a rate limit or hold cap"""
+
+    def __init__(self, reason: str, retry_after: int):
+        self.reason = reason
+        self.retry_after = retry_after
+        super().__init__(reason)
+
+
+class InMemoryReservationLimiter:
+    """
+    In-process sliding-window limiter for reservations.
+
+    Per user and per (user, event) it keeps a log of reservation attempts
+    inside the window, and per (user, event) the set of ticket holds that
+    are still within the reservation timeout.
+    """
+
+    def __init__(
+        self,
+        user_limit: int,
+        user_event_limit: int,
+        window_seconds: float,
+        max_holds: int,
+        hold_seconds: float,
+    ):
+        self.user_limit = user_limit
+        self.user_event_limit = user_event_limit
+        self.window_seconds = window_seconds
+        self.max_holds = max_holds
+        self.hold_seconds = hold_seconds
+        self._windows: Dict[str, deque] = {}
+        self._holds: Dict[str, Dict[str, float]] = {}
+
+    def _sweep(self, now: float) -> None:
+        """Forget users whose windows and holds have all aged out"""
+        for key in [k for k, w in self._windows.items() if not w or w[-1] <= now - self.window_seconds]:
+            del self._windows[key]
+        for key in [k for k, h in self._holds.items() if all(e <= now for e in h.values())]:
+            del self._holds[key]
+
+    def _window(self, key: str, now: float) -> deque:
+        window = self._windows.setdefault(key, deque())
+        while window and window[0] <= now - self.window_seconds:
+            window.popleft()
+        return window
+
+    def _active_holds(self, key: str, now: float) -> Dict[str, float]:
+        holds = self._holds.setdefault(key, {})
+        for ticket_id in [t for t, expires in holds.items() if expires <= now]:
+            del holds[ticket_id]
+        return holds
+
+    async def acquire(self, user_id: UUID, event_id: UUID, ticket_id: UUID) -> None:
+        now = time.monotonic()
+        if len(self._windows) > 100_000:
+            self._sweep(now)
+        user_window = self._window(f"user:{user_id}", now)
+        user_event_window = self._window(f"user_event:{user_id}:{event_id}", now)
+        holds = self._active_holds(f"holds:{user_id}:{event_id}", now)
+
+        for window, limit in (
+            (user_window, self.user_limit),
+            (user_event_window, self.user_event_limit),
+        ):
+            if len(window) >= limit:
+                retry_after = window[0] + self.window_seconds - now
+                raise RateLimited(
+                    "Too many reservation attempts", max(1, math.ceil(retry_after))
+                )
+
+        if len(holds) >= self.max_holds:
+            retry_after = min(holds.values()) - now
+            raise RateLimited(
+                "Too many unpaid reservations for this event",
+                max(1, math.ceil(retry_after)),
+            )
+
+        user_window.append(now)
+        user_event_window.append(now)
+        holds[str(ticket_id)] = now + self.hold_seconds
+
+    async def release_hold(self, user_id: UUID, event_id: UUID, ticket_id: UUID) -> None:
+        self._holds.get(f"holds:{user_id}:{event_id}", {}).pop(str(ticket_id), None)
+
+
+class RedisReservationLimiter:
+    """
+    Redis sliding-window limiter shared across API processes.
+    All checks and the hold registration run in a single Lua script so
+    concurrent reservations can't slip past the caps.
+    """
+
+    # KEYS: user window, user/event window, user/event holds
+    # ARGV: now_ms, window_ms, user_limit, user_event_limit, max_holds, hold_ms, member
+    # Returns 0 when admitted, otherwise {reason, retry_after_ms}
+    _ACQUIRE_SCRIPT = """
+    local now = tonumber(ARGV[1])
+    local window = tonumber(ARGV[2])
+    local limits = {tonumber(ARGV[3]), tonumber(ARGV[4])}
+
+    for i = 1, 2 do
+        redis.call('ZREMRANGEBYSCORE', KEYS[i], 0, now - window)
+        if redis.call('ZCARD', KEYS[i]) >= limits[i] then
+            local oldest = redis.call('ZRANGE', KEYS[i], 0, 0, 'WITHSCORES')
+            return {1, tonumber(oldest[2]) + window - now}
+        end
+    end
+
+    redis.call('ZREMRANGEBYSCORE', KEYS[3], 0, now)
+    if redis.call('ZCARD', KEYS[3]) >= tonumber(ARGV[5]) then
+        local first = redis.call('ZRANGE', KEYS[3], 0, 0, 'WITHSCORES')
+        return {2, tonumber(first[2]) - now}
+    end
+
+    for i = 1, 2 do
+        redis.call('ZADD', KEYS[i], now, ARGV[7])
+        redis.call('PEXPIRE', KEYS[i], window)
+    end
+    redis.call('ZADD', KEYS[3], now + tonumber(ARGV[6]), ARGV[7])
+    redis.call('PEXPIRE', KEYS[3], tonumber(ARGV[6]))
+    return 0
+    """
+
+    _REASONS = {
+        1: "Too many reservation attempts",
+        2: "Too many unpaid reservations for this event",
+    }
+
+    def __init__(
+        self,
+        redis_url: str,
+        user_limit: int,
+        user_event_limit: int,
+        window_seconds: float,
+        max_holds: int,
+        hold_seconds: float,
+        prefix: str = "reservation_limit",
+    ):
+        import redis.asyncio as redis
+
+        # Fail fast so an unreachable Redis doesn't stall reservations
+        self.redis = redis.from_url(
+            redis_url,
+            decode_responses=True,
+            socket_connect_timeout=0.25,
+            socket_timeout=0.25,
+        )
+        self.user_limit = user_limit
+        self.user_event_limit = user_event_limit
+        self.window_ms = int(window_seconds * 1000)
+        self.max_holds = max_holds
+        self.hold_ms = int(hold_seconds * 1000)
+        self.prefix = prefix
+
+    async def acquire(self, user_id: UUID, event_id: UUID, ticket_id: UUID) -> None:
+        result = await self.redis.eval(
+            self._ACQUIRE_SCRIPT,
+            3,
+            f"{self.prefix}:user:{user_id}",
+            f"{self.prefix}:user_event:{user_id}:{event_id}",
+            f"{self.prefix}:holds:{user_id}:{event_id}",
+            int(time.time() * 1000),
+            self.window_ms,
+            self.user_limit,
+            self.user_event_limit,
+            self.max_holds,
+            self.hold_ms,
+            str(ticket_id),
+        )
+        if result != 0:
+            reason, retry_after_ms = result
+            raise RateLimited(
+                self._REASONS[int(reason)], max(1, math.ceil(int(retry_after_ms) / 1000))
+            )
+
+    async def release_hold(self, user_id: UUID, event_id: UUID, ticket_id: UUID) -> None:
+        await self.redis.zrem(f"{self.prefix}:holds:{user_id}:{event_id}", str(ticket_id))
+
+
+class ReservationLimiter:
+    """
+    Reservation limiter that uses Redis when available and falls back to
+    the in-process limiter if Redis can't be reached.
+    """
+
+    # Seconds to stay on the in-process limiter after a Redis failure
+    RETRY_PRIMARY_AFTER = 5.0
+
+    def __init__(self, primary, fallback: InMemoryReservationLimiter):
+        self.primary = primary
+        self.fallback = fallback
+        self._primary_down_until = 0.0
+
+    async def acquire(self, user_id: UUID, event_id: UUID, ticket_id: UUID) -> None:
+        if self.primary is not None and time.monotonic() >= self._primary_down_until:
+            try:
+                return await self.primary.acquire(user_id, event_id, ticket_id)
+            except RateLimited:
+                raise
+            except Exception as e:
+                self._primary_down_until = time.monotonic() + self.RETRY_PRIMARY_AFTER
+                logger.warning(f"Redis rate limiter unavailable, using in-process: {e}")
+        await self.fallback.acquire(user_id, event_id, ticket_id)
+
+    async def release_hold(self, user_id: UUID, event_id: UUID, ticket_id: UUID) -> None:
+        await self.fallback.release_hold(user_id, event_id, ticket_id)
+        if self.primary is not None and time.monotonic() >= self._primary_down_until:
+            try:
+                await self.primary.release_hold(user_id, event_id, ticket_id)
+            except Exception as e:
+                logger.warning(f"Failed to release hold {ticket_id} in Redis: {e}")
+
+
+def create_reservation_limiter() -> ReservationLimiter:
+    options = dict(
+        user_limit=settings.reservation_rate_limit_per_user,
+        user_event_limit=settings.reservation_rate_limit_per_user_event,
+        window_seconds=settings.reservation_rate_window_seconds,
+        max_holds=settings.max_reserved_tickets_per_user_event,
+        hold_seconds=settings.ticket_reservation_timeout,
+    )
+    primary = None
+    if settings.rate_limit_backend == "redis":
+        primary = RedisReservationLimiter(settings.redis_url, **options)
+    return ReservationLimiter(primary, InMemoryReservationLimiter(**options))
+
+
+_limiter: Optional[ReservationLimiter] = None
+
+
+def get_reservation_limiter() -> ReservationLimiter:
+    """Return the process-wide reservation limiter"""
+    global _limiter
+    if _limiter is None:
+        _limiter = create_reservation_limiter()
+    return _limiter
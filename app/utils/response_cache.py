@@ -0,0 +1,541 @@
+import asyncio
+import json
+import os
+import re
+import time
+from collections import OrderedDict
+from http.cookies import SimpleCookie
+from typing import Dict, Iterable, List, NamedTuple, Optional, Pattern, Set, Tuple
+from urllib.parse import parse_qsl, urlencode
+from app.config import get_settings
+from app.utils.etag import etag_matches
+from app.utils.logger import setup_logger
+from app.utils.metrics import metrics
+
+settings = get_settings()
+logger = setup_logger(__name__)
+
+# Identifies this process so it can ignore its own invalidations echoed back by Redis
+_ORIGIN = f"{os.getpid()}-{os.urandom(4).hex()}"
+
+# Tag carried by every cached listing; new events invalidate all of them
+EVENTS_TAG = "events"
+
+
+def event_tag(event_id) -> str:
+    return f"event:{event_id}"
+
+
+def cache_key(path: str, query_string: bytes) -> str:
+    """Normalized key: the path plus its query parameters in sorted order"""
+    params = sorted(parse_qsl(query_string.decode("latin-1"), keep_blank_values=True))
+    return f"{path}?{urlencode(params)}" if params else path
+
+
+class CachedResponse(NamedTuple):
+    status: int
+    headers: List[Tuple[str, str]]
+    body: bytes
+    tags: Tuple[str, ...]
+    stored_at: float  # wall clock, so ages agree across processes
+
+    def dumps(self) -> bytes:
+        meta = {
+            "status": self.status,
+            "headers": self.headers,
+            "tags": self.tags,
+            "stored_at": self.stored_at,
+        }
+        return json.dumps(meta).encode() + b"\n" + self.body
+
+    @classmethod
+    def loads(cls, data: bytes) -> "CachedResponse":
+        meta, body = data.split(b"\n", 1)
+        meta = json.loads(meta)
+        return cls(
+            meta["status"],
+            [tuple(header) for header in meta["headers"]],
+            body,
+            tuple(meta["tags"]),
+            meta["stored_at"],
+        )
+
+
+class _RedisTier:
+    """Best-effort shared tier; while Redis is down the cache runs in-process only"""
+
+    RETRY_AFTER = 5.0
+
+    def __init__(self, prefix: str = "response_cache"):
+        self.prefix = prefix
+        self._client = None
+        self._loop = None
+        self._down_until = 0.0
+
+    def _get_client(self):
+        import redis.asyncio as redis
+
+        # Clients are bound to an event loop (workers run one loop per task)
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._loop is not loop:
+            self._client = redis.from_url(
+                settings.redis_url, socket_connect_timeout=0.25, socket_timeout=0.25
+            )
+            self._loop = loop
+        return self._client
+
+    def _available(self) -> bool:
+        return time.monotonic() >= self._down_until
+
+    def _failed(self, action: str, e: Exception) -> None:
+        self._down_until = time.monotonic() + self.RETRY_AFTER
+        logger.warning(f"Response cache Redis {action} failed: {e}")
+
+    async def get(self, key: str) -> Optional[CachedResponse]:
+        if not self._available():
+            return None
+        try:
+            data = await self._get_client().get(f"{self.prefix}:{key}")
+        except Exception as e:
+            self._failed("get", e)
+            return None
+        return CachedResponse.loads(data) if data else None
+
+    async def set(self, key: str, entry: CachedResponse, ttl: float) -> None:
+        if not self._available():
+            return
+        ttl_ms = max(1, int(ttl * 1000))
+        try:
+            async with self._get_client().pipeline(transaction=False) as pipe:
+                pipe.set(f"{self.prefix}:{key}", entry.dumps(), px=ttl_ms)
+                for tag in entry.tags:
+                    tag_key = f"{self.prefix}:tag:{tag}"
+                    pipe.sadd(tag_key, f"{self.prefix}:{key}")
+                    pipe.pexpire(tag_key, ttl_ms)
+                await pipe.execute()
+        except Exception as e:
+            self._failed("set", e)
+
+    async def invalidate(self, tags: List[str]) -> None:
+        """Drop the shared entries carrying `tags` and tell other processes to do the same"""
+        if not self._available():
+            return
+        client = self._get_client()
+        tag_keys = [f"{self.prefix}:tag:{tag}" for tag in tags]
+        try:
+            # Two round trips however many tags: read every tag's keys, then
+            # drop them all and publish
+            async with client.pipeline(transaction=False) as pipe:
+                for tag_key in tag_keys:
+                    pipe.smembers(tag_key)
+                members = await pipe.execute()
+            async with client.pipeline(transaction=False) as pipe:
+                pipe.delete(*tag_keys, *set().union(*members))
+                pipe.publish(
+                    settings.response_cache_channel,
+                    json.dumps({"tags": tags, "origin": _ORIGIN}),
+                )
+                await pipe.execute()
+        except Exception as e:
+            self._failed("invalidate", e)
+
+
+class ResponseCache:
+    """
+    Cache of rendered GET responses shared by all callers.
+
+    Entries are fresh for `fresh_seconds`, then served stale for up to
+    `stale_seconds` more while a single background request refreshes them.
+    Each entry carries tags (the events it shows) so writes can drop every
+    response that includes an event. The in-process LRU tier can be backed
+    by Redis, which shares entries and invalidations between processes.
+
+    Ticket count changes are frequent during an on-sale, so they are
+    batched: their tags are invalidated together at most once per
+    `count_invalidate_seconds`, by a flush scheduled when the first of them
+    is queued. Counts in a cached response are never older than that or
+    `fresh_seconds`, whichever is longer.
+    """
+
+    # Tags whose last invalidation is remembered, per cache entry
+    INVALIDATIONS_PER_ENTRY = 4
+
+    def __init__(
+        self,
+        fresh_seconds: float,
+        stale_seconds: float,
+        max_entries: int = 2048,
+        backend: str = "memory",
+        count_invalidate_seconds: float = 0.0,
+    ):
+        self.fresh_seconds = fresh_seconds
+        self.stale_seconds = stale_seconds
+        self.max_entries = max_entries
+        self.count_invalidate_seconds = count_invalidate_seconds
+        self.shared = _RedisTier() if backend == "redis" else None
+        self._entries: "OrderedDict[str, CachedResponse]" = OrderedDict()
+        self._tags: Dict[str, Set[str]] = {}
+        self._listener: Optional[asyncio.Task] = None
+        # Every invalidation seen here takes the next sequence number, and
+        # each tag remembers its latest: a response rendered across an
+        # invalidation of one of its tags may predate the write and is not
+        # stored. Responses sharing no tag with it are unaffected.
+        self._sequence = 0
+        self._invalidated: "OrderedDict[str, int]" = OrderedDict()
+        self._forgotten = 0  # newest sequence number no longer tracked per tag
+        self._pending_counts: Set[str] = set()
+        self._counts_flushed_at = 0.0
+        self._count_flush: Optional[asyncio.Task] = None
+
+    @property
+    def generation(self) -> int:
+        """Position in the invalidation sequence, to pass back to set()"""
+        return self._sequence
+
+    def is_fresh(self, entry: CachedResponse) -> bool:
+        return time.time() - entry.stored_at < self.fresh_seconds
+
+    def _usable(self, entry: CachedResponse) -> bool:
+        return time.time() - entry.stored_at < self.fresh_seconds + self.stale_seconds
+
+    async def get(self, key: str) -> Optional[CachedResponse]:
+        """A fresh or stale entry for `key`, from this process or the shared tier"""
+        entry = self._entries.get(key)
+        if entry is not None and self._usable(entry):
+            self._entries.move_to_end(key)
+            return entry
+        if entry is not None:
+            self._drop(key)
+
+        if self.shared is not None:
+            entry = await self.shared.get(key)
+            if entry is not None and self._usable(entry):
+                self._store_local(key, entry)
+                return entry
+        return None
+
+    async def set(
+        self, key: str, entry: CachedResponse, generation: Optional[int] = None
+    ) -> None:
+        """Store `entry`, unless one of its tags was invalidated since `generation`"""
+        if generation is not None and self._invalidated_since(entry.tags, generation):
+            return
+        self._store_local(key, entry)
+        if self.shared is not None:
+            await self.shared.set(key, entry, self.fresh_seconds + self.stale_seconds)
+
+    async def invalidate(self, tags: Iterable[str]) -> None:
+        """Drop every cached response carrying any of `tags`, in all processes"""
+        tags = list(tags)
+        if not tags:
+            return
+        self.invalidate_local(tags)
+        if self.shared is not None:
+            await self.shared.invalidate(tags)
+
+    async def invalidate_counts(self, tags: Iterable[str]) -> None:
+        """
+        Invalidate `tags` for a ticket count change, batched with other count
+        changes: the batch goes out now if the last one went out at least
+        `count_invalidate_seconds` ago, otherwise a flush is scheduled for
+        when that interval is up and later changes ride along with it.
+        """
+        self._pending_counts.update(tags)
+        if self._count_flush is not None:
+            return
+        wait = self._counts_flushed_at + self.count_invalidate_seconds - time.monotonic()
+        if wait <= 0:
+            await self.flush_counts()
+        else:
+            self._count_flush = asyncio.get_running_loop().create_task(
+                self._flush_counts_later(wait)
+            )
+
+    async def _flush_counts_later(self, delay: float) -> None:
+        try:
+            await asyncio.sleep(delay)
+        finally:
+            # Also runs when the event loop shuts down and cancels this task;
+            # a flush_counts() call in between has already sent the batch
+            if self._count_flush is asyncio.current_task():
+                self._count_flush = None
+                await self.flush_counts()
+
+    async def flush_counts(self) -> None:
+        """Invalidate every count change batched so far (e.g. on shutdown)"""
+        if self._count_flush is not None:
+            self._count_flush.cancel()
+            self._count_flush = None
+        tags, self._pending_counts = self._pending_counts, set()
+        self._counts_flushed_at = time.monotonic()
+        await self.invalidate(tags)
+
+    def invalidate_local(self, tags: Iterable[str]) -> None:
+        self._sequence += 1
+        for tag in tags:
+            self._invalidated[tag] = self._sequence
+            self._invalidated.move_to_end(tag)
+            for key in self._tags.pop(tag, ()):
+                self._drop(key)
+        while len(self._invalidated) > self.max_entries * self.INVALIDATIONS_PER_ENTRY:
+            _, sequence = self._invalidated.popitem(last=False)
+            self._forgotten = max(self._forgotten, sequence)
+
+    def _invalidated_since(self, tags: Iterable[str], generation: int) -> bool:
+        if generation < self._forgotten:
+            return True  # can't tell any more; don't store
+        return any(self._invalidated.get(tag, 0) > generation for tag in tags)
+
+    def clear(self) -> None:
+        self._sequence += 1
+        self._forgotten = self._sequence
+        self._invalidated.clear()
+        self._entries.clear()
+        self._tags.clear()
+
+    def _store_local(self, key: str, entry: CachedResponse) -> None:
+        self._drop(key)
+        self._entries[key] = entry
+        for tag in entry.tags:
+            self._tags.setdefault(tag, set()).add(key)
+        while len(self._entries) > self.max_entries:
+            self._drop(next(iter(self._entries)))
+
+    def _drop(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for tag in entry.tags:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+    def ensure_listener(self) -> None:
+        """Start following other processes' invalidations (Redis backend only)"""
+        if self.shared is None:
+            return
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.get_running_loop().create_task(self._listen())
+
+    async def _listen(self) -> None:
+        import redis.asyncio as redis
+
+        while True:
+            client = redis.from_url(settings.redis_url, decode_responses=True)
+            try:
+                async with client.pubsub() as pubsub:
+                    await pubsub.subscribe(settings.response_cache_channel)
+                    async for message in pubsub.listen():
+                        if message.get("type") != "message":
+                            continue
+                        data = json.loads(message["data"])
+                        if data.get("origin") != _ORIGIN:
+                            self.invalidate_local(data["tags"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Response cache invalidation feed lost, retrying: {e}")
+                # Entries may have missed invalidations while disconnected
+                self.clear()
+                await asyncio.sleep(1.0)
+            finally:
+                await client.aclose()
+
+
+response_cache = ResponseCache(
+    fresh_seconds=settings.response_cache_fresh_seconds,
+    stale_seconds=settings.response_cache_stale_seconds,
+    max_entries=settings.response_cache_max_entries,
+    backend=settings.response_cache_backend,
+    count_invalidate_seconds=settings.response_cache_count_invalidate_seconds,
+)
+
+
+async def invalidate_events(event_ids: Iterable) -> None:
+    """Drop cached responses showing any of these events (e.g. they were edited)"""
+    await response_cache.invalidate(event_tag(event_id) for event_id in event_ids)
+
+
+async def invalidate_event_counts(event_ids: Iterable) -> None:
+    """Drop cached responses showing these events' ticket counts, batched (see ResponseCache)"""
+    await response_cache.invalidate_counts(event_tag(event_id) for event_id in event_ids)
+
+
+def _response_tags(body: bytes) -> Tuple[str, ...]:
+    """Tags for a listing response: the collection plus every event in it"""
+    tags = {EVENTS_TAG}
+    try:
+        items = json.loads(body)
+    except ValueError:
+        return tuple(tags)
+    if isinstance(items, list):
+        tags.update(
+            event_tag(item["id"]) for item in items if isinstance(item, dict) and "id" in item
+        )
+    return tuple(sorted(tags))
+
+
+class ResponseCacheMiddleware:
+    """
+    ASGI middleware serving selected GET routes from a ResponseCache.
+
+    Only successful responses are stored. Requests carrying `bypass_cookie`
+    (clients inside their read-your-writes window) skip the cache so they
+    see their own writes.
+    """
+
+    # Response headers that are stored with the body and replayed on hits
+    STORED_HEADERS = {"content-type", "etag", "vary"}
+
+    def __init__(
+        self,
+        app,
+        paths: List[str],
+        bypass_cookie: Optional[str] = None,
+        cache: Optional[ResponseCache] = None,
+    ):
+        self.app = app
+        self.paths: List[Pattern] = [re.compile(path) for path in paths]
+        self.bypass_cookie = bypass_cookie
+        self.cache = cache or response_cache
+        self._refreshing: Dict[str, asyncio.Task] = {}
+
+    def _cacheable(self, scope) -> bool:
+        if scope["type"] != "http" or scope["method"] != "GET":
+            return False
+        if not settings.response_cache_enabled:
+            return False
+        if not any(path.fullmatch(scope["path"]) for path in self.paths):
+            return False
+        cookie = _header(scope, b"cookie")
+        if self.bypass_cookie and cookie and self.bypass_cookie in SimpleCookie(cookie):
+            return False
+        return True
+
+    async def __call__(self, scope, receive, send):
+        if not self._cacheable(scope):
+            await self.app(scope, receive, send)
+            return
+
+        self.cache.ensure_listener()
+        key = cache_key(scope["path"], scope.get("query_string", b""))
+        entry = await self.cache.get(key)
+        if entry is not None:
+            if self.cache.is_fresh(entry):
+                metrics.inc("response_cache_requests_total", result="hit")
+                await self._send_cached(entry, scope, send, "HIT")
+            else:
+                metrics.inc("response_cache_requests_total", result="stale")
+                self._schedule_refresh(key, scope)
+                await self._send_cached(entry, scope, send, "STALE")
+            return
+
+        metrics.inc("response_cache_requests_total", result="miss")
+        generation = self.cache.generation
+        entry = await self._fetch(scope, receive, send)
+        if entry is not None:
+            await self.cache.set(key, entry, generation)
+
+    async def _fetch(self, scope, receive, send) -> Optional[CachedResponse]:
+        """Run the request through the app, passing it on unless `send` is None"""
+        started = {}
+        body = []
+
+        async def capture(message):
+            if message["type"] == "http.response.start":
+                started.update(message)
+                if send is not None and message["status"] != 200:
+                    await send(message)
+            elif message["type"] == "http.response.body":
+                body.append(message.get("body", b""))
+                if send is not None and started["status"] != 200:
+                    await send(message)
+
+        await self.app(scope, receive, capture)
+        if started.get("status") != 200:
+            return None
+
+        headers = [
+            (name.decode("latin-1"), value.decode("latin-1"))
+            for name, value in started.get("headers", [])
+        ]
+        content = b"".join(body)
+        entry = None
+        if not any(name.lower() == "set-cookie" for name, _ in headers):
+            entry = CachedResponse(
+                200,
+                [(n, v) for n, v in headers if n.lower() in self.STORED_HEADERS],
+                content,
+                _response_tags(content),
+                time.time(),
+            )
+
+        if send is not None:
+            await send(
+                {
+                    "type": "http.response.start",
+                    "status": 200,
+                    "headers": started.get("headers", [])
+                    + [(b"x-cache", b"MISS")],
+                }
+            )
+            await send({"type": "http.response.body", "body": content})
+        return entry
+
+    def _schedule_refresh(self, key: str, scope) -> None:
+        """Refresh a stale entry in the background, once per key at a time"""
+        if key in self._refreshing:
+            return
+        task = asyncio.get_running_loop().create_task(self._refresh(key, scope))
+        self._refreshing[key] = task
+        task.add_done_callback(lambda _: self._refreshing.pop(key, None))
+
+    async def _refresh(self, key: str, scope) -> None:
+        # A plain unconditional request, detached from the caller's
+        refresh_scope = dict(scope)
+        refresh_scope["headers"] = [
+            (name, value)
+            for name, value in scope["headers"]
+            if name not in (b"if-none-match", b"cookie")
+        ]
+
+        async def receive():
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        try:
+            generation = self.cache.generation
+            entry = await self._fetch(refresh_scope, receive, None)
+            if entry is not None:
+                await self.cache.set(key, entry, generation)
+        except Exception as e:
+            logger.warning(f"Response cache refresh of {key} failed: {e}")
+
+    async def _send_cached(self, entry: CachedResponse, scope, send, state: str) -> None:
+        age = max(0, int(time.time() - entry.stored_at))
+        headers = [(n.encode("latin-1"), v.encode("latin-1")) for n, v in entry.headers]
+        headers += [(b"age", str(age).encode()), (b"x-cache", state.encode())]
+
+        etag = next((v for n, v in entry.headers if n.lower() == "etag"), None)
+        if etag and etag_matches(_header(scope, b"if-none-match"), etag):
+            await send(
+                {
+                    "type": "http.response.start",
+                    "status": 304,
+                    "headers": [h for h in headers if h[0] != b"content-type"],
+                }
+            )
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        headers.append((b"content-length", str(len(entry.body)).encode()))
+        await send({"type": "http.response.start", "status": entry.status, "headers": headers})
+        await send({"type": "http.response.body", "body": entry.body})
+
+
+def _header(scope, name: bytes) -> Optional[str]:
+    for key, value in scope.get("headers", []):
+        if key == name:
+            return value.decode("latin-1")
+    return None
@@ -0,0 +1,120 @@
+import re
+from bisect import bisect_left, insort
+from typing import Dict, Iterable, List, Optional, Tuple
+from uuid import UUID
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+# Query terms beyond this are ignored
+MAX_QUERY_TERMS = 8
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Lowercased word tokens of `text`"""
+    return _TOKEN_RE.findall(text.lower()) if text else []
+
+
+def query_terms(query: str) -> List[str]:
+    """Distinct search terms of a user query, in order"""
+    return list(dict.fromkeys(tokenize(query)))[:MAX_QUERY_TERMS]
+
+
+def prefix_tsquery(terms: List[str]) -> str:
+    """to_tsquery text matching documents with every term as a prefix"""
+    # Terms are \\w+ tokens, so they can't carry tsquery operators
+    return " & ".join(f"{term}:*" for term in terms)
+
+
+class InvertedIndex:
+    """
+    In-process inverted index used for event search on SQLite.
+
+    Maps tokens to the documents containing them with a per-document
+    weight, and keeps the vocabulary sorted so a prefix lookup is a binary
+    search plus a scan of the matching tokens. Documents are added, replaced
+    and removed one at a time as events are written.
+    """
+
+    # Relative weight of each indexed field
+    FIELD_WEIGHTS = {"title": 1.0, "description": 0.4}
+    # Matching a term as a prefix of a longer token scores less than a whole word
+    PREFIX_FACTOR = 0.5
+
+    def __init__(self):
+        self._postings: Dict[str, Dict[UUID, float]] = {}
+        self._documents: Dict[UUID, Dict[str, float]] = {}
+        self._vocabulary: List[str] = []
+        self.ready = False
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def add(self, doc_id: UUID, **fields: Optional[str]) -> None:
+        """Index a document, replacing any previous version of it"""
+        self.remove(doc_id)
+
+        weights: Dict[str, float] = {}
+        for field, text in fields.items():
+            weight = self.FIELD_WEIGHTS.get(field, 1.0)
+            for token in tokenize(text):
+                weights[token] = weights.get(token, 0.0) + weight
+
+        self._documents[doc_id] = weights
+        for token, weight in weights.items():
+            postings = self._postings.get(token)
+            if postings is None:
+                postings = self._postings[token] = {}
+                insort(self._vocabulary, token)
+            postings[doc_id] = weight
+
+    def remove(self, doc_id: UUID) -> None:
+        for token in self._documents.pop(doc_id, {}):
+            postings = self._postings[token]
+            del postings[doc_id]
+            if not postings:
+                del self._postings[token]
+                del self._vocabulary[bisect_left(self._vocabulary, token)]
+
+    def rebuild(self, documents: Iterable[Tuple[UUID, Dict[str, Optional[str]]]]) -> None:
+        """Replace the whole index with `documents` of (doc_id, fields)"""
+        self._postings.clear()
+        self._documents.clear()
+        self._vocabulary.clear()
+        for doc_id, fields in documents:
+            self.add(doc_id, **fields)
+        self.ready = True
+
+    def _term_scores(self, term: str) -> Dict[UUID, float]:
+        """Best score per document for one term, whole word or prefix"""
+        scores: Dict[UUID, float] = {}
+        start = bisect_left(self._vocabulary, term)
+        for token in self._vocabulary[start:]:
+            if not token.startswith(term):
+                break
+            factor = 1.0 if token == term else self.PREFIX_FACTOR
+            for doc_id, weight in self._postings[token].items():
+                score = weight * factor
+                if score > scores.get(doc_id, 0.0):
+                    scores[doc_id] = score
+        return scores
+
+    def search(self, terms: List[str]) -> List[Tuple[UUID, float]]:
+        """Documents matching every term (as a word or prefix), best first"""
+        if not terms:
+            return []
+
+        per_term = sorted((self._term_scores(term) for term in terms), key=len)
+        results = dict(per_term[0])
+        for scores in per_term[1:]:
+            results = {
+                doc_id: total + scores[doc_id]
+                for doc_id, total in results.items()
+                if doc_id in scores
+            }
+            if not results:
+                return []
+
+        return sorted(results.items(), key=lambda item: (-item[1], str(item[0])))
+
+
+event_search_index = InvertedIndex()
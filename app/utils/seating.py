@@ -0,0 +1,239 @@
+import asyncio
+import time
+from bisect import bisect_right
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+from uuid import UUID
+from app.config import get_settings
+
+settings = get_settings()
+
+
+def bits_from_bytes(data: Optional[bytes]) -> int:
+    """Decode a persisted row bitset (bit i set = seat i + 1 taken)"""
+    return int.from_bytes(data or b"", "little")
+
+
+def bits_to_bytes(bits: int, seat_count: int) -> bytes:
+    """Encode a row bitset in the fixed width used for `seat_count` seats"""
+    return bits.to_bytes((seat_count + 7) // 8, "little")
+
+
+def seat_mask(first_seat: int, quantity: int) -> int:
+    """Bits of `quantity` adjacent seats starting at 1-based `first_seat`"""
+    return ((1 << quantity) - 1) << (first_seat - 1)
+
+
+class SeatRowLayout(NamedTuple):
+    row_id: UUID
+    section: str
+    label: str
+    seat_count: int
+
+
+class SeatBlock(NamedTuple):
+    """Adjacent seats claimed in one row"""
+
+    row_id: UUID
+    section: str
+    label: str
+    first_seat: int
+    quantity: int
+    mask: int  # bits in the whole-venue bitmap
+
+    @property
+    def seat_numbers(self) -> List[int]:
+        return list(range(self.first_seat, self.first_seat + self.quantity))
+
+    @property
+    def row_mask(self) -> int:
+        return seat_mask(self.first_seat, self.quantity)
+
+
+class SeatBitmap:
+    """
+    Free-seat bitset for a whole venue, used to find adjacent seats.
+
+    Rows are packed into one integer in preference order, each followed by
+    a gap bit that is never free, so a run of free bits can't span rows.
+    Finding N adjacent seats is a handful of shift/AND operations over the
+    whole bitmap (CPython runs them word by word) rather than a row scan:
+    after them, bit i is set only if seats i..i+N-1 are all free, and the
+    lowest set bit is the best row that can fit the block.
+
+    Claims are marked in memory synchronously, so concurrent requests in one
+    process never get the same seats; they stay pending until confirmed
+    against the database or released.
+    """
+
+    def __init__(self, rows: Sequence[SeatRowLayout]):
+        self.rows = list(rows)
+        self._offsets: List[int] = []
+        self._index: Dict[UUID, int] = {}
+        self._section_masks: Dict[str, int] = {}
+
+        offset = 0
+        for i, row in enumerate(self.rows):
+            self._offsets.append(offset)
+            self._index[row.row_id] = i
+            row_bits = ((1 << row.seat_count) - 1) << offset
+            self._section_masks[row.section] = (
+                self._section_masks.get(row.section, 0) | row_bits
+            )
+            offset += row.seat_count + 1
+
+        self.free = 0
+        self.pending = 0
+
+    @property
+    def available(self) -> int:
+        return self.free.bit_count()
+
+    @property
+    def sections(self) -> List[str]:
+        return list(self._section_masks)
+
+    def _row_bits(self, i: int) -> Tuple[int, int]:
+        offset = self._offsets[i]
+        return offset, ((1 << self.rows[i].seat_count) - 1) << offset
+
+    def load_row(self, row_id: UUID, taken: int) -> None:
+        """Replace a row's state with its persisted bitset, keeping pending claims"""
+        i = self._index.get(row_id)
+        if i is None:
+            return
+        offset, row_bits = self._row_bits(i)
+        free = (~(taken << offset) & row_bits) & ~self.pending
+        self.free = (self.free & ~row_bits) | free
+
+    def find(self, quantity: int, section: Optional[str] = None) -> Optional[Tuple[int, int]]:
+        """
+        Find the best block of `quantity` adjacent free seats: the first row in
+        preference order that fits it, as close to that row's centre as
+        possible. Returns (row index, 0-based first seat) or None.
+        """
+        runs = self.free
+        if section is not None:
+            runs &= self._section_masks.get(section, 0)
+
+        # Doubling: after each step bit i covers seats i..i+length-1
+        length = 1
+        while length < quantity and runs:
+            step = min(length, quantity - length)
+            runs &= runs >> step
+            length += step
+        if not runs:
+            return None
+
+        lowest = (runs & -runs).bit_length() - 1
+        i = bisect_right(self._offsets, lowest) - 1
+        offset = self._offsets[i]
+        seat_count = self.rows[i].seat_count
+        starts = (runs >> offset) & ((1 << (seat_count - quantity + 1)) - 1)
+
+        centre = (seat_count - quantity) // 2
+        best = None
+        right = starts >> centre
+        if right:
+            best = centre + (right & -right).bit_length() - 1
+        left = starts & ((1 << centre) - 1)
+        if left:
+            candidate = left.bit_length() - 1
+            if best is None or centre - candidate < best - centre:
+                best = candidate
+        return i, best
+
+    def claim(self, quantity: int, section: Optional[str] = None) -> Optional[SeatBlock]:
+        """Find and reserve the best block in memory, pending confirmation"""
+        found = self.find(quantity, section)
+        if found is None:
+            return None
+        i, start = found
+        row = self.rows[i]
+        mask = ((1 << quantity) - 1) << (self._offsets[i] + start)
+        self.free &= ~mask
+        self.pending |= mask
+        return SeatBlock(row.row_id, row.section, row.label, start + 1, quantity, mask)
+
+    def confirm(self, block: SeatBlock) -> None:
+        """The claim is persisted; its seats stay taken"""
+        self.pending &= ~block.mask
+
+    def release(self, block: SeatBlock) -> None:
+        """Give back a claim that could not be persisted"""
+        self.pending &= ~block.mask
+        self.free |= block.mask
+
+    def free_seats(self, row_id: UUID, seat_numbers: Sequence[int]) -> None:
+        """Mark seats released elsewhere (e.g. an expired reservation) as free"""
+        i = self._index.get(row_id)
+        if i is None:
+            return
+        offset = self._offsets[i]
+        for seat_number in seat_numbers:
+            self.free |= (1 << (offset + seat_number - 1)) & ~self.pending
+
+
+# Loads (row_id, section, label, seat_count, taken bytes) for an event in preference order
+SeatRowLoader = Callable[[UUID], Awaitable[Sequence[Tuple[UUID, str, str, int, bytes]]]]
+
+
+class SeatMapCache:
+    """
+    Per-process cache of event seat bitmaps.
+
+    Bitmaps are reloaded from the persisted row bitsets once they are older
+    than `ttl_seconds`, which picks up seats released by other processes;
+    seats taken elsewhere are caught when a claim is checked against the
+    database. Least recently used events are evicted beyond `max_events`.
+    """
+
+    def __init__(self, ttl_seconds: float, max_events: int = 256):
+        self.ttl_seconds = ttl_seconds
+        self.max_events = max_events
+        self._entries: "OrderedDict[UUID, Tuple[SeatBitmap, float]]" = OrderedDict()
+        self._locks: Dict[UUID, asyncio.Lock] = {}
+
+    async def get(self, event_id: UUID, loader: SeatRowLoader) -> Optional[SeatBitmap]:
+        entry = self._entries.get(event_id)
+        if entry is not None and time.monotonic() - entry[1] < self.ttl_seconds:
+            self._entries.move_to_end(event_id)
+            return entry[0]
+
+        # One load per event at a time; other requests wait for its result
+        lock = self._locks.setdefault(event_id, asyncio.Lock())
+        async with lock:
+            entry = self._entries.get(event_id)
+            if entry is not None and time.monotonic() - entry[1] < self.ttl_seconds:
+                return entry[0]
+
+            rows = await loader(event_id)
+            if not rows:
+                self._locks.pop(event_id, None)
+                return None
+
+            bitmap = entry[0] if entry is not None else SeatBitmap(
+                [SeatRowLayout(*row[:4]) for row in rows]
+            )
+            for row in rows:
+                bitmap.load_row(row[0], bits_from_bytes(row[4]))
+
+            self._entries[event_id] = (bitmap, time.monotonic())
+            self._entries.move_to_end(event_id)
+            while len(self._entries) > self.max_events:
+                evicted, _ = self._entries.popitem(last=False)
+                self._locks.pop(evicted, None)
+            return bitmap
+
+    def peek(self, event_id: UUID) -> Optional[SeatBitmap]:
+        entry = self._entries.get(event_id)
+        return entry[0] if entry is not None else None
+
+    def invalidate(self, event_id: UUID) -> None:
+        """Force the next lookup to reload the event's bitmap"""
+        entry = self._entries.get(event_id)
+        if entry is not None:
+            self._entries[event_id] = (entry[0], float("-inf"))
+
+
+seat_map_cache = SeatMapCache(settings.seat_map_cache_ttl_seconds)
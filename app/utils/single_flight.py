@@ -0,0 +1,63 @@
+import asyncio
+from typing import Awaitable, Callable, Dict, Hashable, TypeVar
+from app.utils.metrics import metrics
+
+T = TypeVar("T")
+
+
+class _LeaderCancelled(Exception):
+    """The call being waited on was cancelled along with its request"""
+
+
+class SingleFlight:
+    """
+    Coalesces identical concurrent calls within this process.
+
+    The first caller for a key (the leader) runs the call; callers arriving
+    while it is in flight await the leader's result, or its exception,
+    instead of running their own. Nothing is kept once the call finishes,
+    so results are never staler than a query that was already running.
+
+    The leader runs the call in its own task context (its own DB session);
+    if the leader is cancelled, its waiters retry and one of them leads.
+    Results are shared between requests, so calls should return immutable
+    values (response schemas), not ORM objects bound to the leader's session.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._calls: Dict[Hashable, asyncio.Future] = {}
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._calls)
+
+    async def do(self, key: Hashable, call: Callable[[], Awaitable[T]]) -> T:
+        """The result of `call()`, shared with concurrent callers using the same `key`"""
+        while True:
+            future = self._calls.get(key)
+            if future is None:
+                break
+            metrics.inc("single_flight_calls_total", flight=self.name, result="shared")
+            try:
+                # A waiter's own cancellation must not cancel the shared call
+                return await asyncio.shield(future)
+            except _LeaderCancelled:
+                continue
+
+        metrics.inc("single_flight_calls_total", flight=self.name, result="leader")
+        future = asyncio.get_running_loop().create_future()
+        self._calls[key] = future
+        try:
+            result = await call()
+        except BaseException as e:
+            # Waiters retry after a cancelled leader and share any other error
+            cancelled = isinstance(e, asyncio.CancelledError)
+            future.set_exception(_LeaderCancelled() if cancelled else e)
+            future.exception()  # retrieved here in case nobody was waiting
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self._calls[key]
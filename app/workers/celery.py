@@ -19,10 +19,32 @@ celery_app.conf.update(
     task_track_started=True,
     task_time_limit=30 * 60,  # 30 minutes
     task_soft_time_limit=25 * 60,  # 25 minutes
+    # Expirations go to their own queue, drained in batches by
+    # app.workers.expiration_consumer rather than one task per message
+    task_routes={
+        "app.workers.tasks.expire_ticket": {"queue": settings.expiration_queue},
+        "app.workers.tasks.expire_basket": {"queue": settings.expiration_queue},
+    },
     beat_schedule={
         "expire-reserved-tickets": {
             "task": "app.workers.tasks.expire_reserved_tickets",
             "schedule": 60.0,  # Run every 60 seconds
         },
+        "verify-ticket-stats": {
+            "task": "app.workers.tasks.verify_ticket_stats",
+            "schedule": 600.0,  # Run every 10 minutes
+        },
+        "reconcile-tickets-sold": {
+            "task": "app.workers.tasks.reconcile_tickets_sold",
+            "schedule": settings.reconcile_interval_seconds,
+        },
+        "archive-cold-tickets": {
+            "task": "app.workers.tasks.archive_cold_tickets",
+            "schedule": settings.archive_interval_seconds,
+        },
+        "admit-waiting-rooms": {
+            "task": "app.workers.tasks.admit_waiting_rooms",
+            "schedule": settings.waiting_room_pump_interval,
+        },
     },
 )
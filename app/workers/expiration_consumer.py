@@ -0,0 +1,272 @@
+"""
+Batched consumer for ticket expiration messages.
+
+Reservations schedule `expire_ticket` calls (and basket checkouts one
+`expire_basket` for all their tickets) through the task outbox, which
+app.workers.outbox_relay sends on; Celery routes those messages to their own
+queue (settings.expiration_queue), which this process drains instead of a
+Celery worker:
+
+    python -m app.workers.expiration_consumer
+
+Messages are held, unacked, until their ETA. Every poll the due ones are
+expired together through TicketService.expire_tickets, up to
+`expiration_batch_size` tickets per batch - one status UPDATE and one grouped
+tickets_sold decrement - and acked once that batch has committed. A message
+arriving with the task id of one already held (the relay resending after a
+crash) is acked straight away.
+
+A batch that fails stays held and is retried after a backoff, in batches half
+the size per failure, so a ticket that can't be expired ends up on its own
+instead of stalling everything due with it. A message that has failed
+`expiration_max_attempts` times, the last of them alone, is dead-lettered
+(rejected); the periodic expire_reserved_tickets sweep still covers its
+tickets.
+"""
+import asyncio
+import heapq
+import itertools
+import signal
+import socket
+import time
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, List, Optional, Tuple
+from uuid import UUID
+from kombu import Exchange, Queue
+from app.workers.celery import celery_app
+from app.config import get_settings
+from app.utils.logger import setup_logger
+from app.utils.metrics import metrics
+
+settings = get_settings()
+logger = setup_logger(__name__)
+
+EXPIRE_TASK = "app.workers.tasks.expire_ticket"
+EXPIRE_BASKET_TASK = "app.workers.tasks.expire_basket"
+
+
+def expiration_queue() -> Queue:
+    """The queue Celery routes expirations to (declared the way Celery creates it)"""
+    name = settings.expiration_queue
+    return Queue(name, Exchange(name), routing_key=name)
+
+
+def parse_expire_message(headers: dict, body) -> Tuple[List[UUID], float]:
+    """Ticket ids and due time (epoch seconds) of a Celery expire_ticket/expire_basket message"""
+    task = headers.get("task")
+    args, kwargs = body[0], body[1]
+    if task == EXPIRE_TASK:
+        ticket_ids = [UUID(args[0] if args else kwargs["ticket_id"])]
+    elif task == EXPIRE_BASKET_TASK:
+        ticket_ids = [UUID(t) for t in (args[1] if len(args) > 1 else kwargs["ticket_ids"])]
+    else:
+        raise ValueError(f"Unexpected task {task!r}")
+
+    eta = headers.get("eta")
+    if not eta:
+        return ticket_ids, 0.0
+    due = datetime.fromisoformat(eta)
+    if due.tzinfo is None:
+        due = due.replace(tzinfo=timezone.utc)
+    return ticket_ids, due.timestamp()
+
+
+class ExpirationBuffer:
+    """
+    Received messages ordered by due time, handed out in batches once due.
+    Each entry carries how many times expiring it has failed.
+    """
+
+    def __init__(self):
+        self._heap: list = []
+        self._order = itertools.count()  # ties keep arrival order
+        self._task_ids: set = set()
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def add(self, due: float, ticket_ids: List[UUID], message, attempts: int = 0) -> bool:
+        """Hold a message until due; False if one with its task id is already held"""
+        task_id = message.headers.get("id")
+        if task_id is not None:
+            if task_id in self._task_ids:
+                return False
+            self._task_ids.add(task_id)
+        heapq.heappush(self._heap, (due, next(self._order), ticket_ids, message, attempts))
+        return True
+
+    def next_due(self) -> Optional[float]:
+        return self._heap[0][0] if self._heap else None
+
+    def pop_due(self, now: float, limit: int) -> List[Tuple[List[UUID], object, int]]:
+        """
+        (ticket ids, message, attempts) entries due at `now`, earliest first,
+        covering up to `limit` tickets (always at least one message if any is
+        due). The limit halves for each earlier failure of an entry in the batch.
+        """
+        batch, tickets, cap = [], 0, limit
+        while self._heap and self._heap[0][0] <= now:
+            _, _, ticket_ids, _, attempts = self._heap[0]
+            cap = min(cap, max(1, limit >> attempts))
+            if batch and tickets + len(ticket_ids) > cap:
+                break
+            _, _, ticket_ids, message, attempts = heapq.heappop(self._heap)
+            self._task_ids.discard(message.headers.get("id"))
+            batch.append((ticket_ids, message, attempts))
+            tickets += len(ticket_ids)
+        return batch
+
+    def drain(self) -> list:
+        """Every message still held, emptying the buffer"""
+        messages = [entry[3] for entry in self._heap]
+        self._heap.clear()
+        self._task_ids.clear()
+        return messages
+
+
+async def expire_tickets(ticket_ids: List[UUID]) -> int:
+    """Expire a batch of tickets in a fresh session"""
+    from app.database import AsyncSessionLocal
+    from app.services.ticket import TicketService
+    from app.utils.response_cache import response_cache
+
+    async with AsyncSessionLocal() as session:
+        expired = await TicketService(session).expire_tickets(ticket_ids)
+    # The loop only runs during batches, so a delayed flush could wait for
+    # the next one; the batch is the batching window here
+    await response_cache.flush_counts()
+    return expired
+
+
+class ExpirationConsumer:
+    """
+    Drains the expiration queue and expires due tickets in batches.
+    Batches run on one event loop kept for the life of the consumer, so
+    database connections are reused between them.
+    """
+
+    def __init__(
+        self,
+        batch_size: Optional[int] = None,
+        poll_seconds: Optional[float] = None,
+        expire: Callable[[List[UUID]], Awaitable[int]] = expire_tickets,
+        max_attempts: Optional[int] = None,
+        retry_base_delay: Optional[float] = None,
+    ):
+        self.batch_size = batch_size or settings.expiration_batch_size
+        self.poll_seconds = poll_seconds or settings.expiration_poll_seconds
+        self.max_attempts = max_attempts or settings.expiration_max_attempts
+        self.retry_base_delay = (
+            settings.expiration_retry_base_delay
+            if retry_base_delay is None
+            else retry_base_delay
+        )
+        self.buffer = ExpirationBuffer()
+        self._expire = expire
+        self._loop = asyncio.new_event_loop()
+        self._stopping = False
+
+    def stop(self, *args) -> None:
+        self._stopping = True
+
+    def on_message(self, body, message) -> None:
+        try:
+            ticket_ids, due = parse_expire_message(message.headers, body)
+        except (KeyError, IndexError, TypeError, ValueError) as e:
+            logger.error(f"Dropping malformed expiration message: {e}")
+            metrics.inc("ticket_expiration_messages_total", result="invalid")
+            message.reject()
+            return
+        if not self.buffer.add(due, ticket_ids, message):
+            metrics.inc("ticket_expiration_messages_total", result="duplicate")
+            message.ack()
+
+    def flush(self, now: Optional[float] = None) -> int:
+        """Expire every due ticket, a batch at a time; returns the messages acked"""
+        now = time.time() if now is None else now
+        acked = 0
+        while True:
+            batch = self.buffer.pop_due(now, self.batch_size)
+            if not batch:
+                return acked
+            ticket_ids = list(dict.fromkeys(t for ids, _, _ in batch for t in ids))
+            try:
+                expired = self._loop.run_until_complete(self._expire(ticket_ids))
+            except Exception as e:
+                # Nothing committed: hold the batch back and stop hammering
+                # the database until the next poll
+                logger.error(f"Error expiring a batch of {len(ticket_ids)} tickets: {str(e)}")
+                self._retry_later(batch, now)
+                return acked
+
+            for _, message, _ in batch:
+                message.ack()
+            acked += len(batch)
+            metrics.inc("ticket_expiration_batches_total")
+            metrics.inc("ticket_expiration_messages_total", len(batch), result="acked")
+            metrics.inc("tickets_expired_total", expired)
+
+    def _retry_later(self, batch: list, now: float) -> None:
+        """
+        Hold a failed batch's messages for another attempt after a backoff
+        (doubling per failure, capped); dead-letter those that failed alone
+        `max_attempts` times.
+        """
+        for ticket_ids, message, attempts in batch:
+            attempts += 1
+            if len(batch) == 1 and attempts >= self.max_attempts:
+                logger.error(
+                    f"Dead-lettering expiration of tickets {[str(t) for t in ticket_ids]} "
+                    f"after {attempts} failed attempts"
+                )
+                message.reject()
+                metrics.inc("ticket_expiration_messages_total", result="dead_lettered")
+                continue
+            delay = min(
+                settings.expiration_retry_max_delay,
+                self.retry_base_delay * 2 ** (attempts - 1),
+            )
+            self.buffer.add(now + delay, ticket_ids, message, attempts)
+            metrics.inc("ticket_expiration_messages_total", result="retried")
+
+    def poll(self, connection) -> None:
+        """Receive messages for up to `poll_seconds`, then expire what is due"""
+        deadline = time.monotonic() + self.poll_seconds
+        while not self._stopping:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                connection.drain_events(timeout=remaining)
+            except socket.timeout:
+                break
+        self.flush()
+
+    def run(self, connection) -> None:
+        queue = expiration_queue()
+        with connection.Consumer(queue, callbacks=[self.on_message], accept=["json"]) as consumer:
+            consumer.qos(prefetch_count=settings.expiration_prefetch)
+            try:
+                while not self._stopping:
+                    self.poll(connection)
+            finally:
+                # Messages not yet due go back to the queue for the next consumer
+                for message in self.buffer.drain():
+                    message.requeue()
+        self._loop.close()
+
+
+def main() -> None:
+    consumer = ExpirationConsumer()
+    signal.signal(signal.SIGTERM, consumer.stop)
+    signal.signal(signal.SIGINT, consumer.stop)
+    logger.info(
+        f"Consuming {settings.expiration_queue} in batches of up to {consumer.batch_size}"
+    )
+    with celery_app.connection_for_read() as connection:
+        connection.ensure_connection(max_retries=10)
+        consumer.run(connection)
+
+
+if __name__ == "__main__":
+    main()
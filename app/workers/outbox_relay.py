@@ -0,0 +1,128 @@
+"""
+Relay for the transactional outbox of task calls.
+
+Request handlers never talk to the broker: a reservation writes its
+expire_ticket / expire_basket call to task_outbox in the transaction that
+reserves the tickets, and this process sends pending rows on:
+
+    python -m app.workers.outbox_relay
+
+Each poll claims up to `outbox_batch_size` rows (FOR UPDATE SKIP LOCKED, so
+several relays split the work), sends them over one producer connection and
+deletes them in the same transaction. A row's id is its Celery task id: if
+the relay dies after sending but before committing, the row is sent again
+under the same id, and the expiration consumer drops the copy it already
+holds. Expiring is idempotent besides.
+"""
+import asyncio
+import signal
+import time
+from typing import Callable, List, Optional
+from uuid import UUID
+from app.workers.celery import celery_app
+from app.config import get_settings
+from app.utils.logger import setup_logger
+from app.utils.metrics import metrics
+
+settings = get_settings()
+logger = setup_logger(__name__)
+
+
+def publish_messages(messages) -> List[UUID]:
+    """
+    Send outbox rows to the broker in order, over one connection.
+    Returns the ids sent; stops at the first failure, leaving the rest.
+    """
+    sent = []
+    try:
+        with celery_app.producer_or_acquire() as producer:
+            for message in messages:
+                celery_app.send_task(
+                    message.task,
+                    args=message.args,
+                    eta=message.eta,
+                    task_id=str(message.id),
+                    producer=producer,
+                    ignore_result=True,  # nobody waits on these; skip the result subscription
+                )
+                sent.append(message.id)
+    except Exception as e:
+        logger.error(f"Error sending outbox messages: {str(e)}")
+    return sent
+
+
+class OutboxRelay:
+    """
+    Moves task calls from the outbox to the broker, a batch per transaction.
+    Batches run on one event loop kept for the life of the relay, so
+    database connections are reused between them.
+    """
+
+    def __init__(
+        self,
+        batch_size: Optional[int] = None,
+        poll_seconds: Optional[float] = None,
+        publish: Callable[[list], List[UUID]] = publish_messages,
+    ):
+        self.batch_size = batch_size or settings.outbox_batch_size
+        self.poll_seconds = poll_seconds or settings.outbox_poll_seconds
+        self._publish = publish
+        self._loop = asyncio.new_event_loop()
+        self._stopping = False
+
+    def stop(self, *args) -> None:
+        self._stopping = True
+
+    async def relay_batch(self, session) -> int:
+        """Send and delete one batch of pending messages; returns how many were sent"""
+        from app.repositories.outbox import OutboxRepository
+
+        repo = OutboxRepository(session)
+        messages = await repo.claim_pending(self.batch_size)
+        if not messages:
+            await session.commit()
+            return 0
+
+        sent = self._publish(messages)
+        await repo.delete_many(sent)
+        await session.commit()
+
+        metrics.inc("outbox_messages_sent_total", len(sent))
+        if len(sent) < len(messages):
+            metrics.inc("outbox_send_failures_total")
+        return len(sent)
+
+    async def relay(self) -> int:
+        """Send pending messages until the outbox is drained or sending fails"""
+        from app.database import AsyncSessionLocal
+
+        total = 0
+        async with AsyncSessionLocal() as session:
+            while not self._stopping:
+                sent = await self.relay_batch(session)
+                total += sent
+                if sent < self.batch_size:
+                    break
+        return total
+
+    def run(self) -> None:
+        while not self._stopping:
+            try:
+                self._loop.run_until_complete(self.relay())
+            except Exception as e:
+                # Nothing was deleted that wasn't committed; try again next poll
+                logger.error(f"Error relaying outbox messages: {str(e)}")
+            time.sleep(self.poll_seconds)
+        self._loop.close()
+
+
+def main() -> None:
+    relay = OutboxRelay()
+    signal.signal(signal.SIGTERM, relay.stop)
+    signal.signal(signal.SIGINT, relay.stop)
+    logger.info(f"Relaying the task outbox in batches of up to {relay.batch_size}")
+    relay.run()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,35 @@
 from app.workers.celery import celery_app
 from app.config import get_settings
+from app.utils.logger import setup_logger
+from celery.signals import worker_init
+from typing import List
 from uuid import UUID
 import asyncio
 
 settings = get_settings()
+logger = setup_logger(__name__)
+
+
+@worker_init.connect
+def preload_task_dependencies(**kwargs):
+    """
+    Import what the tasks use once, in the parent worker process, so prefork
+    children (including ones recycled after max-tasks-per-child) inherit the
+    modules instead of paying for the imports on their first task.
+    """
+    import app.database  # noqa: F401
+    import app.services.ticket  # noqa: F401
+    import app.services.waiting_room  # noqa: F401
+    import app.repositories  # noqa: F401
 
 
 @celery_app.task(name="app.workers.tasks.expire_ticket")
 def expire_ticket(ticket_id: str):
     """
     Expire a specific ticket if it's still in RESERVED status.
-    This task is scheduled when a ticket is created.
+    This task is scheduled when a ticket is created. Its messages are routed
+    to the expiration queue, which app.workers.expiration_consumer drains in
+    batches; this body only runs for workers started on that queue instead.
     """
     from app.database import AsyncSessionLocal
     from app.services.ticket import TicketService
@@ -32,6 +51,30 @@ def expire_ticket(ticket_id: str):
     return asyncio.run(_expire())
 
 
+@celery_app.task(name="app.workers.tasks.expire_basket")
+def expire_basket(basket_id: str, ticket_ids: List[str]):
+    """
+    Expire a basket's tickets that are still in RESERVED status.
+    Scheduled once per basket checkout and routed to the expiration queue
+    like expire_ticket.
+    """
+    from app.database import AsyncSessionLocal
+    from app.services.ticket import TicketService
+
+    async def _expire():
+        async with AsyncSessionLocal() as session:
+            try:
+                expired = await TicketService(session).expire_tickets(
+                    [UUID(ticket_id) for ticket_id in ticket_ids]
+                )
+                return f"Basket {basket_id}: expired {expired} tickets"
+            except Exception as e:
+                return f"Error expiring basket {basket_id}: {str(e)}"
+
+    # Run the async function
+    return asyncio.run(_expire())
+
+
 @celery_app.task(name="app.workers.tasks.expire_reserved_tickets")
 def expire_reserved_tickets():
     """
@@ -40,13 +83,11 @@ def expire_reserved_tickets():
     """
     from app.database import AsyncSessionLocal
     from app.repositories.ticket import TicketRepository
-    from app.repositories.event import EventRepository
-    from app.models.ticket import TicketStatus
+    from app.services.ticket import TicketService
 
     async def _expire_batch():
         async with AsyncSessionLocal() as session:
             ticket_repo = TicketRepository(session)
-            event_repo = EventRepository(session)
 
             try:
                 # Get expired tickets
@@ -54,15 +95,10 @@ def expire_reserved_tickets():
                     timeout_seconds=settings.ticket_reservation_timeout, limit=100
                 )
 
-                expired_count = 0
-                for ticket in expired_tickets:
-                    # Update status
-                    await ticket_repo.update_status(ticket.id, TicketStatus.EXPIRED)
-
-                    # Decrement tickets_sold
-                    await event_repo.decrement_tickets_sold(ticket.event_id)
-
-                    expired_count += 1
+                # Expire them together: one status UPDATE, one counter UPDATE
+                expired_count = await TicketService(session).expire_tickets(
+                    [ticket.id for ticket in expired_tickets]
+                )
 
                 return f"Expired {expired_count} tickets"
             except Exception as e:
@@ -70,3 +106,130 @@ def expire_reserved_tickets():
 
     # Run the async function
     return asyncio.run(_expire_batch())
+
+
+@celery_app.task(name="app.workers.tasks.admit_waiting_rooms")
+def admit_waiting_rooms():
+    """
+    Periodic admission pump for waiting rooms.
+    Releases the configured number of queue positions per second for every open room.
+    """
+    from app.services.waiting_room import WaitingRoomService, create_waiting_room_store
+
+    async def _pump():
+        # Fresh store per run: the Redis client is bound to this event loop
+        store = create_waiting_room_store()
+        service = WaitingRoomService(store)
+        try:
+            admitted = await service.pump(settings.waiting_room_pump_interval)
+            return f"Admitted up to {admitted}"
+        except Exception as e:
+            return f"Error in waiting room pump: {str(e)}"
+        finally:
+            await store.close_connection()
+
+    # Run the async function
+    return asyncio.run(_pump())
+
+
+@celery_app.task(name="app.workers.tasks.verify_ticket_stats")
+def verify_ticket_stats():
+    """
+    Periodic verifier for the per-event ticket status rollups.
+    Rebuilds them from a single GROUP BY over tickets and reports any drift.
+    """
+    from app.database import AsyncSessionLocal
+    from app.repositories.ticket_stats import TicketStatsRepository
+
+    async def _verify():
+        async with AsyncSessionLocal() as session:
+            try:
+                report = await TicketStatsRepository(session).rebuild()
+                if report["events_corrected"]:
+                    logger.warning(f"Ticket stats drift corrected: {report}")
+                return f"Verified ticket stats: {report}"
+            except Exception as e:
+                return f"Error verifying ticket stats: {str(e)}"
+
+    # Run the async function
+    return asyncio.run(_verify())
+
+
+@celery_app.task(name="app.workers.tasks.reconcile_tickets_sold")
+def reconcile_tickets_sold():
+    """
+    Periodic reconciliation of events.tickets_sold against actual tickets.
+    Scans all events in chunks and bulk-corrects any drifted counters.
+    """
+    from app.database import AsyncSessionLocal
+    from app.repositories.event import EventRepository
+    from app.utils.metrics import create_shared_metrics
+
+    async def _reconcile():
+        async with AsyncSessionLocal() as session:
+            try:
+                report = await EventRepository(session).reconcile_tickets_sold(
+                    chunk_size=settings.reconcile_chunk_size,
+                    grace_seconds=settings.reconcile_grace_seconds,
+                )
+            except Exception as e:
+                return f"Error reconciling tickets_sold: {str(e)}"
+
+        # Recorded where the API's /metrics can see it, not in this worker
+        shared = create_shared_metrics()
+        try:
+            await shared.inc("tickets_sold_reconcile_runs_total")
+            await shared.inc("tickets_sold_drift_events_total", report["events_corrected"])
+            await shared.inc("tickets_sold_drift_tickets_total", report["total_drift"])
+            await shared.set("tickets_sold_drift_events_last_run", report["events_corrected"])
+        except Exception as e:
+            logger.error(f"Error recording reconciliation metrics: {str(e)}")
+        finally:
+            await shared.close()
+        logger.info(
+            "tickets_sold reconciliation: checked=%(events_checked)d "
+            "corrected=%(events_corrected)d drift=%(total_drift)d" % report
+        )
+        return f"Reconciled tickets_sold: {report}"
+
+    # Run the async function
+    return asyncio.run(_reconcile())
+
+
+@celery_app.task(name="app.workers.tasks.archive_cold_tickets")
+def archive_cold_tickets():
+    """
+    Periodic archival of expired tickets and tickets for past events.
+    Moves them out of the hot tickets table in throttled batches.
+    """
+    from app.database import AsyncSessionLocal
+    from app.repositories.ticket import TicketRepository
+    from datetime import datetime, timezone, timedelta
+
+    async def _archive():
+        now = datetime.now(timezone.utc)
+        expired_before = now - timedelta(seconds=settings.archive_expired_after_seconds)
+        events_ended_before = now - timedelta(days=settings.archive_past_events_after_days)
+
+        archived = 0
+        async with AsyncSessionLocal() as session:
+            ticket_repo = TicketRepository(session)
+            try:
+                for _ in range(settings.archive_max_batches_per_run):
+                    moved = await ticket_repo.archive_batch(
+                        batch_size=settings.archive_batch_size,
+                        expired_before=expired_before,
+                        events_ended_before=events_ended_before,
+                    )
+                    archived += moved
+                    if moved < settings.archive_batch_size:
+                        break
+                    # Throttle to keep index and WAL churn off the hot path
+                    await asyncio.sleep(settings.archive_batch_pause_seconds)
+            except Exception as e:
+                return f"Error archiving tickets after {archived} archived: {str(e)}"
+
+        return f"Archived {archived} tickets"
+
+    # Run the async function
+    return asyncio.run(_archive())
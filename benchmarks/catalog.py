@@ -0,0 +1,106 @@
+"""
+In-process event catalog benchmark.
+
+Loads synthetic upcoming events into an EventCatalog, then times the reads
+the API serves from it and reports memory per event:
+
+    python benchmarks/catalog.py [--events 1000000] [--venues 5000]
+
+Rows are built the way the catalog sync reads them from the events table,
+so the load time includes the per-row conversion work.
+"""
+import argparse
+import random
+import resource
+import statistics
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.utils.catalog import EventCatalog  # noqa: E402
+
+
+def make_rows(count: int, venues: int, now: datetime):
+    venue_list = [
+        (f"Venue {i}", f"{i} Example Road", random.uniform(4, 13), random.uniform(3, 14))
+        for i in range(venues)
+    ]
+    for i in range(count):
+        location, address, lat, lon = venue_list[i % venues]
+        start = now + timedelta(minutes=random.randint(60, 60 * 24 * 365))
+        yield (
+            uuid.uuid4(),
+            f"Event {i}",
+            None if i % 4 else "Doors open an hour before the show",
+            start,
+            start + timedelta(hours=3),
+            500,
+            random.randint(0, 500),
+            1,
+            location,
+            address,
+            lat,
+            lon,
+        )
+
+
+def timed(fn, runs: int = 20):
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return min(samples), statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--events", type=int, default=1_000_000)
+    parser.add_argument("--venues", type=int, default=5000)
+    args = parser.parse_args()
+
+    now = datetime.now(timezone.utc)
+    rows = list(make_rows(args.events, args.venues, now))
+
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    started = time.perf_counter()
+    catalog = EventCatalog()
+    for offset in range(0, len(rows), 10000):
+        catalog.apply(rows[offset : offset + 10000], now)
+    load_seconds = time.perf_counter() - started
+    catalog.list_events(0, 1, now)  # builds the listing order
+    rss_growth = (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - rss_before) * 1024
+
+    report = catalog.memory_report()
+    print(f"events:            {report['events']:,}")
+    print(f"load:              {load_seconds:.2f}s")
+    print(f"reported bytes:    {report['total_bytes'] / 2**20:.1f} MiB "
+          f"({report['bytes_per_event']:.0f} B/event)")
+    print(f"peak RSS growth:   {rss_growth / 2**20:.1f} MiB "
+          f"({rss_growth / report['events']:.0f} B/event, includes load-time copies)")
+
+    sample = random.sample(rows, 1000)
+    updates = [row[:6] + (row[6] + 1 if row[6] < 500 else row[6], 2) + row[8:] for row in sample]
+    checks = {
+        "get by id": lambda: catalog.get(random.choice(sample)[0]),
+        "list page 1 (upcoming)": lambda: catalog.list_events(0, 20, now, upcoming=True),
+        "list page 500 (available)": lambda: catalog.list_events(
+            10000, 20, now, available_only=True
+        ),
+        "list by venue": lambda: catalog.list_events(
+            0, 20, now, venue_location="Venue 42"
+        ),
+        "near, 50 km": lambda: catalog.near(6.5, 3.4, 50, 0, 20, now),
+        "apply 1000 updates": lambda: catalog.apply(updates, now),
+    }
+    for name, check in checks.items():
+        best, median = timed(check)
+        print(f"{name:<26} best {best:8.3f} ms   median {median:8.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+"""
+Event counter contention benchmark: optimistic compare-and-swap vs row locks.
+
+Concurrent workers reserve tickets on a set of hot events, each reservation
+in its own session, the way requests do. Fewer hot events means more
+writers per event row. Two ways of keeping tickets_sold right are compared
+against the configured DATABASE_URL:
+
+    python benchmarks/event_contention.py [--workers 24] [--hot-events 1,4,16,64]
+
+- optimistic: read the event, stage the ticket, then the UPDATE ... WHERE
+  version = <read version> the reservation path uses (the rollup row is
+  only written once that matched, by the winner), retried with jittered
+  backoff on a conflict and, once retries run out, the guarded
+  tickets_sold + 1 <= total_tickets increment (TicketService._reserve
+  without the HTTP parts)
+- locking: SELECT ... FOR UPDATE on the event, stage the ticket, increment
+  and commit - writers to one event queue on its row lock
+
+Reported per contention level: reservations/s, p50/p99 latency, conflicts,
+retries and reservations that fell back to the guarded increment. Row locks and version checks
+only behave as they do in production on Postgres; SQLite serializes every
+writer on the database file, so there the table only shows the overhead of
+each path. Seeded rows are deleted again at the end.
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import delete, func, select  # noqa: E402
+from app.database import AsyncSessionLocal, Base, engine  # noqa: E402
+from app.models import Event, Ticket, TicketStatus, User, Venue  # noqa: E402
+from app.models.ticket_stats import EventTicketStats  # noqa: E402
+from app.models.geography import IS_SQLITE  # noqa: E402
+from app.repositories.event import EventRepository  # noqa: E402
+from app.repositories.ticket import TicketRepository  # noqa: E402
+from app.utils.geo import normalize_address, point_ewkt  # noqa: E402
+from app.utils.metrics import metrics  # noqa: E402
+from app.utils.optimistic import VersionConflict, retry_on_conflict  # noqa: E402
+
+OPERATION = "bench_reserve"
+
+
+async def seed(events: int, capacity: int):
+    now = datetime.now(timezone.utc)
+    run = uuid.uuid4().hex[:8]
+    venue = Venue(
+        location="Benchmark Arena",
+        address=f"{run} Benchmark Road",
+        address_key=normalize_address(f"{run} Benchmark Road"),
+        latitude=6.45,
+        longitude=3.39,
+        geo_location=point_ewkt(3.39, 6.45),
+    )
+    event_rows = [
+        Event(
+            title=f"Benchmark Event {i}",
+            start_time=now + timedelta(days=1),
+            end_time=now + timedelta(days=1, hours=3),
+            total_tickets=capacity,
+            tickets_sold=0,
+            venue=venue,
+        )
+        for i in range(events)
+    ]
+    user = User(name="Benchmark", email=f"{run}@example.com", latitude=6.45, longitude=3.39,
+                location=point_ewkt(3.39, 6.45))
+    async with AsyncSessionLocal() as session:
+        session.add_all([venue, *event_rows, user])
+        await session.commit()
+    return venue.id, [event.id for event in event_rows], user.id
+
+
+async def cleanup(venue_id, event_ids, user_id):
+    async with AsyncSessionLocal() as session:
+        await session.execute(delete(Ticket).where(Ticket.user_id == user_id))
+        await session.execute(delete(EventTicketStats).where(EventTicketStats.event_id.in_(event_ids)))
+        await session.execute(delete(User).where(User.id == user_id))
+        await session.execute(delete(Event).where(Event.id.in_(event_ids)))
+        await session.execute(delete(Venue).where(Venue.id == venue_id))
+        await session.commit()
+
+
+async def reserve_optimistic(event_id: uuid.UUID, user_id: uuid.UUID) -> None:
+    async with AsyncSessionLocal() as session:
+        ticket_repo, event_repo = TicketRepository(session), EventRepository(session)
+        ticket_id = uuid.uuid4()
+
+        async def attempt(guarded: bool = False):
+            event = await event_repo.get_by_id(event_id)
+            tickets = [Ticket(id=ticket_id, user_id=user_id, event_id=event_id, status=TicketStatus.RESERVED)]
+            await ticket_repo.add_many(tickets, rollup=False)
+
+            async def count_tickets():
+                await ticket_repo.count_reserved(tickets)
+
+            if guarded:
+                assert await event_repo.add_tickets_sold_if_available(
+                    event, 1, before_commit=count_tickets
+                ), "sold out"
+            elif not await event_repo.add_tickets_sold_if_unchanged(
+                event, 1, before_commit=count_tickets
+            ):
+                raise VersionConflict()
+
+        await retry_on_conflict(OPERATION, attempt, fallback=lambda: attempt(guarded=True))
+
+
+async def reserve_locking(event_id: uuid.UUID, user_id: uuid.UUID) -> None:
+    async with AsyncSessionLocal() as session:
+        ticket_repo, event_repo = TicketRepository(session), EventRepository(session)
+        await event_repo.lock_many([event_id])
+        await ticket_repo.add_many(
+            [Ticket(id=uuid.uuid4(), user_id=user_id, event_id=event_id, status=TicketStatus.RESERVED)]
+        )
+        await event_repo.increment_tickets_sold_many({event_id: 1})
+
+
+async def run_level(reserve, event_ids, user_id, workers: int, per_worker: int) -> dict:
+    latencies = []
+    counters = ("optimistic_conflicts_total", "optimistic_retries_total", "optimistic_fallbacks_total")
+
+    async def worker(n: int):
+        for i in range(per_worker):
+            event_id = event_ids[(n + i * workers) % len(event_ids)]
+            started = time.perf_counter()
+            await reserve(event_id, user_id)
+            latencies.append(time.perf_counter() - started)
+
+    before = {name: metrics.get(name, operation=OPERATION) for name in counters}
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(n) for n in range(workers)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "rate": len(latencies) / elapsed,
+        "p50": statistics.median(latencies) * 1000 if latencies else 0.0,
+        "p99": latencies[int(len(latencies) * 0.99) - 1] * 1000 if latencies else 0.0,
+        "conflicts": metrics.get("optimistic_conflicts_total", operation=OPERATION)
+        - before["optimistic_conflicts_total"],
+        "retries": metrics.get("optimistic_retries_total", operation=OPERATION)
+        - before["optimistic_retries_total"],
+        "fallbacks": metrics.get("optimistic_fallbacks_total", operation=OPERATION)
+        - before["optimistic_fallbacks_total"],
+    }
+
+
+async def counters_match(event_ids) -> bool:
+    """tickets_sold still equals the reserved tickets on every event (no lost updates)"""
+    async with AsyncSessionLocal() as session:
+        result = await session.execute(
+            select(Event.tickets_sold, func.count(Ticket.id))
+            .outerjoin(Ticket, Ticket.event_id == Event.id)
+            .where(Event.id.in_(event_ids))
+            .group_by(Event.id, Event.tickets_sold)
+        )
+        return all(sold == reserved for sold, reserved in result.all())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--workers", type=int, default=24)  # within the default pool (10 + 20)
+    parser.add_argument("--per-worker", type=int, default=50)
+    parser.add_argument("--hot-events", default="1,4,16,64")
+    args = parser.parse_args()
+    levels = [int(n) for n in args.hot_events.split(",")]
+    capacity = args.workers * args.per_worker * 2
+
+    async def _run():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        print(f"{args.workers} workers x {args.per_worker} reservations"
+              f" ({'SQLite - writers serialize on the file' if IS_SQLITE else 'Postgres'})")
+        print(f"{'hot events':>10} {'strategy':<11} {'res/s':>8} {'p50 ms':>8} {'p99 ms':>8}"
+              f" {'conflicts':>9} {'retries':>8} {'fell back':>9}")
+        for hot in levels:
+            for name, reserve in (("optimistic", reserve_optimistic), ("locking", reserve_locking)):
+                venue_id, event_ids, user_id = await seed(hot, capacity)
+                try:
+                    result = await run_level(reserve, event_ids, user_id, args.workers, args.per_worker)
+                    assert await counters_match(event_ids), f"{name} lost tickets_sold updates"
+                finally:
+                    await cleanup(venue_id, event_ids, user_id)
+                print(f"{hot:>10} {name:<11} {result['rate']:8,.0f} {result['p50']:8.1f}"
+                      f" {result['p99']:8.1f} {result['conflicts']:9,.0f} {result['retries']:8,.0f}"
+                      f" {result['fallbacks']:9,.0f}")
+        await engine.dispose()
+
+    asyncio.run(_run())
+
+
+if __name__ == "__main__":
+    main()
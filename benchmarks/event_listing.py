@@ -0,0 +1,137 @@
+"""
+Event listing page benchmark: ORM entities vs column projections.
+
+Seeds events, then builds listing pages of response schemas two ways
+against the configured DATABASE_URL (an SQLite file such as
+sqlite+aiosqlite:///bench.db works):
+
+    python benchmarks/event_listing.py [--events 2000] [--page 100]
+
+- entities: Event ORM objects (venue joined in), copied into responses
+- records: EventRepository.list_events rows as EventRecord tuples
+
+Reports CPU time and peak Python memory per page. Seeded rows are
+deleted again at the end.
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+import tracemalloc
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import delete, select  # noqa: E402
+from app.database import AsyncSessionLocal, Base, engine  # noqa: E402
+from app.models import Event, Venue  # noqa: E402
+from app.repositories.event import EventRepository  # noqa: E402
+from app.services.event import EventService  # noqa: E402
+from app.utils.geo import normalize_address, point_ewkt  # noqa: E402
+
+
+async def seed(count: int):
+    now = datetime.now(timezone.utc)
+    run = uuid.uuid4().hex[:8]
+    venues = [
+        Venue(
+            location=f"Benchmark Venue {i}",
+            address=f"{run} {i} Benchmark Road",
+            address_key=normalize_address(f"{run} {i} Benchmark Road"),
+            latitude=6.45,
+            longitude=3.39,
+            geo_location=point_ewkt(3.39, 6.45),
+        )
+        for i in range(20)
+    ]
+    events = [
+        Event(
+            title=f"Benchmark Event {i}",
+            description="A long description listing pages carry along. " * 20,
+            start_time=now + timedelta(days=1, minutes=i),
+            end_time=now + timedelta(days=1, minutes=i, hours=3),
+            total_tickets=500,
+            tickets_sold=i % 500,
+            venue=venues[i % len(venues)],
+        )
+        for i in range(count)
+    ]
+    async with AsyncSessionLocal() as session:
+        session.add_all([*venues, *events])
+        await session.commit()
+    return [venue.id for venue in venues], [event.id for event in events], now
+
+
+async def cleanup(venue_ids, event_ids):
+    async with AsyncSessionLocal() as session:
+        await session.execute(delete(Event).where(Event.id.in_(event_ids)))
+        await session.execute(delete(Venue).where(Venue.id.in_(venue_ids)))
+        await session.commit()
+
+
+async def entity_page(skip, limit, start_from):
+    async with AsyncSessionLocal() as session:
+        result = await session.execute(
+            select(Event)
+            .where(Event.start_time >= start_from)
+            .order_by(Event.start_time, Event.id)
+            .offset(skip)
+            .limit(limit)
+        )
+        service = EventService(session)
+        return [service._to_response(event) for event in result.scalars().all()]
+
+
+async def record_page(skip, limit, start_from):
+    async with AsyncSessionLocal() as session:
+        service = EventService(session)
+        events = await EventRepository(session).list_events(
+            skip=skip, limit=limit, start_from=start_from
+        )
+        return [service._to_response(event) for event in events]
+
+
+async def measure(check, pages: int):
+    cpu, peaks = [], []
+    for page in range(pages):
+        tracemalloc.start()
+        started = time.process_time()
+        responses = await check(page)
+        cpu.append(time.process_time() - started)
+        peaks.append(tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+        del responses
+    return statistics.median(cpu), statistics.median(peaks)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--events", type=int, default=2000)
+    parser.add_argument("--page", type=int, default=100)
+    args = parser.parse_args()
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    venue_ids, event_ids, now = await seed(args.events)
+    pages = args.events // args.page
+
+    try:
+        checks = {
+            "entities": lambda page: entity_page(page * args.page, args.page, now),
+            "records": lambda page: record_page(page * args.page, args.page, now),
+        }
+        print(f"{pages} pages of {args.page} events")
+        for name, check in checks.items():
+            await check(0)  # warm up
+            cpu, peak = await measure(check, pages)
+            print(f"{name:<10} CPU {cpu * 1000:7.2f} ms/page   peak memory {peak / 1024:8.1f} KiB/page")
+    finally:
+        await cleanup(venue_ids, event_ids)
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,81 @@
+"""
+Cold start benchmark for the API and worker processes.
+
+Each measurement runs in a fresh interpreter, like a new gunicorn worker
+or a recycled Celery child:
+
+    python benchmarks/startup.py [--runs 7]
+
+Reports min/median seconds for importing the API app, importing the worker
+tasks, and serving the first /health request (import + lifespan + request),
+flagging imports slower than their budget. The budgets are checked here
+rather than in the test suite, where wall-clock limits depend on the machine;
+tests/test_startup.py checks which modules the imports load instead.
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+SNIPPETS = {
+    "import app.main": "import app.main",
+    "import app.workers.tasks": "import app.workers.tasks",
+    "first /health request": """
+import asyncio
+from httpx import AsyncClient, ASGITransport
+from app.main import app
+
+async def main():
+    async with app.router.lifespan_context(app):
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            assert (await client.get("/health")).status_code == 200
+
+asyncio.run(main())
+""",
+}
+
+# Cold import budgets in seconds (min of the runs)
+BUDGETS = {"import app.main": 2.5, "import app.workers.tasks": 1.0}
+
+TIMER = """
+import time
+_start = time.perf_counter()
+{code}
+print(time.perf_counter() - _start)
+"""
+
+
+def measure(code: str) -> float:
+    """Run `code` in a fresh interpreter and return its wall time in seconds"""
+    result = subprocess.run(
+        [sys.executable, "-c", TIMER.format(code=code)],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=7)
+    args = parser.parse_args()
+
+    over_budget = False
+    for name, code in SNIPPETS.items():
+        timings = [measure(code) for _ in range(args.runs)]
+        budget = BUDGETS.get(name)
+        flag = f"  OVER BUDGET ({budget}s)" if budget and min(timings) > budget else ""
+        over_budget = over_budget or bool(flag)
+        print(
+            f"{name:<28} min {min(timings):.3f}s  median {statistics.median(timings):.3f}s{flag}"
+        )
+    sys.exit(1 if over_budget else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+"""
+Ticket expiration backlog benchmark.
+
+Seeds reserved tickets over a set of events, then works through a simulated
+backlog of due expire_ticket messages two ways against the configured
+DATABASE_URL (an SQLite file such as sqlite+aiosqlite:///bench.db works):
+
+    python benchmarks/ticket_expiration.py [--messages 100000] [--batch 500]
+
+- per-message: one ticket per message, as the expire_ticket task did - load
+  the ticket with its event, update its status, decrement its event (run
+  over the first --per-message-sample messages and extrapolated)
+- batched: ExpirationConsumer receiving the whole backlog and expiring it
+  --batch tickets at a time (one status UPDATE, one grouped decrement)
+
+Messages are in-memory stand-ins carrying Celery's headers and body, so the
+numbers cover parsing, batching and the database work but not the broker.
+Seeded rows are deleted again at the end.
+"""
+import argparse
+import asyncio
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import delete, insert  # noqa: E402
+from app.database import AsyncSessionLocal, Base, engine  # noqa: E402
+from app.models import Event, Ticket, TicketStatus, User, Venue  # noqa: E402
+from app.models.ticket_stats import EventTicketStats  # noqa: E402
+from app.models.geography import IS_SQLITE  # noqa: E402
+from app.repositories.event import EventRepository  # noqa: E402
+from app.repositories.ticket import TicketRepository  # noqa: E402
+from app.utils.geo import normalize_address, point_ewkt  # noqa: E402
+from app.workers.expiration_consumer import EXPIRE_TASK, ExpirationConsumer  # noqa: E402
+
+
+class Message:
+    """Stand-in for a kombu message holding a Celery expire_ticket call"""
+
+    def __init__(self, ticket_id: uuid.UUID, eta: datetime):
+        self.headers = {"task": EXPIRE_TASK, "id": str(uuid.uuid4()), "eta": eta.isoformat()}
+        self.body = ([str(ticket_id)], {}, {})
+        self.acked = False
+
+    def ack(self):
+        self.acked = True
+
+    def requeue(self):
+        raise RuntimeError("Batch failed")
+
+
+async def seed(tickets: int, events: int):
+    now = datetime.now(timezone.utc)
+    run = uuid.uuid4().hex[:8]
+    venue = Venue(
+        location="Benchmark Arena",
+        address=f"{run} Benchmark Road",
+        address_key=normalize_address(f"{run} Benchmark Road"),
+        latitude=6.45,
+        longitude=3.39,
+        geo_location=point_ewkt(3.39, 6.45),
+    )
+    event_rows = [
+        Event(
+            title=f"Benchmark Event {i}",
+            start_time=now + timedelta(days=1),
+            end_time=now + timedelta(days=1, hours=3),
+            total_tickets=tickets,
+            tickets_sold=tickets // events + 1,
+            venue=venue,
+        )
+        for i in range(events)
+    ]
+    user = User(name="Benchmark", email=f"{run}@example.com", latitude=6.45, longitude=3.39,
+                location=point_ewkt(3.39, 6.45))
+    ticket_ids = [uuid.uuid4() for _ in range(tickets)]
+    async with AsyncSessionLocal() as session:
+        session.add_all([venue, *event_rows, user])
+        await session.flush()
+        for start in range(0, tickets, 5000):
+            await session.execute(
+                insert(Ticket),
+                [
+                    {
+                        "id": ticket_id,
+                        "user_id": user.id,
+                        "event_id": event_rows[i % events].id,
+                        "status": TicketStatus.RESERVED,
+                        "created_at": now - timedelta(minutes=3),
+                    }
+                    for i, ticket_id in enumerate(ticket_ids[start : start + 5000], start)
+                ],
+            )
+        await session.commit()
+    return venue.id, [event.id for event in event_rows], user.id, ticket_ids
+
+
+async def cleanup(venue_id, event_ids, user_id):
+    async with AsyncSessionLocal() as session:
+        await session.execute(delete(Ticket).where(Ticket.user_id == user_id))
+        await session.execute(delete(EventTicketStats).where(EventTicketStats.event_id.in_(event_ids)))
+        await session.execute(delete(User).where(User.id == user_id))
+        await session.execute(delete(Event).where(Event.id.in_(event_ids)))
+        await session.execute(delete(Venue).where(Venue.id == venue_id))
+        await session.commit()
+
+
+async def expire_one(ticket_id: uuid.UUID) -> bool:
+    """What the expire_ticket task did for each message"""
+    async with AsyncSessionLocal() as session:
+        ticket_repo, event_repo = TicketRepository(session), EventRepository(session)
+        ticket = await ticket_repo.get_by_id_with_event(ticket_id)
+        if not ticket or ticket.status != TicketStatus.RESERVED:
+            return False
+        await ticket_repo.update_status(ticket_id, TicketStatus.EXPIRED)
+        await event_repo.decrement_tickets_sold(ticket.event_id)
+        return True
+
+
+def per_message(messages):
+    async def _run():
+        for message in messages:
+            await expire_one(uuid.UUID(message.body[0][0]))
+            message.ack()
+        await engine.dispose()  # connections belong to this loop
+
+    asyncio.run(_run())
+
+
+def batched(messages, batch_size):
+    consumer = ExpirationConsumer(batch_size=batch_size)
+    for message in messages:
+        consumer.on_message(message.body, message)
+    acked = consumer.flush()
+    consumer._loop.run_until_complete(engine.dispose())
+    consumer._loop.close()
+    return acked
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--messages", type=int, default=100000)
+    parser.add_argument("--events", type=int, default=200)
+    parser.add_argument("--batch", type=int, default=500)
+    parser.add_argument("--per-message-sample", type=int, default=5000)
+    args = parser.parse_args()
+
+    async def _setup():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        seeded = await seed(args.messages, args.events)
+        await engine.dispose()
+        return seeded
+
+    venue_id, event_ids, user_id, ticket_ids = asyncio.run(_setup())
+    due = datetime.now(timezone.utc) - timedelta(seconds=1)
+    messages = [Message(ticket_id, due) for ticket_id in ticket_ids]
+    sample = min(args.per_message_sample, len(messages))
+
+    try:
+        print(f"{len(messages):,} due messages over {args.events} events"
+              f" ({'SQLite' if IS_SQLITE else 'Postgres'})")
+
+        started = time.perf_counter()
+        per_message(messages[:sample])
+        elapsed = time.perf_counter() - started
+        rate = sample / elapsed
+        print(f"{'per-message':<12} {rate:10,.0f} msgs/s   "
+              f"{len(messages) / rate:8.1f} s for the backlog (from {sample:,} messages)")
+
+        started = time.perf_counter()
+        acked = batched(messages[sample:], args.batch)
+        elapsed = time.perf_counter() - started
+        assert acked == len(messages) - sample
+        rate = acked / elapsed
+        print(f"{'batched':<12} {rate:10,.0f} msgs/s   "
+              f"{len(messages) / rate:8.1f} s for the backlog (batches of {args.batch})")
+    finally:
+        asyncio.run(cleanup(venue_id, event_ids, user_id))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+"""
+Ticket history loading benchmark.
+
+Seeds one user with a large ticket history spread over a set of events,
+then times reading the whole history three ways against the configured
+DATABASE_URL (an SQLite file such as sqlite+aiosqlite:///bench.db works):
+
+    python benchmarks/ticket_history.py [--tickets 10000] [--events 200]
+
+- joinedload: Ticket ORM objects with the full Event joined onto every row
+- projection: ticket rows plus one query for the distinct events' fields
+  (TicketService.get_user_ticket_history)
+- snapshot: tickets carrying their own event snapshot columns
+
+Seeded rows are deleted again at the end.
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import delete, select  # noqa: E402
+from sqlalchemy.orm import joinedload  # noqa: E402
+from app.database import AsyncSessionLocal, Base, engine  # noqa: E402
+from app.models import Event, Ticket, TicketStatus, User, Venue  # noqa: E402
+from app.schemas.ticket import TicketWithEventResponse  # noqa: E402
+from app.services.ticket import TicketService  # noqa: E402
+from app.utils.geo import normalize_address, point_ewkt  # noqa: E402
+
+
+async def seed(tickets: int, events: int):
+    now = datetime.now(timezone.utc)
+    run = uuid.uuid4().hex[:8]
+    venue = Venue(
+        location="Benchmark Arena",
+        address=f"{run} Benchmark Road",
+        address_key=normalize_address(f"{run} Benchmark Road"),
+        latitude=6.45,
+        longitude=3.39,
+        geo_location=point_ewkt(3.39, 6.45),
+    )
+    event_rows = [
+        Event(
+            title=f"Benchmark Event {i}",
+            description="A long description that the history never shows. " * 20,
+            start_time=now + timedelta(days=1 + i % 300),
+            end_time=now + timedelta(days=1 + i % 300, hours=3),
+            total_tickets=tickets,
+            tickets_sold=0,
+            venue=venue,
+        )
+        for i in range(events)
+    ]
+    users = [
+        User(name="Benchmark", email=f"{run}-{kind}@example.com", latitude=6.45, longitude=3.39,
+             location=point_ewkt(3.39, 6.45))
+        for kind in ("plain", "snapshot")
+    ]
+    async with AsyncSessionLocal() as session:
+        session.add_all([venue, *event_rows, *users])
+        await session.flush()
+        for user, snapshot in zip(users, (False, True)):
+            session.add_all(
+                Ticket(
+                    user_id=user.id,
+                    event_id=event.id,
+                    status=TicketStatus.PAID,
+                    created_at=now - timedelta(seconds=i),
+                    **(
+                        dict(
+                            event_title=event.title,
+                            event_start_time=event.start_time,
+                            venue_location=venue.location,
+                        )
+                        if snapshot
+                        else {}
+                    ),
+                )
+                for i, event in ((i, event_rows[i % events]) for i in range(tickets))
+            )
+            await session.flush()
+        await session.commit()
+    return venue.id, [event.id for event in event_rows], [user.id for user in users]
+
+
+async def cleanup(venue_id, event_ids, user_ids):
+    async with AsyncSessionLocal() as session:
+        await session.execute(delete(Ticket).where(Ticket.user_id.in_(user_ids)))
+        await session.execute(delete(User).where(User.id.in_(user_ids)))
+        await session.execute(delete(Event).where(Event.id.in_(event_ids)))
+        await session.execute(delete(Venue).where(Venue.id == venue_id))
+        await session.commit()
+
+
+async def joinedload_history(user_id, limit):
+    async with AsyncSessionLocal() as session:
+        result = await session.execute(
+            select(Ticket)
+            .options(joinedload(Ticket.event))
+            .where(Ticket.user_id == user_id)
+            .order_by(Ticket.created_at.desc())
+            .limit(limit)
+        )
+        return [
+            TicketWithEventResponse(
+                id=ticket.id,
+                user_id=ticket.user_id,
+                event_id=ticket.event_id,
+                status=ticket.status,
+                created_at=ticket.created_at,
+                event_title=ticket.event.title,
+                event_start_time=ticket.event.start_time,
+                venue_location=ticket.event.venue_location,
+            )
+            for ticket in result.unique().scalars().all()
+        ]
+
+
+async def service_history(user_id, limit):
+    async with AsyncSessionLocal() as session:
+        return await TicketService(session).get_user_ticket_history(user_id, limit=limit)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--tickets", type=int, default=10000)
+    parser.add_argument("--events", type=int, default=200)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    venue_id, event_ids, (plain_user, snapshot_user) = await seed(args.tickets, args.events)
+
+    try:
+        checks = {
+            "joinedload": lambda: joinedload_history(plain_user, args.tickets),
+            "projection": lambda: service_history(plain_user, args.tickets),
+            "snapshot": lambda: service_history(snapshot_user, args.tickets),
+        }
+        print(f"{args.tickets:,} tickets over {args.events} events")
+        for name, check in checks.items():
+            await check()  # warm up
+            samples = []
+            for _ in range(args.runs):
+                started = time.perf_counter()
+                rows = await check()
+                samples.append(time.perf_counter() - started)
+            assert len(rows) == args.tickets
+            median = statistics.median(samples)
+            print(f"{name:<12} median {median * 1000:8.1f} ms   {len(rows) / median:10,.0f} rows/s")
+    finally:
+        await cleanup(venue_id, event_ids, [plain_user, snapshot_user])
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -6,11 +6,11 @@ from sqlalchemy.pool import NullPool
 from httpx import AsyncClient, ASGITransport
 from app.database import Base
 from app.main import app
-from app.routers.deps import get_db
-from app.models import User, Event, Ticket
+from app.routers.deps import get_db, get_read_db
+from app.models import User, Event, Ticket, Venue
 from datetime import datetime, timezone, timedelta
-from geoalchemy2.shape import from_shape
-from shapely.geometry import Point
+from app.utils.geo import normalize_address, point_ewkt
+from app.utils.response_cache import response_cache
 import uuid
 
 # Test database URL
@@ -63,6 +63,9 @@ async def client(db_session: AsyncSession) -> AsyncGenerator[AsyncClient, None]:
         yield db_session
 
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
+    # Cached responses would outlive the per-test database
+    response_cache.clear()
 
     async with AsyncClient(
         transport=ASGITransport(app=app), base_url="http://test"
@@ -81,7 +84,7 @@ async def sample_user(db_session: AsyncSession) -> User:
         email="test@example.com",
         latitude=6.5244,  # Ibadan, Nigeria
         longitude=3.3792,
-        location=from_shape(Point(3.3792, 6.5244), srid=4326),
+        location=point_ewkt(3.3792, 6.5244),
     )
     db_session.add(user)
     await db_session.commit()
@@ -101,11 +104,14 @@ async def sample_event(db_session: AsyncSession) -> Event:
         end_time=now + timedelta(days=30, hours=8),
         total_tickets=100,
         tickets_sold=0,
-        venue_location="Conference Center",
-        venue_address="123 Main St, Ibadan, Nigeria",
-        venue_latitude=6.5244,
-        venue_longitude=3.3792,
-        geo_location=from_shape(Point(3.3792, 6.5244), srid=4326),
+        venue=Venue(
+            location="Conference Center",
+            address="123 Main St, Ibadan, Nigeria",
+            address_key=normalize_address("123 Main St, Ibadan, Nigeria"),
+            latitude=6.5244,
+            longitude=3.3792,
+            geo_location=point_ewkt(3.3792, 6.5244),
+        ),
     )
     db_session.add(event)
     await db_session.commit()
@@ -0,0 +1,125 @@
+import pytest
+import asyncio
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from app.utils.admission import (
+    AdmissionController,
+    AdmissionRejected,
+    AdmittedSession,
+    READ,
+    WRITE,
+)
+
+
+def make_controller(**overrides) -> AdmissionController:
+    options = dict(
+        capacity=3,
+        reserved_for_writes=1,
+        read_queue_timeout=0.05,
+        write_queue_timeout=0.5,
+        max_queue=10,
+        target_pool_wait=0.05,
+    )
+    options.update(overrides)
+    return AdmissionController(**options)
+
+
+@pytest.mark.asyncio
+class TestAdmissionController:
+
+    async def test_reads_leave_room_for_writes(self):
+        """Test reads are capped below capacity while writes can use the rest"""
+        controller = make_controller()
+
+        await controller.acquire(READ)
+        await controller.acquire(READ)
+
+        with pytest.raises(AdmissionRejected) as exc_info:
+            await controller.acquire(READ)
+        assert exc_info.value.retry_after >= 1
+
+        await controller.acquire(WRITE)
+        assert controller.total_in_flight == 3
+
+    async def test_full_queue_sheds_immediately(self):
+        """Test requests are rejected without waiting when the queue is full"""
+        controller = make_controller(max_queue=0)
+
+        await controller.acquire(READ)
+        await controller.acquire(READ)
+
+        with pytest.raises(AdmissionRejected):
+            await asyncio.wait_for(controller.acquire(READ), timeout=0.01)
+        assert controller.shed_count[READ] == 1
+
+    async def test_queued_writes_admitted_before_reads(self):
+        """Test a released slot goes to a waiting write before a waiting read"""
+        controller = make_controller(read_queue_timeout=0.5)
+        for _ in range(3):
+            await controller.acquire(WRITE)
+
+        order = []
+
+        async def wait_for(route_class):
+            await controller.acquire(route_class)
+            order.append(route_class)
+
+        read_waiter = asyncio.create_task(wait_for(READ))
+        await asyncio.sleep(0)
+        write_waiter = asyncio.create_task(wait_for(WRITE))
+        await asyncio.sleep(0)
+
+        controller.release(WRITE)
+        await write_waiter
+        assert order == [WRITE]
+
+        controller.release(WRITE)
+        controller.release(WRITE)
+        await read_waiter
+        assert order == [WRITE, READ]
+
+    async def test_slow_pool_shrinks_read_limit(self):
+        """Test the read limit backs off while pool waits exceed the target"""
+        controller = make_controller(capacity=20, reserved_for_writes=0)
+
+        for _ in range(10):
+            controller.observe_pool_wait(1.0)
+        assert controller.read_limit < 20
+
+        for _ in range(100):
+            controller.observe_pool_wait(0.0)
+        assert controller.read_limit == 20
+
+    async def test_session_admitted_on_first_use(self):
+        """Test an unused session takes no slot or connection, and first use takes both"""
+        controller = make_controller()
+        engine = create_async_engine("sqlite+aiosqlite://")
+        checkouts = []
+        event.listen(engine.sync_engine.pool, "checkout", lambda *args: checkouts.append(1))
+        session_factory = async_sessionmaker(engine, class_=AdmittedSession)
+
+        async with controller.session(session_factory, READ) as session:
+            await session.commit()
+            assert controller.total_in_flight == 0
+        assert checkouts == []
+
+        async with controller.session(session_factory, READ) as session:
+            assert await session.scalar(text("SELECT 1")) == 1
+            assert controller.in_flight[READ] == 1
+        assert controller.total_in_flight == 0
+        assert len(checkouts) == 1
+        await engine.dispose()
+
+    async def test_session_shed_on_first_use(self):
+        """Test a session that can't be admitted raises when first used, holding nothing"""
+        controller = make_controller(max_queue=0)
+        await controller.acquire(READ)
+        await controller.acquire(READ)
+        engine = create_async_engine("sqlite+aiosqlite://")
+        session_factory = async_sessionmaker(engine, class_=AdmittedSession)
+
+        with pytest.raises(AdmissionRejected):
+            async with controller.session(session_factory, READ) as session:
+                await session.execute(text("SELECT 1"))
+        assert controller.in_flight[READ] == 2
+        await engine.dispose()
@@ -0,0 +1,94 @@
+import pytest
+import asyncio
+from app.utils.availability import AvailabilityBroadcaster
+import uuid
+
+
+def update(event_id, sold: int) -> dict:
+    return {
+        "event_id": str(event_id),
+        "tickets_sold": sold,
+        "total_tickets": 100,
+        "available_tickets": 100 - sold,
+    }
+
+
+@pytest.mark.asyncio
+class TestAvailabilityBroadcaster:
+
+    async def test_fans_out_to_all_subscribers(self, monkeypatch):
+        """Test one update reaches every subscriber of the event and nobody else"""
+        monkeypatch.setattr("app.utils.availability.settings.availability_backend", "memory")
+        broadcaster = AvailabilityBroadcaster(max_rate=10)
+        event_id = uuid.uuid4()
+        first = broadcaster.subscribe(event_id)
+        second = broadcaster.subscribe(event_id)
+        other = broadcaster.subscribe(uuid.uuid4())
+
+        broadcaster.publish_local(update(event_id, 1))
+
+        assert (await first.next(timeout=0.1))["tickets_sold"] == 1
+        assert (await second.next(timeout=0.1))["tickets_sold"] == 1
+        assert await other.next(timeout=0.01) is None
+
+    async def test_bursts_are_coalesced_to_latest(self, monkeypatch):
+        """Test a burst of updates inside the rate interval yields only the newest value"""
+        monkeypatch.setattr("app.utils.availability.settings.availability_backend", "memory")
+        broadcaster = AvailabilityBroadcaster(max_rate=20)
+        event_id = uuid.uuid4()
+        subscription = broadcaster.subscribe(event_id)
+
+        broadcaster.publish_local(update(event_id, 1))
+        assert (await subscription.next(timeout=0.1))["tickets_sold"] == 1
+
+        for sold in range(2, 10):
+            broadcaster.publish_local(update(event_id, sold))
+        assert await subscription.next(timeout=0.01) is None
+
+        await asyncio.sleep(0.06)
+        assert (await subscription.next(timeout=0.1))["tickets_sold"] == 9
+
+    async def test_unsubscribe_forgets_event(self, monkeypatch):
+        """Test events without subscribers keep no state"""
+        monkeypatch.setattr("app.utils.availability.settings.availability_backend", "memory")
+        broadcaster = AvailabilityBroadcaster(max_rate=10)
+        subscription = broadcaster.subscribe(uuid.uuid4())
+
+        broadcaster.unsubscribe(subscription)
+
+        assert broadcaster.subscriber_count == 0
+
+
+@pytest.mark.asyncio
+class TestAvailabilityStream:
+
+    async def test_subscribes_before_reading_snapshot(self, monkeypatch):
+        """Test the stream is subscribed when its snapshot is read, and only while it runs"""
+        from app.routers import events as events_router
+
+        monkeypatch.setattr("app.utils.availability.settings.availability_backend", "memory")
+        broadcaster = AvailabilityBroadcaster(max_rate=10)
+        monkeypatch.setattr(events_router, "broadcaster", broadcaster)
+        event_id = uuid.uuid4()
+        subscribed_at_read = []
+
+        async def snapshot(requested_id):
+            subscribed_at_read.append(broadcaster.subscriber_count)
+            return update(requested_id, 0)
+
+        monkeypatch.setattr(events_router, "_availability_snapshot", snapshot)
+
+        class ConnectedRequest:
+            async def is_disconnected(self):
+                return False
+
+        response = await events_router.stream_availability(event_id, ConnectedRequest())
+        # Nothing is held for a client that goes away before the first chunk
+        assert broadcaster.subscriber_count == 0
+
+        first = await response.body_iterator.__anext__()
+        assert '"tickets_sold": 0' in first
+        assert subscribed_at_read == [0, 1]
+
+        await response.body_iterator.aclose()
+        assert broadcaster.subscriber_count == 0
@@ -0,0 +1,150 @@
+import pytest
+import uuid
+from datetime import datetime, timezone, timedelta
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import READS_PRIMARY
+from app.models import Event, Venue
+from app.repositories.event import EventRepository
+from app.services.catalog import CatalogSync
+from app.services.event import EventService
+from app.utils.catalog import EventCatalog
+from app.utils.geo import normalize_address, point_ewkt
+
+NOW = datetime(2030, 1, 1, tzinfo=timezone.utc)
+
+
+def _row(event_id=None, start_days=1, version=1, sold=0, venue="Main Hall", lat=6.5, lon=3.4, title="Show"):
+    start = NOW + timedelta(days=start_days)
+    return (
+        event_id or uuid.uuid4(),
+        title,
+        None,
+        start,
+        start + timedelta(hours=2),
+        10,
+        sold,
+        version,
+        venue,
+        "1 Marina Rd",
+        lat,
+        lon,
+    )
+
+
+@pytest.mark.asyncio
+class TestEventCatalog:
+
+    async def test_get_and_update_in_place(self):
+        """Test events are read back by id and replaced by newer versions only"""
+        catalog = EventCatalog(capacity=2)
+        row = _row(title="Jazz Night")
+        catalog.apply([row, _row(), _row()], NOW)
+
+        event = catalog.get(row[0])
+        assert event.title == "Jazz Night"
+        assert event.start_time == row[3]
+
+        assert catalog.apply([_row(row[0], version=2, sold=4)], NOW) == 1
+        assert catalog.apply([_row(row[0], version=2, sold=4)], NOW) == 0
+        assert catalog.get(row[0]).available_tickets == 6
+        assert catalog.live_count == 3
+
+    async def test_listing_order_and_filters(self):
+        """Test listings are in start time order and filter like the database query"""
+        catalog = EventCatalog()
+        later, sold_out, soon = _row(start_days=5), _row(start_days=3, sold=10), _row(start_days=1, venue="Hall A")
+        catalog.apply([later, sold_out, soon], NOW)
+
+        assert [e.id for e in catalog.list_events(0, 10, NOW)] == [soon[0], sold_out[0], later[0]]
+        assert [e.id for e in catalog.list_events(0, 10, NOW, available_only=True)] == [soon[0], later[0]]
+        assert [e.id for e in catalog.list_events(0, 10, NOW, venue_location="Hall A")] == [soon[0]]
+        assert catalog.list_events(0, 10, NOW, venue_location="Nowhere") == []
+        assert [e.id for e in catalog.list_events(1, 1, NOW)] == [sold_out[0]]
+
+        # A moved start time re-orders the listing
+        catalog.apply([_row(later[0], start_days=0.5, version=2)], NOW)
+        assert catalog.list_events(0, 1, NOW)[0].id == later[0]
+
+    async def test_ended_events_are_dropped(self):
+        """Test events that have ended leave the catalog"""
+        catalog = EventCatalog()
+        row = _row(start_days=1)
+        catalog.apply([row, _row(start_days=10)], NOW)
+
+        assert catalog.prune(NOW + timedelta(days=2)) == 1
+        assert catalog.get(row[0]) is None
+        assert catalog.live_count == 1
+
+    async def test_near(self):
+        """Test nearby events are returned nearest first within the radius"""
+        catalog = EventCatalog()
+        here, close, far = _row(lat=6.5, lon=3.4), _row(lat=6.6, lon=3.4), _row(lat=9.0, lon=7.4)
+        catalog.apply([far, close, here], NOW)
+
+        results = catalog.near(6.5, 3.4, 50, 0, 10, NOW)
+
+        assert [event.id for event, _ in results] == [here[0], close[0]]
+        assert results[1][1] == pytest.approx(11.1, abs=0.2)
+
+    async def test_memory_report(self):
+        """Test memory use is reported per event"""
+        catalog = EventCatalog()
+        catalog.apply([_row(venue="Arena") for _ in range(100)], NOW)
+
+        report = catalog.memory_report()
+
+        assert report["events"] == 100
+        assert report["bytes_per_event"] > 0
+        assert catalog.strings.values.count("Arena") == 1
+
+
+@pytest.mark.asyncio
+class TestCatalogReads:
+
+    async def test_primary_pinned_sessions_skip_catalog(self, monkeypatch):
+        """Test requests pinned to the primary for read-your-writes never read the catalog"""
+        catalog = EventCatalog()
+        row = _row()
+        catalog.apply([row], NOW)
+        monkeypatch.setattr("app.services.event.current_catalog", lambda: catalog)
+
+        session = AsyncSession()
+        assert await EventService(session).get_event_version(row[0]) == 1
+
+        session.info[READS_PRIMARY] = True
+        assert EventService(session)._catalog() is None
+        await session.close()
+
+
+@pytest.mark.asyncio
+class TestCatalogSync:
+
+    async def test_load_then_poll_changes(self, db_session: AsyncSession):
+        """Test the first sync loads upcoming events and later ones pick up writes"""
+        now = datetime.now(timezone.utc)
+        event = Event(
+            id=uuid.uuid4(),
+            title="Afrobeats Live",
+            start_time=now + timedelta(days=2),
+            end_time=now + timedelta(days=2, hours=3),
+            total_tickets=50,
+            tickets_sold=0,
+            venue=Venue(
+                location="Eko Arena",
+                address="1 Ozumba Mbadiwe Ave, Lagos",
+                address_key=normalize_address("1 Ozumba Mbadiwe Ave, Lagos"),
+                latitude=6.43,
+                longitude=3.42,
+                geo_location=point_ewkt(3.42, 6.43),
+            ),
+        )
+        db_session.add(event)
+        await db_session.commit()
+        sync = CatalogSync(EventCatalog(), None, interval_seconds=0, overlap_seconds=5)
+
+        await sync.sync(db_session)
+        assert sync.catalog.get(event.id).tickets_sold == 0
+
+        await EventRepository(db_session).increment_tickets_sold(event.id, 3)
+        await sync.sync(db_session)
+        assert sync.catalog.get(event.id).tickets_sold == 3
@@ -1,7 +1,13 @@
 import pytest
 from httpx import AsyncClient
 from datetime import datetime, timezone, timedelta
-from app.models import Event
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models import Event, User, Ticket, TicketStatus, Venue
+from app.repositories.event import EventRepository
+from app.schemas.event import EventRecord
+from app.utils.geo import normalize_address, point_ewkt
+import uuid
 
 
 @pytest.mark.asyncio
@@ -34,6 +40,35 @@ class TestEvents:
         assert data["available_tickets"] == 500
         assert "id" in data
 
+    async def test_create_events_share_venue(self, client: AsyncClient, db_session: AsyncSession):
+        """Test events at the same address, however it's written, share one venue"""
+        now = datetime.now(timezone.utc)
+        event_ids = []
+        for address in ["12 Marina Rd., Lagos", "12 marina rd  LAGOS"]:
+            response = await client.post(
+                "/api/v1/events",
+                json={
+                    "title": "Harbour Show",
+                    "start_time": (now + timedelta(days=5)).isoformat(),
+                    "end_time": (now + timedelta(days=5, hours=2)).isoformat(),
+                    "total_tickets": 20,
+                    "venue": {
+                        "location": "Harbour Hall",
+                        "address": address,
+                        "latitude": 6.45,
+                        "longitude": 3.39,
+                    },
+                },
+            )
+            assert response.status_code == 201
+            assert response.json()["venue"]["address"] == "12 Marina Rd., Lagos"
+            event_ids.append(uuid.UUID(response.json()["id"]))
+
+        result = await db_session.execute(
+            select(Event.venue_id).where(Event.id.in_(event_ids))
+        )
+        assert len(set(result.scalars().all())) == 1
+
     async def test_list_events(self, client: AsyncClient, sample_event: Event):
         """Test listing all events"""
         response = await client.get("/api/v1/events")
@@ -60,3 +95,273 @@ class TestEvents:
 
         assert response.status_code == 404
         assert "not found" in response.json()["detail"].lower()
+
+
+@pytest.mark.asyncio
+class TestConditionalGet:
+
+    async def test_event_etag_and_not_modified(self, client: AsyncClient, sample_event: Event):
+        """Test GET /events/{id} sends an ETag and answers a matching If-None-Match with 304"""
+        response = await client.get(f"/api/v1/events/{sample_event.id}")
+        etag = response.headers["etag"]
+
+        response = await client.get(
+            f"/api/v1/events/{sample_event.id}", headers={"If-None-Match": etag}
+        )
+
+        assert response.status_code == 304
+        assert response.headers["etag"] == etag
+        assert response.content == b""
+
+    async def test_ticket_sale_changes_etag(
+        self, client: AsyncClient, db_session: AsyncSession, sample_event: Event
+    ):
+        """Test a tickets_sold change bumps the version, so the old ETag no longer matches"""
+        response = await client.get(f"/api/v1/events/{sample_event.id}")
+        etag, version = response.headers["etag"], response.json()["version"]
+        list_etag = (await client.get("/api/v1/events")).headers["etag"]
+
+        await EventRepository(db_session).increment_tickets_sold(sample_event.id)
+
+        response = await client.get(
+            f"/api/v1/events/{sample_event.id}", headers={"If-None-Match": etag}
+        )
+        assert response.status_code == 200
+        assert response.json()["version"] == version + 1
+        assert response.headers["etag"] != etag
+
+        response = await client.get("/api/v1/events", headers={"If-None-Match": list_etag})
+        assert response.status_code == 200
+
+    async def test_list_not_modified(self, client: AsyncClient, sample_event: Event):
+        """Test the listing answers a matching If-None-Match with 304"""
+        etag = (await client.get("/api/v1/events")).headers["etag"]
+
+        response = await client.get("/api/v1/events", headers={"If-None-Match": etag})
+
+        assert response.status_code == 304
+
+
+def _venue(location: str, address: str, latitude: float = 6.45, longitude: float = 3.39) -> Venue:
+    return Venue(
+        location=location,
+        address=address,
+        address_key=normalize_address(address),
+        latitude=latitude,
+        longitude=longitude,
+        geo_location=point_ewkt(longitude, latitude),
+    )
+
+
+def _listing_event(start_time: datetime, venue: Venue, **overrides) -> Event:
+    data = dict(
+        id=uuid.uuid4(),
+        title="Listing Event",
+        start_time=start_time,
+        end_time=start_time + timedelta(hours=2),
+        total_tickets=10,
+        tickets_sold=0,
+        venue=venue,
+    )
+    data.update(overrides)
+    return Event(**data)
+
+
+@pytest.mark.asyncio
+class TestEventListingFilters:
+
+    async def _seed(self, db_session: AsyncSession):
+        now = datetime.now(timezone.utc)
+        main_hall = _venue("Main Hall", "1 Marina Rd, Lagos")
+        hall_a = _venue("Hall A", "2 Marina Rd, Lagos")
+        db_session.add_all(
+            [
+                _listing_event(now - timedelta(days=2), main_hall, title="Past"),
+                _listing_event(now + timedelta(days=1), hall_a, title="Soon"),
+                _listing_event(now + timedelta(days=3), hall_a, title="Sold Out", tickets_sold=10),
+                _listing_event(now + timedelta(days=5), main_hall, title="Later"),
+            ]
+        )
+        await db_session.commit()
+        return now
+
+    async def test_listing_ordered_by_start_time(self, client: AsyncClient, db_session: AsyncSession):
+        """Test events are listed by start time and paginated in that order"""
+        await self._seed(db_session)
+
+        response = await client.get("/api/v1/events", params={"skip": 1, "limit": 2})
+
+        assert response.status_code == 200
+        assert [e["title"] for e in response.json()] == ["Soon", "Sold Out"]
+
+    async def test_upcoming_and_available_filters(self, client: AsyncClient, db_session: AsyncSession):
+        """Test upcoming hides started events and available_only hides sold out ones"""
+        await self._seed(db_session)
+
+        response = await client.get(
+            "/api/v1/events", params={"upcoming": True, "available_only": True}
+        )
+
+        assert response.status_code == 200
+        assert [e["title"] for e in response.json()] == ["Soon", "Later"]
+
+    async def test_venue_and_date_range_filters(self, client: AsyncClient, db_session: AsyncSession):
+        """Test filtering by venue and by a start time window"""
+        now = await self._seed(db_session)
+
+        response = await client.get("/api/v1/events", params={"venue_location": "Hall A"})
+        assert [e["title"] for e in response.json()] == ["Soon", "Sold Out"]
+
+        response = await client.get(
+            "/api/v1/events",
+            params={
+                "start_from": (now + timedelta(days=2)).isoformat(),
+                "start_to": (now + timedelta(days=6)).isoformat(),
+            },
+        )
+        assert [e["title"] for e in response.json()] == ["Sold Out", "Later"]
+
+    async def test_listing_returns_records(self, db_session: AsyncSession):
+        """Test listing reads plain records rather than session-tracked entities"""
+        await self._seed(db_session)
+        db_session.expunge_all()
+
+        events = await EventRepository(db_session).list_events(venue_location="Hall A")
+
+        assert all(isinstance(event, EventRecord) for event in events)
+        assert [(e.title, e.venue_location) for e in events] == [
+            ("Soon", "Hall A"),
+            ("Sold Out", "Hall A"),
+        ]
+        assert events[1].available_tickets == 0
+        assert not list(db_session.identity_map.values())
+
+    async def test_invalid_date_range(self, client: AsyncClient):
+        """Test a start_to before start_from is rejected"""
+        now = datetime.now(timezone.utc)
+
+        response = await client.get(
+            "/api/v1/events",
+            params={
+                "start_from": now.isoformat(),
+                "start_to": (now - timedelta(days=1)).isoformat(),
+            },
+        )
+
+        assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+class TestEventBatch:
+
+    async def test_batch_in_request_order(self, client: AsyncClient, db_session: AsyncSession):
+        """Test events come back in the order asked for, unknown ids marked not found"""
+        now = datetime.now(timezone.utc)
+        venue = _venue("Main Hall", "1 Marina Rd, Lagos")
+        first = _listing_event(now + timedelta(days=1), venue, title="First")
+        second = _listing_event(now + timedelta(days=2), venue, title="Second")
+        db_session.add_all([first, second])
+        await db_session.commit()
+        missing = uuid.uuid4()
+
+        response = await client.get(
+            "/api/v1/events:batch", params={"ids": f"{second.id},{missing},{first.id}"}
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert [item["id"] for item in data] == [str(second.id), str(missing), str(first.id)]
+        assert [item["found"] for item in data] == [True, False, True]
+        assert data[0]["event"]["title"] == "Second"
+        assert data[1]["event"] is None
+
+        response = await client.post(
+            "/api/v1/events:batch", json={"ids": [str(first.id), str(first.id)]}
+        )
+        assert [item["event"]["title"] for item in response.json()] == ["First", "First"]
+
+    async def test_batch_rejects_bad_ids(self, client: AsyncClient):
+        """Test malformed, missing and too many ids are rejected"""
+        response = await client.get("/api/v1/events:batch", params={"ids": "not-a-uuid"})
+        assert response.status_code == 422
+
+        response = await client.get("/api/v1/events:batch")
+        assert response.status_code == 422
+
+        too_many = ",".join(str(uuid.uuid4()) for _ in range(501))
+        response = await client.get("/api/v1/events:batch", params={"ids": too_many})
+        assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+class TestTicketsSoldReconciliation:
+
+    async def test_reconcile_corrects_drifted_counters(
+        self, db_session: AsyncSession, sample_user: User, sample_event: Event
+    ):
+        """Test tickets_sold is reset to the number of reserved and paid tickets"""
+        created_at = datetime.now(timezone.utc) - timedelta(minutes=10)
+        for ticket_status in (TicketStatus.RESERVED, TicketStatus.PAID, TicketStatus.EXPIRED):
+            db_session.add(
+                Ticket(
+                    id=uuid.uuid4(),
+                    user_id=sample_user.id,
+                    event_id=sample_event.id,
+                    status=ticket_status,
+                    created_at=created_at,
+                )
+            )
+        sample_event.tickets_sold = 7
+        sample_event.updated_at = created_at
+        await db_session.commit()
+
+        report = await EventRepository(db_session).reconcile_tickets_sold(chunk_size=10)
+
+        assert report["events_corrected"] == 1
+        assert report["total_drift"] == 5
+        await db_session.refresh(sample_event)
+        assert sample_event.tickets_sold == 2
+
+    async def test_reconcile_skips_events_with_recent_tickets(
+        self, db_session: AsyncSession, sample_user: User, sample_event: Event
+    ):
+        """Test events with in-flight reservations are left for the next run"""
+        db_session.add(
+            Ticket(
+                id=uuid.uuid4(),
+                user_id=sample_user.id,
+                event_id=sample_event.id,
+                status=TicketStatus.RESERVED,
+            )
+        )
+        await db_session.commit()
+
+        report = await EventRepository(db_session).reconcile_tickets_sold(
+            grace_seconds=60
+        )
+
+        assert report["events_corrected"] == 0
+
+    async def test_reconcile_skips_events_with_recent_counter_changes(
+        self, db_session: AsyncSession, sample_user: User, sample_event: Event
+    ):
+        """Test an event whose counter just changed (an expiry or reservation) is left alone"""
+        db_session.add(
+            Ticket(
+                id=uuid.uuid4(),
+                user_id=sample_user.id,
+                event_id=sample_event.id,
+                status=TicketStatus.EXPIRED,
+                created_at=datetime.now(timezone.utc) - timedelta(minutes=10),
+            )
+        )
+        sample_event.tickets_sold = 1
+        await db_session.commit()
+
+        report = await EventRepository(db_session).reconcile_tickets_sold(
+            grace_seconds=60
+        )
+
+        assert report["events_corrected"] == 0
+        await db_session.refresh(sample_event)
+        assert sample_event.tickets_sold == 1
@@ -0,0 +1,151 @@
+import time
+import uuid
+from datetime import datetime, timezone, timedelta
+from app.workers.expiration_consumer import (
+    EXPIRE_BASKET_TASK,
+    EXPIRE_TASK,
+    ExpirationConsumer,
+    parse_expire_message,
+)
+
+
+class FakeMessage:
+    def __init__(self, ticket_id, eta=None, task=EXPIRE_TASK):
+        self.headers = {"task": task, "eta": eta.isoformat() if eta else None}
+        self.body = ([str(ticket_id)], {}, {})
+        self.state = "received"
+
+    def ack(self):
+        self.state = "acked"
+
+    def requeue(self):
+        self.state = "requeued"
+
+    def reject(self):
+        self.state = "rejected"
+
+
+def make_consumer(batches, batch_size=2, fail=False, poison=(), **options):
+    async def expire(ticket_ids):
+        if fail or set(ticket_ids) & set(poison):
+            raise ConnectionError("database unavailable")
+        batches.append(ticket_ids)
+        return len(ticket_ids)
+
+    return ExpirationConsumer(
+        batch_size=batch_size, poll_seconds=0.1, expire=expire, **options
+    )
+
+
+class TestExpirationConsumer:
+
+    def test_parse_celery_message(self):
+        """Test the ticket id and ETA are read from a Celery task message"""
+        ticket_id = uuid.uuid4()
+        eta = datetime(2030, 1, 1, 12, 0, tzinfo=timezone.utc)
+        message = FakeMessage(ticket_id, eta)
+
+        parsed = parse_expire_message(message.headers, message.body)
+
+        assert parsed == ([ticket_id], eta.timestamp())
+
+    def test_basket_counts_towards_batch_size(self):
+        """Test a basket message expires all its tickets and batches are sized in tickets"""
+        batches = []
+        consumer = make_consumer(batches, batch_size=3)
+        basket = FakeMessage(uuid.uuid4())
+        basket.headers["task"] = EXPIRE_BASKET_TASK
+        basket.body = ([str(uuid.uuid4()), [str(uuid.uuid4()) for _ in range(2)]], {}, {})
+        single = FakeMessage(uuid.uuid4())
+        for message in [basket, single, FakeMessage(uuid.uuid4())]:
+            consumer.on_message(message.body, message)
+
+        assert consumer.flush() == 3
+
+        assert [len(batch) for batch in batches] == [3, 1]
+        assert basket.state == "acked"
+
+    def test_due_messages_expire_in_batches(self):
+        """Test due messages are expired batch_size at a time and acked after each batch"""
+        batches = []
+        consumer = make_consumer(batches)
+        now = datetime.now(timezone.utc)
+        due = [FakeMessage(uuid.uuid4(), now - timedelta(seconds=i)) for i in range(5)]
+        later = FakeMessage(uuid.uuid4(), now + timedelta(minutes=2))
+        for message in [*due, later]:
+            consumer.on_message(message.body, message)
+
+        assert consumer.flush() == 5
+
+        assert [len(batch) for batch in batches] == [2, 2, 1]
+        assert all(message.state == "acked" for message in due)
+        assert later.state == "received"
+        assert len(consumer.buffer) == 1
+
+    def test_failed_batch_is_held_for_retry(self):
+        """Test a batch that fails to commit is held back for a later retry, not acked"""
+        consumer = make_consumer([], fail=True, retry_base_delay=5.0)
+        message = FakeMessage(uuid.uuid4())
+        consumer.on_message(message.body, message)
+        now = time.time()
+
+        assert consumer.flush(now) == 0
+        assert message.state == "received"
+        assert consumer.buffer.next_due() == now + 5.0
+        assert consumer.flush(now + 1) == 0  # backing off
+
+    def test_poison_ticket_is_isolated(self):
+        """Test retries halve the batch until the failing ticket is alone, acking the rest"""
+        poison = uuid.uuid4()
+        batches = []
+        consumer = make_consumer(batches, batch_size=4, poison=[poison], retry_base_delay=0.0)
+        ticket_ids = [uuid.uuid4(), poison, uuid.uuid4(), uuid.uuid4()]
+        messages = [FakeMessage(ticket_id) for ticket_id in ticket_ids]
+        for message in messages:
+            consumer.on_message(message.body, message)
+
+        now = time.time()
+        for attempt in range(4):
+            consumer.flush(now + attempt)
+
+        assert [message.state for message in messages] == ["acked", "received", "acked", "acked"]
+        assert [len(batch) for batch in batches] == [2, 1]
+
+    def test_repeatedly_failing_message_dead_lettered(self):
+        """Test a message that keeps failing on its own is rejected after max_attempts"""
+        consumer = make_consumer([], fail=True, max_attempts=3, retry_base_delay=0.0)
+        message = FakeMessage(uuid.uuid4())
+        consumer.on_message(message.body, message)
+
+        now = time.time()
+        for attempt in range(3):
+            assert message.state == "received"
+            consumer.flush(now + attempt)
+
+        assert message.state == "rejected"
+        assert len(consumer.buffer) == 0
+
+    def test_resent_message_is_dropped(self):
+        """Test a message resent under the task id of one already held is acked, not held twice"""
+        consumer = make_consumer([])
+        message = FakeMessage(uuid.uuid4())
+        message.headers["id"] = "outbox-row-1"
+        resent = FakeMessage(uuid.UUID(message.body[0][0]))
+        resent.headers["id"] = "outbox-row-1"
+
+        consumer.on_message(message.body, message)
+        consumer.on_message(resent.body, resent)
+
+        assert len(consumer.buffer) == 1
+        assert resent.state == "acked"
+        assert message.state == "received"
+
+    def test_malformed_message_rejected(self):
+        """Test messages for other tasks are rejected rather than held"""
+        consumer = make_consumer([])
+        message = FakeMessage(uuid.uuid4(), task="app.workers.tasks.other")
+
+        consumer.on_message(message.body, message)
+
+        assert message.state == "rejected"
+        assert len(consumer.buffer) == 0
@@ -0,0 +1,155 @@
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import event as sa_event
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models import Event, User
+from app.repositories.event import EventRepository
+from app.schemas.ticket import TicketCreate
+from app.services.ticket import TicketService
+from app.utils.metrics import metrics
+from app.utils.optimistic import RetriesExhausted, VersionConflict, retry_on_conflict
+
+
+@pytest.mark.asyncio
+class TestRetryOnConflict:
+
+    async def test_retries_until_attempt_succeeds(self):
+        """Test conflicting attempts are retried and counted until one gets through"""
+        calls = 0
+
+        async def attempt():
+            nonlocal calls
+            calls += 1
+            if calls < 3:
+                raise VersionConflict()
+            return "reserved"
+
+        conflicts = metrics.get("optimistic_conflicts_total", operation="test_success")
+
+        result = await retry_on_conflict("test_success", attempt, attempts=5, base_delay=0)
+
+        assert result == "reserved"
+        assert calls == 3
+        assert metrics.get("optimistic_conflicts_total", operation="test_success") == conflicts + 2
+        assert metrics.get("optimistic_retries_total", operation="test_success") == 2
+
+    async def test_gives_up_after_bounded_attempts(self):
+        """Test an operation that keeps conflicting stops after `attempts` tries"""
+        calls = 0
+
+        async def attempt():
+            nonlocal calls
+            calls += 1
+            raise VersionConflict()
+
+        with pytest.raises(RetriesExhausted):
+            await retry_on_conflict("test_exhausted", attempt, attempts=3, base_delay=0)
+
+        assert calls == 3
+        assert metrics.get("optimistic_retries_total", operation="test_exhausted") == 2
+        assert metrics.get("optimistic_retries_exhausted_total", operation="test_exhausted") == 1
+
+    async def test_falls_back_once_attempts_run_out(self):
+        """Test the fallback runs, instead of giving up, after `attempts` conflicts"""
+        calls = 0
+
+        async def attempt():
+            nonlocal calls
+            calls += 1
+            raise VersionConflict()
+
+        async def fallback():
+            return "reserved"
+
+        result = await retry_on_conflict(
+            "test_fallback", attempt, attempts=3, base_delay=0, fallback=fallback
+        )
+
+        assert result == "reserved"
+        assert calls == 3
+        assert metrics.get("optimistic_fallbacks_total", operation="test_fallback") == 1
+        assert metrics.get("optimistic_retries_exhausted_total", operation="test_fallback") == 0
+
+    async def test_other_errors_are_not_retried(self):
+        """Test only version conflicts are retried"""
+        calls = 0
+
+        async def attempt():
+            nonlocal calls
+            calls += 1
+            raise ValueError("sold out")
+
+        with pytest.raises(ValueError):
+            await retry_on_conflict("test_error", attempt, attempts=3, base_delay=0)
+
+        assert calls == 1
+
+
+@pytest.mark.asyncio
+class TestGuardedIncrement:
+
+    async def test_stops_at_capacity(self, db_session: AsyncSession, sample_event: Event):
+        """Test the guarded increment adds tickets until total_tickets, then refuses"""
+        repo = EventRepository(db_session)
+
+        assert await repo.add_tickets_sold_if_available(sample_event, 99)
+        assert await repo.add_tickets_sold_if_available(sample_event, 1)
+        assert not await repo.add_tickets_sold_if_available(sample_event, 1)
+
+        await db_session.refresh(sample_event)
+        assert sample_event.tickets_sold == sample_event.total_tickets
+
+    async def test_contended_reservation_falls_back(
+        self,
+        client: AsyncClient,
+        db_session: AsyncSession,
+        sample_user: User,
+        sample_event: Event,
+        monkeypatch,
+    ):
+        """Test a reservation whose compare-and-swap keeps missing still goes through"""
+
+        async def always_conflicts(self, event, amount, before_commit=None):
+            await self.db.rollback()
+            return False
+
+        monkeypatch.setattr(
+            EventRepository, "add_tickets_sold_if_unchanged", always_conflicts
+        )
+        monkeypatch.setattr("app.utils.optimistic.settings.optimistic_retry_base_delay", 0)
+        ticket_data = {"user_id": str(sample_user.id), "event_id": str(sample_event.id)}
+
+        response = await client.post("/api/v1/tickets", json=ticket_data)
+
+        assert response.status_code == 201
+        await db_session.refresh(sample_event)
+        assert sample_event.tickets_sold == 1
+
+
+@pytest.mark.asyncio
+class TestReservationWriteOrder:
+
+    async def test_rollup_written_after_counter(
+        self,
+        db_session: AsyncSession,
+        sample_user: User,
+        sample_event: Event,
+    ):
+        """Test a reservation writes the event counter before locking the rollup row"""
+        statements = []
+
+        def record(conn, cursor, statement, *args):
+            statements.append(statement.lstrip().split("\n")[0].lower())
+
+        engine = db_session.bind.sync_engine
+        sa_event.listen(engine, "before_cursor_execute", record)
+        try:
+            await TicketService(db_session).reserve_ticket(
+                TicketCreate(user_id=sample_user.id, event_id=sample_event.id)
+            )
+        finally:
+            sa_event.remove(engine, "before_cursor_execute", record)
+
+        counter = next(i for i, sql in enumerate(statements) if sql.startswith("update events"))
+        rollup = next(i for i, sql in enumerate(statements) if "event_ticket_stats" in sql)
+        assert counter < rollup
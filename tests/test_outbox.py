@@ -0,0 +1,60 @@
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models import User, Event, OutboxMessage
+from app.workers.outbox_relay import OutboxRelay
+from datetime import datetime, timezone, timedelta
+
+
+@pytest.mark.asyncio
+class TestTaskOutbox:
+
+    async def test_reservation_writes_expiration_to_outbox(
+        self, client: AsyncClient, db_session: AsyncSession, sample_user: User, sample_event: Event
+    ):
+        """Test a reservation stages its expiration in the outbox instead of calling the broker"""
+        ticket_data = {"user_id": str(sample_user.id), "event_id": str(sample_event.id)}
+
+        response = await client.post("/api/v1/tickets", json=ticket_data)
+
+        assert response.status_code == 201
+        messages = (await db_session.execute(select(OutboxMessage))).scalars().all()
+        assert len(messages) == 1
+        assert messages[0].task == "app.workers.tasks.expire_ticket"
+        assert messages[0].args == [response.json()["id"]]
+        assert messages[0].eta > datetime.now(timezone.utc) + timedelta(seconds=60)
+
+    async def test_refused_reservation_leaves_no_message(
+        self, client: AsyncClient, db_session: AsyncSession, sample_user: User, sample_event: Event
+    ):
+        """Test nothing is scheduled for a reservation that didn't commit"""
+        sample_event.tickets_sold = sample_event.total_tickets
+        await db_session.commit()
+        ticket_data = {"user_id": str(sample_user.id), "event_id": str(sample_event.id)}
+
+        response = await client.post("/api/v1/tickets", json=ticket_data)
+
+        assert response.status_code == 400
+        assert not (await db_session.execute(select(OutboxMessage))).scalars().all()
+
+    async def test_relay_deletes_only_sent_messages(
+        self, client: AsyncClient, db_session: AsyncSession, sample_user: User, sample_event: Event
+    ):
+        """Test the relay removes what it sent and keeps what the broker didn't take"""
+        ticket_data = {"user_id": str(sample_user.id), "event_id": str(sample_event.id)}
+        for _ in range(3):
+            await client.post("/api/v1/tickets", json=ticket_data)
+        published = []
+
+        def publish(messages):
+            # The broker takes the first message, then goes away
+            published.extend(message.args for message in messages[:1])
+            return [message.id for message in messages[:1]]
+
+        relay = OutboxRelay(batch_size=10, publish=publish)
+        assert await relay.relay_batch(db_session) == 1
+
+        remaining = (await db_session.execute(select(OutboxMessage))).scalars().all()
+        assert len(remaining) == 2
+        assert published[0] not in [message.args for message in remaining]
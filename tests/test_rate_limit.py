@@ -0,0 +1,92 @@
+import pytest
+from app.utils.rate_limit import InMemoryReservationLimiter, RateLimited
+import uuid
+
+
+def make_limiter(**overrides) -> InMemoryReservationLimiter:
+    options = dict(
+        user_limit=5,
+        user_event_limit=3,
+        window_seconds=60,
+        max_holds=2,
+        hold_seconds=120,
+    )
+    options.update(overrides)
+    return InMemoryReservationLimiter(**options)
+
+
+@pytest.mark.asyncio
+class TestReservationLimiter:
+
+    async def test_hold_cap_per_user_per_event(self):
+        """Test a user can't hold more unpaid tickets for one event than the cap"""
+        limiter = make_limiter()
+        user_id, event_id = uuid.uuid4(), uuid.uuid4()
+
+        await limiter.acquire(user_id, event_id, uuid.uuid4())
+        await limiter.acquire(user_id, event_id, uuid.uuid4())
+
+        with pytest.raises(RateLimited) as exc_info:
+            await limiter.acquire(user_id, event_id, uuid.uuid4())
+        assert "unpaid" in exc_info.value.reason
+
+        # Holds on other events are counted separately
+        await limiter.acquire(user_id, uuid.uuid4(), uuid.uuid4())
+
+    async def test_released_hold_frees_capacity(self):
+        """Test paying (releasing) a hold lets the user reserve again"""
+        limiter = make_limiter()
+        user_id, event_id = uuid.uuid4(), uuid.uuid4()
+        first, second = uuid.uuid4(), uuid.uuid4()
+
+        await limiter.acquire(user_id, event_id, first)
+        await limiter.acquire(user_id, event_id, second)
+        await limiter.release_hold(user_id, event_id, first)
+
+        await limiter.acquire(user_id, event_id, uuid.uuid4())
+
+    async def test_sliding_window_per_user(self):
+        """Test attempts beyond the per-user limit are rejected with a retry hint"""
+        limiter = make_limiter(max_holds=100, user_event_limit=100)
+        user_id = uuid.uuid4()
+
+        for _ in range(5):
+            await limiter.acquire(user_id, uuid.uuid4(), uuid.uuid4())
+
+        with pytest.raises(RateLimited) as exc_info:
+            await limiter.acquire(user_id, uuid.uuid4(), uuid.uuid4())
+        assert 1 <= exc_info.value.retry_after <= 60
+
+        # Other users are unaffected
+        await limiter.acquire(uuid.uuid4(), uuid.uuid4(), uuid.uuid4())
+
+    async def test_expired_holds_age_out(self):
+        """Test holds stop counting once the reservation timeout has passed"""
+        limiter = make_limiter(max_holds=1, hold_seconds=0)
+        user_id, event_id = uuid.uuid4(), uuid.uuid4()
+
+        await limiter.acquire(user_id, event_id, uuid.uuid4())
+        await limiter.acquire(user_id, event_id, uuid.uuid4())
+
+
+@pytest.mark.asyncio
+class TestReservationHolds:
+
+    async def test_failed_reservation_releases_hold(self):
+        """Test a reservation failing with an unexpected error gives its hold back"""
+        from app.schemas.ticket import TicketCreate
+        from app.services.ticket import TicketService
+
+        limiter = make_limiter(max_holds=1)
+        service = TicketService(None, limiter=limiter)
+        user_id, event_id = uuid.uuid4(), uuid.uuid4()
+
+        async def database_down(*args):
+            raise ConnectionError("database unavailable")
+
+        service._reserve = database_down
+        with pytest.raises(ConnectionError):
+            await service.reserve_ticket(TicketCreate(user_id=user_id, event_id=event_id))
+
+        # The cap of one hold isn't taken by the failed attempt
+        await limiter.acquire(user_id, event_id, uuid.uuid4())
@@ -0,0 +1,129 @@
+import asyncio
+import pytest
+import time
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models import Event
+from app.repositories.event import EventRepository
+from app.utils.response_cache import (
+    CachedResponse,
+    ResponseCache,
+    cache_key,
+    event_tag,
+    response_cache,
+)
+
+
+def _entry(*tags: str, age: float = 0.0) -> CachedResponse:
+    return CachedResponse(200, [("content-type", "application/json")], b"[]", tags, time.time() - age)
+
+
+@pytest.mark.asyncio
+class TestResponseCache:
+
+    async def test_key_normalizes_query_order(self):
+        """Test the same parameters in any order share a cache key"""
+        assert cache_key("/api/v1/events", b"limit=5&skip=0") == cache_key(
+            "/api/v1/events", b"skip=0&limit=5"
+        )
+        assert cache_key("/api/v1/events", b"") == "/api/v1/events"
+
+    async def test_fresh_then_stale_then_gone(self):
+        """Test entries are fresh, then served stale, then dropped"""
+        cache = ResponseCache(fresh_seconds=1, stale_seconds=5)
+        await cache.set("fresh", _entry())
+        await cache.set("stale", _entry(age=2))
+        await cache.set("gone", _entry(age=10))
+
+        assert cache.is_fresh(await cache.get("fresh"))
+        assert not cache.is_fresh(await cache.get("stale"))
+        assert await cache.get("gone") is None
+
+    async def test_tag_invalidation(self):
+        """Test invalidating an event's tag drops only responses showing it"""
+        cache = ResponseCache(fresh_seconds=10, stale_seconds=10)
+        await cache.set("a", _entry(event_tag(1), event_tag(2)))
+        await cache.set("b", _entry(event_tag(3)))
+
+        await cache.invalidate([event_tag(2)])
+
+        assert await cache.get("a") is None
+        assert await cache.get("b") is not None
+
+    async def test_render_across_invalidation_not_stored(self):
+        """Test a response rendered before an invalidation is not cached after it"""
+        cache = ResponseCache(fresh_seconds=10, stale_seconds=10)
+        generation = cache.generation
+
+        await cache.invalidate([event_tag(1)])
+        await cache.set("a", _entry(event_tag(1)), generation)
+
+        assert await cache.get("a") is None
+
+    async def test_render_across_other_invalidation_stored(self):
+        """Test an invalidation only holds back responses carrying its tags"""
+        cache = ResponseCache(fresh_seconds=10, stale_seconds=10)
+        generation = cache.generation
+
+        await cache.invalidate([event_tag(2)])
+        await cache.set("a", _entry(event_tag(1)), generation)
+
+        assert await cache.get("a") is not None
+
+    async def test_count_invalidations_are_batched(self):
+        """Test ticket count changes within the interval go out together in one invalidation"""
+        cache = ResponseCache(fresh_seconds=10, stale_seconds=10, count_invalidate_seconds=60)
+        await cache.set("a", _entry(event_tag(1)))
+        await cache.set("b", _entry(event_tag(2)))
+
+        await cache.invalidate_counts([event_tag(1)])  # first batch goes out at once
+        await cache.set("a", _entry(event_tag(1)))
+        await cache.invalidate_counts([event_tag(1)])
+        await cache.invalidate_counts([event_tag(2)])
+
+        assert await cache.get("a") is not None
+        assert await cache.get("b") is not None
+
+        await cache.flush_counts()
+
+        assert await cache.get("a") is None
+        assert await cache.get("b") is None
+
+    async def test_count_invalidation_flushed_without_later_change(self):
+        """Test the last count change of a burst goes out once the interval is up"""
+        cache = ResponseCache(fresh_seconds=10, stale_seconds=10, count_invalidate_seconds=0.05)
+        await cache.invalidate_counts([event_tag(2)])  # starts the interval
+        await cache.set("a", _entry(event_tag(1)))
+
+        await cache.invalidate_counts([event_tag(1)])
+        assert await cache.get("a") is not None
+
+        await asyncio.sleep(0.1)
+
+        assert await cache.get("a") is None
+
+
+@pytest.mark.asyncio
+class TestCachedListings:
+
+    async def test_listing_served_from_cache(self, client: AsyncClient, sample_event: Event):
+        """Test a repeated listing request is a cache hit"""
+        first = await client.get("/api/v1/events", params={"limit": 10, "skip": 0})
+        second = await client.get("/api/v1/events", params={"skip": 0, "limit": 10})
+
+        assert first.headers["x-cache"] == "MISS"
+        assert second.headers["x-cache"] == "HIT"
+        assert second.json() == first.json()
+
+    async def test_ticket_sale_invalidates_listing(
+        self, client: AsyncClient, db_session: AsyncSession, sample_event: Event
+    ):
+        """Test a change in an event's ticket count drops cached listings by the next batch"""
+        await client.get("/api/v1/events")
+
+        await EventRepository(db_session).increment_tickets_sold(sample_event.id)
+        await response_cache.flush_counts()
+        response = await client.get("/api/v1/events")
+
+        assert response.headers["x-cache"] == "MISS"
+        assert response.json()[0]["tickets_sold"] == 1
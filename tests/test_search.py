@@ -0,0 +1,106 @@
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models import Event, Venue
+from app.utils.geo import normalize_address, point_ewkt
+from app.utils.search import InvertedIndex, query_terms
+from datetime import datetime, timezone, timedelta
+import uuid
+
+
+class TestInvertedIndex:
+
+    def test_prefix_match_and_ranking(self):
+        """Test terms match word prefixes and title matches outrank description matches"""
+        index = InvertedIndex()
+        in_title, in_description = uuid.uuid4(), uuid.uuid4()
+        index.add(in_title, title="Jazz Night", description="Live music")
+        index.add(in_description, title="Summit", description="Jazzy interludes")
+
+        assert [doc for doc, _ in index.search(["jazz"])] == [in_title, in_description]
+        assert [doc for doc, _ in index.search(["jaz", "night"])] == [in_title]
+        assert index.search(["rock"]) == []
+
+    def test_updates_and_removals_are_incremental(self):
+        """Test re-adding a document replaces its terms and removing drops them"""
+        index = InvertedIndex()
+        doc_id = uuid.uuid4()
+        index.add(doc_id, title="Jazz Night")
+        index.add(doc_id, title="Blues Night")
+
+        assert index.search(["jazz"]) == []
+        assert [doc for doc, _ in index.search(["blues"])] == [doc_id]
+
+        index.remove(doc_id)
+        assert index.search(["night"]) == []
+        assert len(index) == 0
+
+    def test_query_terms(self):
+        """Test queries are split into distinct lowercase word terms"""
+        assert query_terms("Jazz & BLUES jazz!") == ["jazz", "blues"]
+        assert query_terms("!!") == []
+
+
+@pytest.mark.asyncio
+class TestEventSearch:
+
+    async def add_event(self, db_session: AsyncSession, title, description, lat, lng):
+        now = datetime.now(timezone.utc)
+        event = Event(
+            title=title,
+            description=description,
+            start_time=now + timedelta(days=10),
+            end_time=now + timedelta(days=10, hours=4),
+            total_tickets=50,
+            tickets_sold=0,
+            venue=Venue(
+                location=f"{title} Venue",
+                address=f"{title} Address",
+                address_key=normalize_address(f"{title} Address"),
+                latitude=lat,
+                longitude=lng,
+                geo_location=point_ewkt(lng, lat),
+            ),
+        )
+        db_session.add(event)
+        await db_session.commit()
+        return event
+
+    async def test_search_events(
+        self, client: AsyncClient, db_session: AsyncSession, sample_event: Event
+    ):
+        """Test search matches prefixes across title and description, best first"""
+        await self.add_event(db_session, "Lagos Jazz Festival", "Jazz by the lagoon", 6.45, 3.39)
+        await self.add_event(db_session, "Book Fair", "Jazz quartet on day two", 6.5, 3.4)
+
+        response = await client.get("/api/v1/events/search", params={"q": "jaz"})
+
+        assert response.status_code == 200
+        titles = [event["title"] for event in response.json()]
+        assert titles == ["Lagos Jazz Festival", "Book Fair"]
+
+        response = await client.get("/api/v1/events/search", params={"q": "tech conf"})
+        assert [event["id"] for event in response.json()] == [str(sample_event.id)]
+
+    async def test_search_within_radius(
+        self, client: AsyncClient, db_session: AsyncSession
+    ):
+        """Test search combined with a location only returns nearby matches"""
+        await self.add_event(db_session, "Lagos Jazz Festival", None, 6.45, 3.39)
+        await self.add_event(db_session, "Abuja Jazz Night", None, 9.06, 7.49)
+
+        response = await client.get(
+            "/api/v1/events/search",
+            params={"q": "jazz", "latitude": 9.0, "longitude": 7.4, "radius_km": 50},
+        )
+
+        data = response.json()
+        assert [event["title"] for event in data] == ["Abuja Jazz Night"]
+        assert data[0]["distance_km"] < 50
+
+    async def test_search_requires_both_coordinates(self, client: AsyncClient):
+        """Test a latitude without a longitude is rejected"""
+        response = await client.get(
+            "/api/v1/events/search", params={"q": "jazz", "latitude": 9.0}
+        )
+        assert response.status_code == 400
@@ -0,0 +1,168 @@
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models import User, Event
+from app.services.ticket import TicketService
+from app.utils.seating import SeatBitmap, SeatRowLayout, seat_mask
+import time
+import uuid
+
+
+def make_bitmap(*rows):
+    layouts = [SeatRowLayout(uuid.uuid4(), section, label, seats) for section, label, seats in rows]
+    bitmap = SeatBitmap(layouts)
+    for layout in layouts:
+        bitmap.load_row(layout.row_id, 0)
+    return bitmap, layouts
+
+
+class TestSeatBitmap:
+
+    def test_claims_adjacent_seats_near_row_centre(self):
+        """Test blocks come from the best row, as close to its centre as possible"""
+        bitmap, _ = make_bitmap(("Floor", "A", 10), ("Floor", "B", 10))
+
+        block = bitmap.claim(4)
+        assert (block.label, block.seat_numbers) == ("A", [4, 5, 6, 7])
+        assert bitmap.available == 16
+
+    def test_blocks_never_span_rows(self):
+        """Test free seats at the end of one row and start of the next don't form a block"""
+        bitmap, (row_a, row_b) = make_bitmap(("Floor", "A", 4), ("Floor", "B", 4))
+        bitmap.load_row(row_a.row_id, seat_mask(1, 2))
+        bitmap.load_row(row_b.row_id, seat_mask(3, 2))
+
+        assert bitmap.claim(4) is None
+        block = bitmap.claim(2)
+        assert (block.label, block.seat_numbers) == ("A", [3, 4])
+
+    def test_section_filter_and_release(self):
+        """Test claims respect the section and released seats can be claimed again"""
+        bitmap, _ = make_bitmap(("Floor", "A", 2), ("Balcony", "A", 2))
+
+        block = bitmap.claim(2, section="Balcony")
+        assert block.section == "Balcony"
+        assert bitmap.claim(2, section="Balcony") is None
+
+        bitmap.release(block)
+        assert bitmap.claim(2, section="Balcony") == block
+
+    def test_reload_keeps_pending_claims(self):
+        """Test reloading a row from the database doesn't hand out seats still pending"""
+        bitmap, (row,) = make_bitmap(("Floor", "A", 3))
+        block = bitmap.claim(3)
+
+        bitmap.load_row(row.row_id, 0)
+        assert bitmap.claim(1) is None
+
+        bitmap.confirm(block)
+        bitmap.load_row(row.row_id, 0)
+        assert bitmap.available == 3
+
+    def test_stadium_allocation_is_sub_millisecond(self):
+        """Test best-available search on an 80,000 seat map stays well under a millisecond"""
+        bitmap, layouts = make_bitmap(
+            *[(f"S{i // 40}", str(i % 40), 100) for i in range(800)]
+        )
+        # Leave room for a block of 10 only in the last row
+        for layout in layouts[:-1]:
+            bitmap.load_row(layout.row_id, int("01" * 50, 2))
+
+        start = time.perf_counter()
+        for _ in range(100):
+            block = bitmap.claim(10)
+            bitmap.release(block)
+        elapsed_ms = (time.perf_counter() - start) * 1000 / 100
+
+        assert block.row_id == layouts[-1].row_id
+        assert elapsed_ms < 1.0
+
+
+@pytest.mark.asyncio
+class TestSeatReservations:
+
+    async def create_seat_map(self, client: AsyncClient, event: Event):
+        return await client.post(
+            f"/api/v1/events/{event.id}/seats",
+            json={
+                "sections": [
+                    {"name": "Floor", "rows": [{"label": "A", "seats": 4}]},
+                    {"name": "Balcony", "rows": [{"label": "A", "seats": 10}]},
+                ]
+            },
+        )
+
+    async def test_create_seat_map(
+        self, client: AsyncClient, sample_event: Event
+    ):
+        """Test creating a seat map sets the event's capacity and can't be repeated"""
+        response = await self.create_seat_map(client, sample_event)
+        assert response.status_code == 201
+        assert response.json()["total_seats"] == 14
+        assert response.json()["available_seats"] == 14
+
+        event = (await client.get(f"/api/v1/events/{sample_event.id}")).json()
+        assert event["total_tickets"] == 14
+
+        response = await self.create_seat_map(client, sample_event)
+        assert response.status_code == 409
+
+    async def test_reserve_adjacent_seats(
+        self, client: AsyncClient, sample_user: User, sample_event: Event
+    ):
+        """Test reserving seats returns one ticket per adjacent seat"""
+        await self.create_seat_map(client, sample_event)
+        seat_data = {
+            "user_id": str(sample_user.id),
+            "event_id": str(sample_event.id),
+            "quantity": 3,
+        }
+
+        response = await client.post("/api/v1/tickets/seats", json=seat_data)
+        assert response.status_code == 201
+        data = response.json()
+        assert (data["section"], data["row"]) == ("Floor", "A")
+        assert len(data["tickets"]) == 3
+        assert [t["seat_number"] for t in data["tickets"]] == data["seat_numbers"]
+
+        # Only one Floor seat is left, so the next block goes to the balcony
+        response = await client.post("/api/v1/tickets/seats", json=seat_data)
+        assert response.json()["section"] == "Balcony"
+
+        seat_map = (await client.get(f"/api/v1/events/{sample_event.id}/seats")).json()
+        assert seat_map["available_seats"] == 8
+
+    async def test_general_admission_refused_for_seated_event(
+        self, client: AsyncClient, sample_user: User, sample_event: Event
+    ):
+        """Test plain ticket reservations are refused once an event has a seat map"""
+        await self.create_seat_map(client, sample_event)
+        ticket_data = {"user_id": str(sample_user.id), "event_id": str(sample_event.id)}
+
+        response = await client.post("/api/v1/tickets", json=ticket_data)
+        assert response.status_code == 400
+
+    async def test_expired_ticket_releases_seat(
+        self,
+        client: AsyncClient,
+        db_session: AsyncSession,
+        sample_user: User,
+        sample_event: Event,
+    ):
+        """Test expiring a seated reservation frees its seat"""
+        await self.create_seat_map(client, sample_event)
+        response = await client.post(
+            "/api/v1/tickets/seats",
+            json={
+                "user_id": str(sample_user.id),
+                "event_id": str(sample_event.id),
+                "section": "Floor",
+                "quantity": 4,
+            },
+        )
+        ticket_id = response.json()["tickets"][0]["id"]
+
+        await TicketService(db_session).expire_ticket(uuid.UUID(ticket_id))
+
+        seat_map = (await client.get(f"/api/v1/events/{sample_event.id}/seats")).json()
+        assert seat_map["rows"][0]["available"] == 1
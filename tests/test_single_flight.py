@@ -0,0 +1,97 @@
+import pytest
+import asyncio
+from app.utils.single_flight import SingleFlight
+
+
+@pytest.mark.asyncio
+class TestSingleFlight:
+
+    async def test_concurrent_calls_share_one_run(self):
+        """Test concurrent callers of one key share the leader's result"""
+        flight = SingleFlight("test")
+        runs = 0
+
+        async def load():
+            nonlocal runs
+            runs += 1
+            await asyncio.sleep(0.01)
+            return {"title": "Jazz Night"}
+
+        results = await asyncio.gather(*(flight.do("event:1", load) for _ in range(50)))
+
+        assert runs == 1
+        assert all(result is results[0] for result in results)
+        assert flight.in_flight == 0
+
+        # Nothing is cached once the call has finished
+        await flight.do("event:1", load)
+        assert runs == 2
+
+    async def test_different_keys_run_separately(self):
+        """Test calls for different keys don't wait on each other"""
+        flight = SingleFlight("test")
+        calls = []
+
+        async def load(key):
+            calls.append(key)
+            await asyncio.sleep(0.01)
+            return key
+
+        results = await asyncio.gather(
+            flight.do("a", lambda: load("a")), flight.do("b", lambda: load("b"))
+        )
+
+        assert results == ["a", "b"]
+        assert sorted(calls) == ["a", "b"]
+
+    async def test_errors_are_shared(self):
+        """Test waiters get the leader's exception"""
+        flight = SingleFlight("test")
+
+        async def load():
+            await asyncio.sleep(0.01)
+            raise LookupError("Event not found")
+
+        results = await asyncio.gather(
+            *(flight.do("event:1", load) for _ in range(3)), return_exceptions=True
+        )
+
+        assert all(isinstance(result, LookupError) for result in results)
+
+    async def test_cancelled_leader_hands_over(self):
+        """Test a waiter runs the call itself when the leader is cancelled"""
+        flight = SingleFlight("test")
+        started = asyncio.Event()
+
+        async def slow():
+            started.set()
+            await asyncio.sleep(10)
+
+        async def fast():
+            return "loaded"
+
+        leader = asyncio.create_task(flight.do("event:1", slow))
+        await started.wait()
+        waiter = asyncio.create_task(flight.do("event:1", fast))
+        await asyncio.sleep(0)
+        leader.cancel()
+
+        assert await waiter == "loaded"
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+
+    async def test_cancelled_waiter_leaves_call_running(self):
+        """Test cancelling a waiter doesn't cancel the shared call"""
+        flight = SingleFlight("test")
+
+        async def load():
+            await asyncio.sleep(0.02)
+            return "loaded"
+
+        leader = asyncio.create_task(flight.do("event:1", load))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(flight.do("event:1", load))
+        await asyncio.sleep(0)
+        waiter.cancel()
+
+        assert await leader == "loaded"
@@ -0,0 +1,50 @@
+import subprocess
+import sys
+import json
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Must not be loaded just by starting a process (timings: benchmarks/startup.py)
+HEAVY_MODULES = ["shapely", "numpy", "geoalchemy2", "colorama", "uvicorn"]
+
+# Old top-level aliases of app packages that loaded modules twice
+DUPLICATE_ROOTS = ["config", "database", "models", "routers", "utils", "workers"]
+
+PROBE = """
+import json, sys
+import {module}
+print(json.dumps(sorted(sys.modules)))
+"""
+
+
+def cold_import(module: str) -> set:
+    """Import `module` in a fresh interpreter; return the modules it loaded"""
+    output = subprocess.run(
+        [sys.executable, "-c", PROBE.format(module=module)],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return set(json.loads(output.stdout.strip().splitlines()[-1]))
+
+
+class TestStartupImports:
+
+    def test_api_import(self):
+        """Test importing the API app loads no heavy or duplicate modules"""
+        modules = cold_import("app.main")
+
+        assert not [m for m in HEAVY_MODULES if m in modules]
+        assert not [m for m in DUPLICATE_ROOTS if m in modules]
+        assert "redis" not in modules  # clients open on first use
+
+    def test_worker_import(self):
+        """Test importing the worker tasks defers app modules and heavy dependencies"""
+        modules = cold_import("app.workers.tasks")
+
+        assert not [m for m in HEAVY_MODULES if m in modules]
+        assert not [m for m in DUPLICATE_ROOTS if m in modules]
+        assert "app.models" not in modules
+        assert "sqlalchemy" not in modules
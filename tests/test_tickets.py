@@ -1,9 +1,12 @@
 import pytest
+from fastapi import HTTPException
 from httpx import AsyncClient
+from sqlalchemy import update
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.models import User, Event, Ticket, TicketStatus
+from app.models import User, Event, Ticket, TicketStatus, Venue
 from app.services.ticket import TicketService
 from app.repositories.event import EventRepository
+from app.utils.geo import normalize_address, point_ewkt
 from datetime import datetime, timezone, timedelta
 import uuid
 
@@ -27,6 +30,19 @@ class TestTicketReservation:
         assert "id" in data
         assert "created_at" in data
 
+    async def test_reserve_ticket_sets_read_after_write_cookie(
+        self, client: AsyncClient, sample_user: User, sample_event: Event
+    ):
+        """Test reservation pins the client's reads to the primary"""
+        from app.routers.deps import READ_AFTER_WRITE_COOKIE
+
+        ticket_data = {"user_id": str(sample_user.id), "event_id": str(sample_event.id)}
+
+        response = await client.post("/api/v1/tickets", json=ticket_data)
+
+        assert response.status_code == 201
+        assert READ_AFTER_WRITE_COOKIE in response.cookies
+
     async def test_reserve_ticket_sold_out(
         self, client: AsyncClient, db_session: AsyncSession, sample_user: User
     ):
@@ -40,11 +56,14 @@ class TestTicketReservation:
             end_time=now + timedelta(days=7, hours=4),
             total_tickets=10,
             tickets_sold=10,  # Already sold out
-            venue_location="Venue",
-            venue_address="Address",
-            venue_latitude=6.5244,
-            venue_longitude=3.3792,
-            geo_location="SRID=4326;POINT(3.3792 6.5244)",
+            venue=Venue(
+                location="Venue",
+                address="Address",
+                address_key=normalize_address("Address"),
+                latitude=6.5244,
+                longitude=3.3792,
+                geo_location=point_ewkt(3.3792, 6.5244),
+            ),
         )
         db_session.add(sold_out_event)
         await db_session.commit()
@@ -59,6 +78,31 @@ class TestTicketReservation:
         assert response.status_code == 400
         assert "sold out" in response.json()["detail"].lower()
 
+    async def test_reserve_reclaims_overdue_holds(
+        self, client: AsyncClient, db_session: AsyncSession, sample_user: User, sample_event: Event
+    ):
+        """Test a sold-out event frees reservations past their deadline instead of refusing"""
+        overdue = Ticket(
+            id=uuid.uuid4(),
+            user_id=sample_user.id,
+            event_id=sample_event.id,
+            status=TicketStatus.RESERVED,
+            created_at=datetime.now(timezone.utc) - timedelta(minutes=10),
+        )
+        sample_event.total_tickets = 1
+        sample_event.tickets_sold = 1
+        db_session.add(overdue)
+        await db_session.commit()
+
+        ticket_data = {"user_id": str(sample_user.id), "event_id": str(sample_event.id)}
+        response = await client.post("/api/v1/tickets", json=ticket_data)
+
+        assert response.status_code == 201
+        await db_session.refresh(overdue)
+        await db_session.refresh(sample_event)
+        assert overdue.status == TicketStatus.EXPIRED
+        assert sample_event.tickets_sold == 1
+
     async def test_reserve_ticket_nonexistent_event(
         self, client: AsyncClient, sample_user: User
     ):
@@ -122,6 +166,142 @@ class TestTicketPayment:
         assert response.status_code == 400
         assert "cannot mark ticket as paid" in response.json()["detail"].lower()
 
+    async def test_mark_overdue_ticket_paid_fails(
+        self,
+        client: AsyncClient,
+        db_session: AsyncSession,
+        sample_user: User,
+        sample_event: Event,
+    ):
+        """Test a reservation past its deadline can't be paid and reads as expired"""
+        ticket = Ticket(
+            id=uuid.uuid4(),
+            user_id=sample_user.id,
+            event_id=sample_event.id,
+            status=TicketStatus.RESERVED,
+            created_at=datetime.now(timezone.utc) - timedelta(minutes=10),
+        )
+        db_session.add(ticket)
+        await db_session.commit()
+
+        response = await client.get(f"/api/v1/users/{sample_user.id}/tickets")
+        assert response.json()[0]["status"] == "expired"
+
+        response = await client.post(f"/api/v1/tickets/{ticket.id}/pay")
+
+        assert response.status_code == 400
+        assert "expired" in response.json()["detail"].lower()
+        await db_session.refresh(ticket)
+        assert ticket.status == TicketStatus.EXPIRED
+
+    async def test_pay_does_not_overwrite_concurrent_expiration(
+        self,
+        db_session: AsyncSession,
+        sample_user: User,
+        sample_event: Event,
+    ):
+        """Test a ticket expired after the payment checks read it is not flipped to paid"""
+        ticket = Ticket(
+            id=uuid.uuid4(),
+            user_id=sample_user.id,
+            event_id=sample_event.id,
+            status=TicketStatus.RESERVED,
+        )
+        db_session.add(ticket)
+        await db_session.commit()
+
+        # Expired by a worker behind the session's back: the loaded ticket
+        # still reads RESERVED, as it would for a request that raced it
+        await db_session.execute(
+            update(Ticket)
+            .where(Ticket.id == ticket.id)
+            .values(status=TicketStatus.EXPIRED)
+            .execution_options(synchronize_session=False)
+        )
+        await db_session.commit()
+        assert ticket.status == TicketStatus.RESERVED
+
+        with pytest.raises(HTTPException) as exc_info:
+            await TicketService(db_session).mark_ticket_paid(ticket.id)
+
+        assert exc_info.value.status_code == 400
+        await db_session.refresh(ticket)
+        assert ticket.status == TicketStatus.EXPIRED
+
+
+@pytest.mark.asyncio
+class TestTicketBaskets:
+
+    async def _second_event(self, db_session: AsyncSession, total_tickets: int) -> Event:
+        now = datetime.now(timezone.utc)
+        event = Event(
+            id=uuid.uuid4(),
+            title="Basket Event",
+            start_time=now + timedelta(days=3),
+            end_time=now + timedelta(days=3, hours=2),
+            total_tickets=total_tickets,
+            tickets_sold=0,
+            venue=Venue(
+                location="Basket Hall",
+                address="9 Basket Rd, Lagos",
+                address_key=normalize_address("9 Basket Rd, Lagos"),
+                latitude=6.45,
+                longitude=3.39,
+                geo_location=point_ewkt(3.39, 6.45),
+            ),
+        )
+        db_session.add(event)
+        await db_session.commit()
+        return event
+
+    async def test_reserve_and_pay_basket(
+        self, client: AsyncClient, db_session: AsyncSession, sample_user: User, sample_event: Event
+    ):
+        """Test a basket reserves tickets across events together and pays them together"""
+        other = await self._second_event(db_session, total_tickets=5)
+        basket = {
+            "user_id": str(sample_user.id),
+            "items": [
+                {"event_id": str(sample_event.id), "quantity": 3},
+                {"event_id": str(other.id), "quantity": 2},
+            ],
+        }
+
+        response = await client.post("/api/v1/tickets/baskets", json=basket)
+
+        assert response.status_code == 201
+        data = response.json()
+        assert len(data["tickets"]) == 5
+        assert {t["basket_id"] for t in data["tickets"]} == {data["basket_id"]}
+        await db_session.refresh(sample_event)
+        await db_session.refresh(other)
+        assert (sample_event.tickets_sold, other.tickets_sold) == (3, 2)
+
+        response = await client.post(f"/api/v1/tickets/baskets/{data['basket_id']}/pay")
+
+        assert response.status_code == 200
+        assert {t["status"] for t in response.json()["tickets"]} == {"paid"}
+
+    async def test_basket_is_all_or_nothing(
+        self, client: AsyncClient, db_session: AsyncSession, sample_user: User, sample_event: Event
+    ):
+        """Test one event without room fails the whole basket and reserves nothing"""
+        other = await self._second_event(db_session, total_tickets=1)
+        basket = {
+            "user_id": str(sample_user.id),
+            "items": [
+                {"event_id": str(sample_event.id), "quantity": 2},
+                {"event_id": str(other.id), "quantity": 2},
+            ],
+        }
+
+        response = await client.post("/api/v1/tickets/baskets", json=basket)
+
+        assert response.status_code == 400
+        assert "Basket Event" in response.json()["detail"]
+        await db_session.refresh(sample_event)
+        assert sample_event.tickets_sold == 0
+
 
 @pytest.mark.asyncio
 class TestEventAvailability:
@@ -144,6 +324,35 @@ class TestEventAvailability:
 
         assert sample_event.tickets_sold == initial_sold + 1
 
+    async def test_reservation_retries_after_concurrent_change(
+        self, db_session: AsyncSession, sample_user: User, sample_event: Event
+    ):
+        """Test a reservation racing another tickets_sold change retries instead of overwriting it"""
+        initial_sold = sample_event.tickets_sold
+        service = TicketService(db_session)
+        read_event = service._get_event_for_reservation
+        reads = 0
+
+        async def read_then_concurrent_sale(*args):
+            nonlocal reads
+            event = await read_event(*args)
+            reads += 1
+            if reads == 1:
+                # Another process sells a ticket after this one read the event
+                await EventRepository(db_session).increment_tickets_sold(event.id)
+            return event
+
+        service._get_event_for_reservation = read_then_concurrent_sale
+        from app.schemas.ticket import TicketCreate
+
+        await service.reserve_ticket(
+            TicketCreate(user_id=sample_user.id, event_id=sample_event.id)
+        )
+
+        assert reads == 2
+        await db_session.refresh(sample_event)
+        assert sample_event.tickets_sold == initial_sold + 2
+
     async def test_tickets_sold_decrements_on_expiration(
         self, db_session: AsyncSession, sample_user: User, sample_event: Event
     ):
@@ -171,3 +380,102 @@ class TestEventAvailability:
         await db_session.refresh(sample_event)
 
         assert sample_event.tickets_sold == initial_sold - 1
+
+    async def test_expire_tickets_in_batch(
+        self, client: AsyncClient, db_session: AsyncSession, sample_user: User, sample_event: Event
+    ):
+        """Test a batch expires only still-reserved tickets and decrements once per event"""
+        ticket_data = {"user_id": str(sample_user.id), "event_id": str(sample_event.id)}
+        ids = [(await client.post("/api/v1/tickets", json=ticket_data)).json()["id"] for _ in range(3)]
+        await client.post(f"/api/v1/tickets/{ids[0]}/pay")
+
+        service = TicketService(db_session)
+        expired = await service.expire_tickets([uuid.UUID(ticket_id) for ticket_id in ids])
+
+        assert expired == 2
+        await db_session.refresh(sample_event)
+        assert sample_event.tickets_sold == 1
+        assert await service.expire_tickets([uuid.UUID(ids[1]), uuid.uuid4()]) == 0
+
+
+@pytest.mark.asyncio
+class TestTicketStats:
+
+    async def test_stats_follow_ticket_transitions(
+        self,
+        client: AsyncClient,
+        db_session: AsyncSession,
+        sample_user: User,
+        sample_event: Event,
+    ):
+        """Test rollups track reserve, pay and expire in the bulk stats endpoint"""
+        ticket_data = {"user_id": str(sample_user.id), "event_id": str(sample_event.id)}
+        paid = (await client.post("/api/v1/tickets", json=ticket_data)).json()
+        expired = (await client.post("/api/v1/tickets", json=ticket_data)).json()
+        await client.post("/api/v1/tickets", json=ticket_data)
+
+        await client.post(f"/api/v1/tickets/{paid['id']}/pay")
+        await TicketService(db_session).expire_ticket(uuid.UUID(expired["id"]))
+
+        response = await client.post(
+            "/api/v1/events/stats", json={"event_ids": [str(sample_event.id)]}
+        )
+
+        assert response.status_code == 200
+        stats = response.json()[0]
+        assert (stats["reserved"], stats["paid"], stats["expired"]) == (1, 1, 1)
+
+    async def test_rebuild_corrects_drift(
+        self, db_session: AsyncSession, sample_user: User, sample_event: Event
+    ):
+        """Test the verifier recounts tickets and reports drifted rollups"""
+        from app.repositories.ticket_stats import TicketStatsRepository
+
+        # Insert a ticket behind the repository's back so the rollup is missing it
+        db_session.add(
+            Ticket(
+                id=uuid.uuid4(),
+                user_id=sample_user.id,
+                event_id=sample_event.id,
+                status=TicketStatus.PAID,
+            )
+        )
+        await db_session.commit()
+
+        repo = TicketStatsRepository(db_session)
+        report = await repo.rebuild()
+        assert report["events_corrected"] == 1
+        assert report["total_drift"] == 1
+
+        stats = (await repo.get_many([sample_event.id]))[sample_event.id]
+        assert stats.paid_count == 1
+        assert (await repo.rebuild())["total_drift"] == 0
+
+    async def test_rebuild_never_overwrites_concurrent_transitions(
+        self, db_session: AsyncSession, sample_user: User, sample_event: Event
+    ):
+        """Test a rollup changed between the recount and its correction is left alone"""
+        from app.repositories.ticket_stats import TicketStatsRepository
+
+        repo = TicketStatsRepository(db_session)
+        await repo.apply_deltas({sample_event.id: {"paid_count": 5}})
+        await db_session.commit()
+        execute, statements = db_session.execute, 0
+
+        async def transition_after_recount(statement, *args, **kwargs):
+            nonlocal statements
+            result = await execute(statement, *args, **kwargs)
+            statements += 1
+            if statements == 1:
+                # A reservation commits its rollup delta after the recount
+                await repo.apply_deltas({sample_event.id: {"reserved_count": 1}})
+            return result
+
+        db_session.execute = transition_after_recount
+        report = await repo.rebuild()
+        db_session.execute = execute
+
+        assert (report["events_corrected"], report["events_skipped"]) == (0, 1)
+        stats = (await repo.get_many([sample_event.id]))[sample_event.id]
+        await db_session.refresh(stats)
+        assert (stats.reserved_count, stats.paid_count) == (1, 5)
@@ -1,10 +1,10 @@
 import pytest
 from httpx import AsyncClient
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.models import User, Event
+from app.models import User, Event, Ticket, TicketStatus, Venue
+from app.repositories.ticket import TicketRepository
 from datetime import datetime, timezone, timedelta
-from geoalchemy2.shape import from_shape
-from shapely.geometry import Point
+from app.utils.geo import normalize_address, point_ewkt
 import uuid
 
 
@@ -66,11 +66,14 @@ class TestRelevantEvents:
             end_time=now + timedelta(days=7, hours=4),
             total_tickets=100,
             tickets_sold=0,
-            venue_location="Close Venue",
-            venue_address="123 Close St",
-            venue_latitude=6.5244,  # Same as user
-            venue_longitude=3.3792,
-            geo_location=from_shape(Point(3.3792, 6.5244), srid=4326),
+            venue=Venue(
+                location="Close Venue",
+                address="123 Close St",
+                address_key=normalize_address("123 Close St"),
+                latitude=6.5244,  # Same as user
+                longitude=3.3792,
+                geo_location=point_ewkt(3.3792, 6.5244),
+            ),
         )
 
         # Event 2: Far away (Lagos - about 140km from Ibadan)
@@ -82,11 +85,14 @@ class TestRelevantEvents:
             end_time=now + timedelta(days=14, hours=4),
             total_tickets=100,
             tickets_sold=0,
-            venue_location="Far Venue",
-            venue_address="456 Far St",
-            venue_latitude=6.4541,  # Lagos coordinates
-            venue_longitude=3.3947,
-            geo_location=from_shape(Point(3.3947, 6.4541), srid=4326),
+            venue=Venue(
+                location="Far Venue",
+                address="456 Far St",
+                address_key=normalize_address("456 Far St"),
+                latitude=6.4541,  # Lagos coordinates
+                longitude=3.3947,
+                geo_location=point_ewkt(3.3947, 6.4541),
+            ),
         )
 
         db_session.add(close_event)
@@ -154,3 +160,77 @@ class TestUserTicketHistory:
         assert len(data) >= 1
         assert data[0]["event_title"] == sample_event.title
         assert data[0]["venue_location"] == sample_event.venue_location
+
+    async def test_history_uses_event_snapshot(
+        self,
+        client: AsyncClient,
+        db_session: AsyncSession,
+        sample_user: User,
+        sample_event: Event,
+        monkeypatch,
+    ):
+        """Test tickets reserved with a snapshot keep their event fields, others read the event"""
+        monkeypatch.setattr("app.services.ticket.settings.ticket_event_snapshot_enabled", True)
+        ticket_data = {"user_id": str(sample_user.id), "event_id": str(sample_event.id)}
+        response = await client.post("/api/v1/tickets", json=ticket_data)
+
+        ticket = await db_session.get(Ticket, uuid.UUID(response.json()["id"]))
+        assert ticket.event_title == sample_event.title
+        assert ticket.venue_location == sample_event.venue_location
+
+        db_session.add(
+            Ticket(user_id=sample_user.id, event_id=sample_event.id, status=TicketStatus.PAID)
+        )
+        await db_session.commit()
+
+        response = await client.get(f"/api/v1/users/{sample_user.id}/tickets")
+        data = response.json()
+        assert len(data) == 2
+        assert {t["event_title"] for t in data} == {sample_event.title}
+        assert {t["venue_location"] for t in data} == {sample_event.venue_location}
+
+    async def test_archived_tickets_in_history(
+        self,
+        client: AsyncClient,
+        db_session: AsyncSession,
+        sample_user: User,
+        sample_event: Event,
+    ):
+        """Test archived paid tickets stay in history and expired ones are listed on request"""
+        now = datetime.now(timezone.utc)
+        db_session.add_all(
+            [
+                Ticket(
+                    user_id=sample_user.id,
+                    event_id=sample_event.id,
+                    status=TicketStatus.EXPIRED,
+                    created_at=now - timedelta(hours=2),
+                ),
+                Ticket(
+                    user_id=sample_user.id,
+                    event_id=sample_event.id,
+                    status=TicketStatus.PAID,
+                    created_at=now - timedelta(hours=3),
+                ),
+            ]
+        )
+        await db_session.commit()
+
+        # The event ends: its paid ticket is archived with the expired one
+        archived = await TicketRepository(db_session).archive_batch(
+            batch_size=100,
+            expired_before=now - timedelta(hours=1),
+            events_ended_before=now + timedelta(days=365),
+        )
+        assert archived == 2
+
+        response = await client.get(f"/api/v1/users/{sample_user.id}/tickets")
+        assert [t["status"] for t in response.json()] == ["paid"]
+
+        response = await client.get(
+            f"/api/v1/users/{sample_user.id}/tickets",
+            params={"include_archived": True},
+        )
+        data = response.json()
+        assert [t["status"] for t in data] == ["expired", "paid"]
+        assert data[0]["event_title"] == sample_event.title
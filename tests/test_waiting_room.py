@@ -0,0 +1,224 @@
+import pytest
+from fastapi import HTTPException
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.main import app
+from app.models import User, Event
+from app.services.waiting_room import (
+    InMemoryWaitingRoomStore,
+    WaitingRoomService,
+    get_waiting_room_store,
+    verify_admission_token,
+)
+from datetime import datetime, timedelta, timezone
+import uuid
+
+
+@pytest.mark.asyncio
+class TestWaitingRoomQueue:
+
+    async def test_positions_are_fifo_and_stable(self):
+        """Test users get increasing positions and rejoining keeps the same one"""
+        store = InMemoryWaitingRoomStore()
+        service = WaitingRoomService(store)
+        event_id = uuid.uuid4()
+        await store.open(event_id, 10)
+
+        first_user, second_user = uuid.uuid4(), uuid.uuid4()
+        first = await service.join(event_id, first_user)
+        second = await service.join(event_id, second_user)
+        again = await service.join(event_id, first_user)
+
+        assert first["position"] == 1
+        assert second["position"] == 2
+        assert again["position"] == 1
+        assert not first["admitted"]
+
+    async def test_pump_admits_at_configured_rate(self):
+        """Test the pump releases rate * interval positions and issues admission tokens"""
+        store = InMemoryWaitingRoomStore()
+        service = WaitingRoomService(store)
+        event_id = uuid.uuid4()
+        await store.open(event_id, 2)
+
+        users = [uuid.uuid4() for _ in range(5)]
+        tokens = [(await service.join(event_id, u))["queue_token"] for u in users]
+
+        admitted = await service.pump(interval_seconds=1.0)
+        assert admitted[str(event_id)] == 2
+
+        status_2 = await service.get_status(event_id, tokens[1])
+        status_3 = await service.get_status(event_id, tokens[2])
+        assert status_2["admitted"]
+        assert verify_admission_token(status_2["admission_token"], event_id, users[1])
+        assert not status_3["admitted"]
+        assert status_3["ahead"] == 0
+
+    async def test_pump_carries_fractional_rates(self):
+        """Test fractional rates admit at the configured rate rather than rounding per run"""
+        store = InMemoryWaitingRoomStore()
+        service = WaitingRoomService(store)
+        slow, fast = uuid.uuid4(), uuid.uuid4()
+        await store.open(slow, 0.5)
+        await store.open(fast, 2.7)
+        for _ in range(30):
+            await service.join(slow, uuid.uuid4())
+            await service.join(fast, uuid.uuid4())
+
+        runs = [await service.pump(interval_seconds=1.0) for _ in range(10)]
+
+        assert [run[str(slow)] for run in runs[:4]] == [0, 1, 1, 2]
+        assert runs[-1][str(slow)] == 5
+        assert runs[-1][str(fast)] == 27
+
+    async def test_admission_token_is_bound_to_user_and_event(self):
+        """Test admission tokens can't be reused for another user, event or after tampering"""
+        store = InMemoryWaitingRoomStore()
+        service = WaitingRoomService(store)
+        event_id, user_id = uuid.uuid4(), uuid.uuid4()
+        await store.open(event_id, 1)
+        await service.join(event_id, user_id)
+        await service.pump(interval_seconds=1.0)
+
+        queue_token = (await service.join(event_id, user_id))["queue_token"]
+        token = (await service.get_status(event_id, queue_token))["admission_token"]
+
+        assert verify_admission_token(token, event_id, user_id)
+        assert not verify_admission_token(token, event_id, uuid.uuid4())
+        assert not verify_admission_token(token, uuid.uuid4(), user_id)
+        assert not verify_admission_token(token[:-2] + "xx", event_id, user_id)
+        assert not verify_admission_token(queue_token, event_id, user_id)
+
+    async def test_queue_token_from_earlier_opening_is_rejected(self):
+        """Test a queue token can't claim its old position after the room is reopened"""
+        store = InMemoryWaitingRoomStore()
+        service = WaitingRoomService(store)
+        event_id = uuid.uuid4()
+        await store.open(event_id, 1)
+        old_token = (await service.join(event_id, uuid.uuid4()))["queue_token"]
+
+        await store.close(event_id)
+        await store.open(event_id, 1)
+        new_user = uuid.uuid4()
+        new_token = (await service.join(event_id, new_user))["queue_token"]
+        await service.pump(interval_seconds=1.0)
+
+        with pytest.raises(HTTPException) as exc_info:
+            await service.get_status(event_id, old_token)
+        assert exc_info.value.status_code == 403
+        status_new = await service.get_status(event_id, new_token)
+        assert status_new["admitted"]
+        assert verify_admission_token(status_new["admission_token"], event_id, new_user)
+
+    async def test_changing_rate_keeps_queue_tokens_valid(self):
+        """Test re-opening an open room to change its rate keeps the queue"""
+        store = InMemoryWaitingRoomStore()
+        service = WaitingRoomService(store)
+        event_id = uuid.uuid4()
+        await store.open(event_id, 1)
+        token = (await service.join(event_id, uuid.uuid4()))["queue_token"]
+
+        await store.open(event_id, 5)
+        await service.pump(interval_seconds=1.0)
+
+        assert (await service.get_status(event_id, token))["admitted"]
+
+
+@pytest.mark.asyncio
+class TestWaitingRoomReservations:
+
+    async def test_reserve_requires_admission_when_room_open(
+        self,
+        client: AsyncClient,
+        db_session: AsyncSession,
+        sample_user: User,
+        sample_event: Event,
+    ):
+        """Test gated events reject reservations without a valid admission token"""
+        store = InMemoryWaitingRoomStore()
+        app.dependency_overrides[get_waiting_room_store] = lambda: store
+
+        response = await client.post(
+            f"/api/v1/waiting-room/{sample_event.id}", json={"rate_per_second": 1}
+        )
+        assert response.status_code == 204
+
+        ticket_data = {"user_id": str(sample_user.id), "event_id": str(sample_event.id)}
+        response = await client.post("/api/v1/tickets", json=ticket_data)
+        assert response.status_code == 403
+
+        join = await client.post(
+            f"/api/v1/waiting-room/{sample_event.id}/join",
+            json={"user_id": str(sample_user.id)},
+        )
+        await WaitingRoomService(store).pump(interval_seconds=1.0)
+        status_response = await client.get(
+            f"/api/v1/waiting-room/{sample_event.id}/status",
+            headers={"X-Queue-Token": join.json()["queue_token"]},
+        )
+        admission_token = status_response.json()["admission_token"]
+
+        response = await client.post(
+            "/api/v1/tickets",
+            json=ticket_data,
+            headers={"X-Admission-Token": admission_token},
+        )
+        assert response.status_code == 201
+
+    async def test_basket_takes_an_admission_token_per_event(
+        self,
+        client: AsyncClient,
+        db_session: AsyncSession,
+        sample_user: User,
+        sample_event: Event,
+    ):
+        """Test a basket spanning two gated events needs, and accepts, each event's own token"""
+        store = InMemoryWaitingRoomStore()
+        app.dependency_overrides[get_waiting_room_store] = lambda: store
+        now = datetime.now(timezone.utc)
+        other_event = Event(
+            id=uuid.uuid4(),
+            title="Second Gated Event",
+            start_time=now + timedelta(days=3),
+            end_time=now + timedelta(days=3, hours=2),
+            total_tickets=50,
+            tickets_sold=0,
+            venue_id=sample_event.venue_id,
+        )
+        db_session.add(other_event)
+        await db_session.commit()
+
+        tokens = {}
+        for event in (sample_event, other_event):
+            await client.post(f"/api/v1/waiting-room/{event.id}", json={"rate_per_second": 1})
+            join = await client.post(
+                f"/api/v1/waiting-room/{event.id}/join",
+                json={"user_id": str(sample_user.id)},
+            )
+            await WaitingRoomService(store).pump(interval_seconds=1.0)
+            status_response = await client.get(
+                f"/api/v1/waiting-room/{event.id}/status",
+                headers={"X-Queue-Token": join.json()["queue_token"]},
+            )
+            tokens[event.id] = status_response.json()["admission_token"]
+
+        basket = {
+            "user_id": str(sample_user.id),
+            "items": [
+                {"event_id": str(sample_event.id), "quantity": 1},
+                {"event_id": str(other_event.id), "quantity": 1},
+            ],
+        }
+        # The header token only admits to one of the events
+        response = await client.post(
+            "/api/v1/tickets/baskets",
+            json=basket,
+            headers={"X-Admission-Token": tokens[sample_event.id]},
+        )
+        assert response.status_code == 403
+
+        for item in basket["items"]:
+            item["admission_token"] = tokens[uuid.UUID(item["event_id"])]
+        response = await client.post("/api/v1/tickets/baskets", json=basket)
+        assert response.status_code == 201
+        assert len(response.json()["tickets"]) == 2